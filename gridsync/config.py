@@ -1,47 +1,117 @@
 # -*- coding: utf-8 -*-
 
+import os
+import threading
 from collections import defaultdict
+from collections.abc import Iterator
 from configparser import NoOptionError, NoSectionError, RawConfigParser
+from contextlib import contextmanager
 from typing import Optional
 
 from atomicwrites import atomic_write
 
+# Parsed configuration files, keyed by filename and shared between all
+# Config instances (since, e.g., `get_preference` creates a new Config
+# object for every call). Each entry is stored alongside a fingerprint
+# of the file it was parsed from so that changes made to the file by
+# other processes (or by hand) are detected on the next read.
+_cache: dict[str, tuple[tuple[int, int, int], RawConfigParser]] = {}
+_cache_lock = threading.Lock()
+
+
+def _fingerprint(filename: str) -> Optional[tuple[int, int, int]]:
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
 
 class Config:
     def __init__(self, filename: str) -> None:
         self.filename = filename
+        self._batch: Optional[RawConfigParser] = None
+        self._batch_modified = False
 
-    def set(self, section: str, option: str, value: str) -> None:
+    def _parse(self) -> RawConfigParser:
         config = RawConfigParser(allow_no_value=True)
         config.read(self.filename)
+        return config
+
+    def _read(self) -> RawConfigParser:
+        # The returned parser may be shared with other Config instances
+        # (and threads) and so must not be modified by the caller.
+        if self._batch is not None:
+            return self._batch
+        fingerprint = _fingerprint(self.filename)
+        if fingerprint is None:
+            return self._parse()
+        with _cache_lock:
+            cached = _cache.get(self.filename)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        config = self._parse()
+        with _cache_lock:
+            _cache[self.filename] = (fingerprint, config)
+        return config
+
+    def _write(self, config: RawConfigParser) -> None:
+        with atomic_write(self.filename, mode="w", overwrite=True) as f:
+            config.write(f)
+        fingerprint = _fingerprint(self.filename)
+        with _cache_lock:
+            if fingerprint is None:
+                _cache.pop(self.filename, None)
+            else:
+                _cache[self.filename] = (fingerprint, config)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defer writing any changes made with `set` or `save` until the end
+        of the block, at which point they are all written to disk with a
+        single atomic write. Changes are discarded if an exception is
+        raised inside the block.
+        """
+        if self._batch is not None:  # Already batching; nothing to do
+            yield
+            return
+        self._batch = self._parse()
+        self._batch_modified = False
+        try:
+            yield
+        except BaseException:
+            self._batch = None
+            raise
+        config, self._batch = self._batch, None
+        if self._batch_modified:
+            self._write(config)
+
+    def set(self, section: str, option: str, value: str) -> None:
+        config = self._batch if self._batch is not None else self._parse()
         if not config.has_section(section):
             config.add_section(section)
         config.set(section, option, value)
-        with atomic_write(self.filename, mode="w", overwrite=True) as f:
-            config.write(f)
+        if self._batch is None:
+            self._write(config)
+        else:
+            self._batch_modified = True
 
     def get(self, section: str, option: str) -> Optional[str]:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        config = self._read()
         try:
             return config.get(section, option)
         except (NoOptionError, NoSectionError):
             return None
 
     def save(self, settings_dict: dict) -> None:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
-        for section, d in settings_dict.items():
-            if not config.has_section(section):
-                config.add_section(section)
-            for option, value in d.items():
-                config.set(section, option, value)
-        with atomic_write(self.filename, mode="w", overwrite=True) as f:
-            config.write(f)
+        with self.batch():
+            for section, d in settings_dict.items():
+                for option, value in d.items():
+                    self.set(section, option, value)
 
     def load(self) -> dict:
-        config = RawConfigParser(allow_no_value=True)
-        config.read(self.filename)
+        config = self._read()
         settings_dict: defaultdict = defaultdict(dict)
         for section in config.sections():
             for option, value in config.items(section):
@@ -5,8 +5,10 @@ import argparse
 import logging
 import os
 import sys
+import time
 from typing import cast
 
+from psutil import Process
 from qtpy.QtCore import Qt
 from qtpy.QtGui import QIcon
 from qtpy.QtWidgets import QApplication, QCheckBox, QMessageBox
@@ -48,9 +50,11 @@ from gridsync.lock import FilesystemLock
 from gridsync.log import LOGGING_ENABLED, initialize_logger
 from gridsync.magic_folder import MagicFolder
 from gridsync.preferences import get_preference, set_preference
+from gridsync.system import which
 from gridsync.tahoe import Tahoe, get_nodedirs
 from gridsync.tor import get_tor
 from gridsync.types_ import TwistedDeferred
+from gridsync.versions import VersionCache
 
 # mypy thinks reactor is a module
 # https://github.com/twisted/twisted/issues/9909
@@ -66,6 +70,8 @@ class Core:
         self.gateways: list = []
         self.tahoe_version: str = ""
         self.magic_folder_version: str = ""
+        self.version_cache = VersionCache()
+        self.time_to_systray: float = 0.0
 
         if LOGGING_ENABLED:
             initialize_logger(self.args.debug)
@@ -102,35 +108,106 @@ class Core:
                 str(e),
             )
 
-    async def _get_executable_versions(self) -> None:
-        tahoe = Tahoe(enable_logging=False)
+    async def _get_tahoe_version(self, tahoe: Tahoe) -> None:
         try:
-            self.tahoe_version = await tahoe.version()
+            if not tahoe.executable:
+                tahoe.executable = which("tahoe")
+            self.tahoe_version = await self.version_cache.get_version(
+                tahoe.executable, tahoe.version
+            )
         except Exception as e:  # pylint: disable=broad-except
             msg.critical(
                 "Error getting Tahoe-LAFS version",
                 "{}: {}".format(type(e).__name__, str(e)),
             )
-        magic_folder = MagicFolder(tahoe, enable_logging=False)
+
+    async def _get_magic_folder_version(
+        self, magic_folder: MagicFolder
+    ) -> None:
         try:
-            self.magic_folder_version = await magic_folder.version()
+            if not magic_folder.executable:
+                magic_folder.executable = which("magic-folder")
+            self.magic_folder_version = await self.version_cache.get_version(
+                magic_folder.executable, magic_folder.version
+            )
         except Exception as e:  # pylint: disable=broad-except
             msg.critical(
                 "Error getting Magic-Folder version",
                 "{}: {}".format(type(e).__name__, str(e)),
             )
 
+    async def _get_executable_versions(self) -> None:
+        start_time = time.monotonic()
+        tahoe = Tahoe(enable_logging=False)
+        magic_folder = MagicFolder(tahoe, enable_logging=False)
+        await DeferredList(
+            [
+                Deferred.fromCoroutine(self._get_tahoe_version(tahoe)),
+                Deferred.fromCoroutine(
+                    self._get_magic_folder_version(magic_folder)
+                ),
+            ]
+        )
+        logging.debug(
+            "Found executable versions in %f seconds (tahoe: %s, "
+            "magic-folder: %s)",
+            time.monotonic() - start_time,
+            self.tahoe_version,
+            self.magic_folder_version,
+        )
+
     @inlineCallbacks
     def start_gateways(self) -> TwistedDeferred[None]:
+        start_time = time.monotonic()
+        # Versions are usually served from the cache but probing them
+        # (when the executables have changed) involves spawning slow
+        # subprocesses, so do this in the background; nothing during
+        # startup depends on the result.
+        Deferred.fromCoroutine(self._get_executable_versions())
         nodedirs = get_nodedirs(config_dir)
         if nodedirs:
             minimize_preference = get_preference("startup", "minimize")
             if not minimize_preference or minimize_preference == "false":
                 self.gui.show_main_window()
-            tor_available = yield get_tor(reactor)
+            tor_d = get_tor(reactor)
+            gateways = [Tahoe(nodedir) for nodedir in nodedirs]
+            logging.debug(
+                "Loaded %i gateway(s) in %f seconds",
+                len(gateways),
+                time.monotonic() - start_time,
+            )
+            # Terminate any processes left over from a previous run (e.g.,
+            # after a crash) for all gateways at once rather than one at a
+            # time as each gateway's processes are started.
+            cleanup_d = DeferredList(
+                [
+                    supervisor.cleanup_stale_process()
+                    for gateway in gateways
+                    for supervisor in (
+                        gateway.supervisor,
+                        gateway.magic_folder.supervisor,
+                    )
+                ],
+                consumeErrors=True,
+            )
+            tor_available = yield tor_d
+            cleanup_results = yield cleanup_d
+            for success, result in cleanup_results:
+                if not success:
+                    logging.warning(
+                        "Error cleaning up stale process: %s",
+                        result.getErrorMessage(),
+                    )
+            logging.debug(
+                "Cleaned up stale processes after %f seconds",
+                time.monotonic() - start_time,
+            )
+            logging.debug(
+                "Finished looking for Tor after %f seconds",
+                time.monotonic() - start_time,
+            )
             logging.debug("Starting Tahoe-LAFS gateway(s)...")
-            for nodedir in nodedirs:
-                gateway = Tahoe(nodedir)
+            for gateway in gateways:
                 tcp = gateway.config_get("connections", "tcp")
                 if tcp == "tor" and not tor_available:
                     logging.error("No running tor daemon found")
@@ -145,6 +222,11 @@ class Core:
                 self.gateways.append(gateway)
                 self._start_gateway(gateway)
             self.gui.populate(self.gateways)
+            logging.debug(
+                "Populated GUI with %i gateway(s) after %f seconds",
+                len(self.gateways),
+                time.monotonic() - start_time,
+            )
             cheatcode = settings.get("connection", {}).get("default")
             if cheatcode and not cheatcode_used(cheatcode):
                 self.gui.show_welcome_dialog()
@@ -153,7 +235,10 @@ class Core:
             if DEFAULT_AUTOSTART:
                 autostart_enable()
                 self.gui.preferences_window.general_pane.load_preferences()
-        yield Deferred.fromCoroutine(self._get_executable_versions())
+        logging.debug(
+            "Finished starting gateway(s) in %f seconds",
+            time.monotonic() - start_time,
+        )
 
     @staticmethod
     def show_message() -> None:
@@ -216,6 +301,12 @@ class Core:
         self.show_message()
 
         self.gui.show_systray()
+        # Measured from process creation so that interpreter startup and
+        # module imports are included.
+        self.time_to_systray = time.time() - Process().create_time()
+        logging.debug(
+            "Systray shown %f seconds after launch", self.time_to_systray
+        )
 
         reactor.callLater(0, self.start_gateways)
         # mypy: Argument 2 to "addSystemEventTrigger" of "IReactorCore" has
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+A segmented, compressed on-disk store for eliot log messages.
+
+Messages are appended (one JSON object per line) to an "active" segment.
+Once that segment grows beyond `max_segment_bytes`, it is sealed: its
+contents are gzip-compressed and a small sidecar index -- recording the
+range of timestamps and the set of task UUIDs found in the segment -- is
+written alongside it. Only the most recent `max_segments` sealed segments
+are kept.
+
+The indexes allow time-range (or task) queries to skip over segments
+that cannot possibly contain matching messages without decompressing
+them.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+from atomicwrites import atomic_write
+
+# Messages are not fully parsed when they are stored (see
+# `filter.is_eliot_log_message`) so the fields that are needed for the
+# index are extracted with regular expressions instead.
+_TIMESTAMP_RE = re.compile(r'"timestamp":\s*(-?[0-9][0-9.eE+-]*)')
+_TASK_UUID_RE = re.compile(r'"task_uuid":\s*"([^"]*)"')
+
+ACTIVE_SEGMENT = "active.jsonl"
+
+
+def get_timestamp(message: str) -> Optional[float]:
+    match = _TIMESTAMP_RE.search(message)
+    if not match:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+
+def get_task_uuid(message: str) -> Optional[str]:
+    match = _TASK_UUID_RE.search(message)
+    return match.group(1) if match else None
+
+
+class SegmentIndex:
+    def __init__(
+        self,
+        first: Optional[float] = None,
+        last: Optional[float] = None,
+        lines: int = 0,
+        task_uuids: Optional[set[str]] = None,
+    ) -> None:
+        self.first = first
+        self.last = last
+        self.lines = lines
+        self.task_uuids: set[str] = task_uuids or set()
+
+    def add(self, message: str) -> None:
+        self.lines += 1
+        timestamp = get_timestamp(message)
+        if timestamp is not None:
+            if self.first is None or timestamp < self.first:
+                self.first = timestamp
+            if self.last is None or timestamp > self.last:
+                self.last = timestamp
+        task_uuid = get_task_uuid(message)
+        if task_uuid:
+            self.task_uuids.add(task_uuid)
+
+    def overlaps(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        task_uuid: Optional[str] = None,
+    ) -> bool:
+        if task_uuid is not None and task_uuid not in self.task_uuids:
+            return False
+        if start is None and end is None:
+            return True
+        if self.first is None or self.last is None:
+            return False
+        if start is not None and self.last < start:
+            return False
+        if end is not None and self.first > end:
+            return False
+        return True
+
+    def to_dict(self) -> dict:
+        return {
+            "first": self.first,
+            "last": self.last,
+            "lines": self.lines,
+            "task_uuids": sorted(self.task_uuids),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> SegmentIndex:
+        return cls(
+            d.get("first"),
+            d.get("last"),
+            d.get("lines", 0),
+            set(d.get("task_uuids", [])),
+        )
+
+
+def _matches(
+    message: str,
+    start: Optional[float],
+    end: Optional[float],
+    task_uuid: Optional[str],
+) -> bool:
+    if task_uuid is not None and get_task_uuid(message) != task_uuid:
+        return False
+    if start is None and end is None:
+        return True
+    timestamp = get_timestamp(message)
+    if timestamp is None:
+        return False
+    if start is not None and timestamp < start:
+        return False
+    if end is not None and timestamp > end:
+        return False
+    return True
+
+
+class EliotLogStore:
+    def __init__(
+        self,
+        path: Path,
+        max_segment_bytes: int = 1_000_000,
+        max_segments: int = 100,
+    ) -> None:
+        self.path = path
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._active_index: Optional[SegmentIndex] = None
+        self._indexes: dict[int, SegmentIndex] = {}
+
+    @property
+    def _active_path(self) -> Path:
+        return Path(self.path, ACTIVE_SEGMENT)
+
+    def _sealed_segments(self) -> list[int]:
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            int(name[:-9])
+            for name in names
+            if name.endswith(".jsonl.gz") and name[:-9].isdigit()
+        )
+
+    def _segment_path(self, segment: int) -> Path:
+        return Path(self.path, f"{segment:08d}.jsonl.gz")
+
+    def _index_path(self, segment: int) -> Path:
+        return Path(self.path, f"{segment:08d}.idx.json")
+
+    def _load_index(self, segment: int) -> SegmentIndex:
+        index = self._indexes.get(segment)
+        if index is not None:
+            return index
+        try:
+            with open(self._index_path(segment), encoding="utf-8") as f:
+                index = SegmentIndex.from_dict(json.load(f))
+        except (OSError, ValueError, AttributeError):
+            # The index is missing or corrupt; rebuild it from the segment
+            index = SegmentIndex()
+            for line in self._read_segment(segment):
+                index.add(line)
+        self._indexes[segment] = index
+        return index
+
+    def _get_active_index(self) -> SegmentIndex:
+        if self._active_index is None:
+            index = SegmentIndex()
+            try:
+                with open(self._active_path, encoding="utf-8") as f:
+                    for line in f:
+                        index.add(line)
+            except FileNotFoundError:
+                pass
+            self._active_index = index
+        return self._active_index
+
+    def _read_segment(self, segment: int) -> Iterator[str]:
+        try:
+            with gzip.open(
+                self._segment_path(segment), "rt", encoding="utf-8"
+            ) as f:
+                for line in f:
+                    yield line.rstrip("\n")
+        except (OSError, EOFError) as e:
+            logging.warning("Error reading eliot log segment: %s", str(e))
+
+    def _seal(self) -> None:
+        segments = self._sealed_segments()
+        segment = segments[-1] + 1 if segments else 1
+        index = self._get_active_index()
+        tmp_path = Path(self.path, f"{segment:08d}.jsonl.gz.tmp")
+        with (
+            open(self._active_path, "rb") as src,
+            gzip.open(tmp_path, "wb") as dst,
+        ):
+            shutil.copyfileobj(src, dst)
+        with atomic_write(
+            self._index_path(segment), mode="w", overwrite=True
+        ) as f:
+            f.write(json.dumps(index.to_dict()))
+        os.replace(tmp_path, self._segment_path(segment))
+        os.remove(self._active_path)
+        self._indexes[segment] = index
+        self._active_index = SegmentIndex()
+        for old in (segments + [segment])[: -self.max_segments or None]:
+            for path in (self._segment_path(old), self._index_path(old)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._indexes.pop(old, None)
+
+    def append(self, text: str) -> None:
+        """
+        Append one or more newline-terminated messages to the store,
+        sealing the active segment beforehand if the messages would
+        otherwise cause it to exceed `max_segment_bytes`.
+        """
+        data = text.encode("utf-8")
+        with self._lock:
+            self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            index = self._get_active_index()
+            try:
+                size = os.path.getsize(self._active_path)
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self.max_segment_bytes:
+                self._seal()
+                index = self._get_active_index()
+            with open(self._active_path, "ab") as f:
+                f.write(data)
+            for line in text.splitlines():
+                index.add(line)
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        task_uuid: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Yield (in the order in which they were stored) the messages with
+        timestamps between `start` and `end` (inclusive) and/or belonging
+        to the task identified by `task_uuid`, decompressing only those
+        segments that may contain such messages.
+        """
+        with self._lock:
+            segments = [
+                s
+                for s in self._sealed_segments()
+                if self._load_index(s).overlaps(start, end, task_uuid)
+            ]
+            if self._get_active_index().overlaps(start, end, task_uuid):
+                try:
+                    active = self._active_path.read_text("utf-8")
+                except FileNotFoundError:
+                    active = ""
+            else:
+                active = ""
+        for segment in segments:
+            for line in self._read_segment(segment):
+                if line and _matches(line, start, end, task_uuid):
+                    yield line
+        for line in active.splitlines():
+            if line and _matches(line, start, end, task_uuid):
+                yield line
+
+    def read(self) -> str:
+        return "\n".join(self.query())
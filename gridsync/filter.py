@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
-from typing import TYPE_CHECKING, Optional
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from gridsync import autostart_file_path, config_dir, pkgdir
 from gridsync.crypto import trunchash
@@ -13,13 +16,15 @@ if TYPE_CHECKING:
 
 
 def is_eliot_log_message(s: str) -> bool:
-    try:
-        data = json.loads(s)
-    except json.decoder.JSONDecodeError:
-        return False
-    if isinstance(data, dict) and "timestamp" in data and "task_uuid" in data:
-        return True
-    return False
+    """
+    Return whether the given line looks like an eliot log message.
+
+    This is called for every line that a subprocess writes and so only
+    performs a cheap check of the line's contents; the message is not
+    actually parsed (or canonicalized) until the logs are exported (see
+    `apply_eliot_filters`).
+    """
+    return s.startswith("{") and '"task_uuid"' in s and '"timestamp"' in s
 
 
 def get_filters(core: Core) -> list:
@@ -122,20 +127,102 @@ def get_filters(core: Core) -> list:
     return filters
 
 
+def _trie_pattern(strings: Iterable[str]) -> str:
+    # Build a regular expression that matches any of the given strings
+    # from a trie of those strings (e.g., "abc", "abd", and "ab" become
+    # "ab(?:c|d)?") so that the regex engine can rule out non-matching
+    # positions by examining a single branch rather than by attempting
+    # to match every string in turn. Since quantifiers are greedy, the
+    # longest string that matches at a given position is always chosen.
+    trie: dict = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        prefix = ""
+        while len(node) == 1 and "" not in node:  # Collapse chains
+            char, node = next(iter(node.items()))
+            prefix += re.escape(char)
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return prefix
+        pattern = "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern += "?"
+        return prefix + pattern
+
+    return build(trie)
+
+
+class Redactor:
+    """
+    Replace all occurrences of any of the strings in `filters` (a list of
+    (string, mask) tuples, as returned by `get_filters`) with their masks
+    in a single pass over the input (rather than in one pass per filter).
+
+    Where several strings match at the same position, the longest one is
+    replaced; where the same string is given more than once, the first of
+    its masks is used.
+    """
+
+    def __init__(self, filters: list) -> None:
+        self.masks: dict[str, str] = {}
+        for s, mask in filters:
+            if s and mask and s not in self.masks:
+                self.masks[s] = "<Filtered:{}>".format(mask)
+        self.regex: Optional[re.Pattern] = None
+        if self.masks:
+            self.regex = re.compile(_trie_pattern(self.masks))
+
+    def _replace(self, match: re.Match) -> str:
+        return self.masks[match.group(0)]
+
+    def apply(self, in_str: str) -> str:
+        if self.regex is None:
+            return in_str
+        return self.regex.sub(self._replace, in_str)
+
+
+@lru_cache(maxsize=8)
+def _compile_filters(filters: tuple) -> Redactor:
+    return Redactor(list(filters))
+
+
+def compile_filters(filters: list) -> Redactor:
+    return _compile_filters(tuple(filters))
+
+
 def apply_filters(in_str: str, filters: list) -> str:
-    filtered = in_str
-    for s, mask in filters:
-        if s and mask:
-            filtered = filtered.replace(s, "<Filtered:{}>".format(mask))
-    return filtered
+    return compile_filters(filters).apply(in_str)
 
 
-def get_mask(string: str, tag: str, identifier: Optional[str] = None) -> str:
+def _get_mask(string: str, tag: str, identifier: Optional[str] = None) -> str:
     if identifier:
         return "<Filtered:{}>".format(tag + ":" + identifier)
     return "<Filtered:{}>".format(tag + ":" + trunchash(string))
 
 
+# Memoized since the same values (paths, capabilities, etc.) tend to recur
+# many times throughout a log and would otherwise be re-hashed every time
+# they are encountered.
+_get_mask_cached = lru_cache(maxsize=4096)(_get_mask)
+
+
+def get_mask(string: str, tag: str, identifier: Optional[str] = None) -> str:
+    if isinstance(string, str):
+        return _get_mask_cached(string, tag, identifier)
+    # The values of eliot fields are not necessarily strings (or even
+    # hashable, and so cannot be looked up in the cache).
+    return _get_mask(string, tag, identifier)
+
+
 def apply_filter(
     dictionary: dict, key: str, tag: str, identifier: Optional[str] = None
 ) -> None:
@@ -144,164 +231,138 @@ def apply_filter(
         dictionary[key] = get_mask(value, tag, identifier=identifier)
 
 
-def _apply_filter_by_action_type(  # noqa: C901 [max-complexity]
-    msg: dict, action_type: str, identifier: Optional[str] = None
-) -> dict:
-    if action_type == "dirnode:add-file":
-        apply_filter(msg, "name", "Path")
-
-    elif action_type == "invite-to-magic-folder":
-        apply_filter(msg, "nickname", "MemberName")
-
-    elif action_type == "join-magic-folder":
-        apply_filter(msg, "local_dir", "Path")
-        apply_filter(msg, "invite_code", "InviteCode")
-
-    elif action_type == "magic-folder-db:update-entry":
-        apply_filter(msg, "last_downloaded_uri", "Capability")
-        apply_filter(msg, "last_uploaded_uri", "Capability")
-        apply_filter(msg, "relpath", "Path")
-
-    elif action_type == "magic-folder:add-pending":
-        apply_filter(msg, "relpath", "Path")
-
-    elif action_type == "magic-folder:downloader:get-latest-file":
-        apply_filter(msg, "name", "Path")
-
-    elif action_type == "magic-folder:full-scan":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-
-    elif action_type == "magic-folder:iteration":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-
-    elif action_type == "magic-folder:notified":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-        apply_filter(msg, "path", "Path")
-
-    elif action_type == "magic-folder:process-directory":
-        apply_filter(msg, "created_directory", "Path")
-
-    elif action_type == "magic-folder:process-item":
-        item = msg.get("item")
-        if item:
-            relpath = item.get("relpath")
-            if relpath:
-                msg["item"]["relpath"] = get_mask(relpath, "Path")
-
-    elif action_type == "magic-folder:processing-loop":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-
-    elif action_type == "magic-folder:remove-from-pending":
-        apply_filter(msg, "relpath", "Path")
-        pending = msg.get("pending")
-        if pending:
-            new = []
-            for path in pending:
-                new.append(get_mask(path, "Path"))
-            msg["pending"] = new
-
-    elif action_type == "magic-folder:rename-conflicted":
-        apply_filter(msg, "abspath_u", "Path")
-        apply_filter(msg, "replacement_path_u", "Path")
-        apply_filter(msg, "result", "Path")
-
-    elif action_type == "magic-folder:rename-deleted":
-        apply_filter(msg, "abspath_u", "Path")
-        apply_filter(msg, "result", "Path")
-
-    elif action_type == "magic-folder:scan-remote-dmd":
-        apply_filter(msg, "nickname", "MemberName")
-
-    elif action_type == "magic-folder:start-downloading":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-
-    elif action_type == "magic-folder:start-monitoring":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-
-    elif action_type == "magic-folder:start-uploading":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-
-    elif action_type == "magic-folder:stop":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
-
-    elif action_type == "magic-folder:stop-monitoring":
-        apply_filter(msg, "nickname", "GatewayName", identifier)
+# Fields of eliot messages to filter, by action type or message type. Each
+# rule is a tuple of (field, tag), or of (field, tag, True) if the
+# identifier of the gateway should be used for the mask. Fields nested
+# inside other objects are separated by "." while "[]" denotes a field
+# whose value is a list of items, each of which should be masked.
+ACTION_TYPE_RULES: dict[str, tuple[tuple, ...]] = {
+    "dirnode:add-file": (("name", "Path"),),
+    "invite-to-magic-folder": (("nickname", "MemberName"),),
+    "join-magic-folder": (
+        ("local_dir", "Path"),
+        ("invite_code", "InviteCode"),
+    ),
+    "magic-folder-db:update-entry": (
+        ("last_downloaded_uri", "Capability"),
+        ("last_uploaded_uri", "Capability"),
+        ("relpath", "Path"),
+    ),
+    "magic-folder:add-pending": (("relpath", "Path"),),
+    "magic-folder:downloader:get-latest-file": (("name", "Path"),),
+    "magic-folder:full-scan": (("nickname", "GatewayName", True),),
+    "magic-folder:iteration": (("nickname", "GatewayName", True),),
+    "magic-folder:notified": (
+        ("nickname", "GatewayName", True),
+        ("path", "Path"),
+    ),
+    "magic-folder:process-directory": (("created_directory", "Path"),),
+    "magic-folder:process-item": (("item.relpath", "Path"),),
+    "magic-folder:processing-loop": (("nickname", "GatewayName", True),),
+    "magic-folder:remove-from-pending": (
+        ("relpath", "Path"),
+        ("pending[]", "Path"),
+    ),
+    "magic-folder:rename-conflicted": (
+        ("abspath_u", "Path"),
+        ("replacement_path_u", "Path"),
+        ("result", "Path"),
+    ),
+    "magic-folder:rename-deleted": (
+        ("abspath_u", "Path"),
+        ("result", "Path"),
+    ),
+    "magic-folder:scan-remote-dmd": (("nickname", "MemberName"),),
+    "magic-folder:start-downloading": (("nickname", "GatewayName", True),),
+    "magic-folder:start-monitoring": (("nickname", "GatewayName", True),),
+    "magic-folder:start-uploading": (("nickname", "GatewayName", True),),
+    "magic-folder:stop": (("nickname", "GatewayName", True),),
+    "magic-folder:stop-monitoring": (("nickname", "GatewayName", True),),
+    "magic-folder:write-downloaded-file": (("abspath", "Path"),),
+    "notify-when-pending": (("filename", "Path"),),
+    "watchdog:inotify:any-event": (("path", "Path"),),
+}
+
+MESSAGE_TYPE_RULES: dict[str, tuple[tuple, ...]] = {
+    "fni": (("info", "Event"),),
+    "magic-folder:add-to-download-queue": (("relpath", "Path"),),
+    "magic-folder:all-files": (("files[]", "Path"),),
+    "magic-folder:downloader:get-latest-file:collective-scan": (
+        ("dmds[]", "MemberName"),
+    ),
+    "magic-folder:item:status-change": (("relpath", "Path"),),
+    "magic-folder:maybe-upload": (("relpath", "Path"),),
+    "magic-folder:notified-object-disappeared": (("path", "Path"),),
+    "magic-folder:remote-dmd-entry": (
+        ("relpath", "Path"),
+        ("remote_uri", "Capability"),
+        ("pathentry.last_downloaded_uri", "Capability"),
+        ("pathentry.last_uploaded_uri", "Capability"),
+    ),
+    "magic-folder:scan-batch": (("batch[]", "Path"),),
+    "processing": (("info", "Event"),),
+}
+
+
+_CompiledRule = tuple[tuple[str, ...], str, bool, str, bool]
+
+
+def _compile_rules(
+    rules: dict[str, tuple[tuple, ...]],
+) -> dict[str, list[_CompiledRule]]:
+    compiled: dict[str, list[_CompiledRule]] = {}
+    for type_, type_rules in rules.items():
+        compiled[type_] = []
+        for rule in type_rules:
+            field, tag = rule[:2]
+            use_identifier = len(rule) > 2 and rule[2]
+            is_list = field.endswith("[]")
+            *parents, key = field.removesuffix("[]").split(".")
+            compiled[type_].append(
+                (tuple(parents), key, is_list, tag, use_identifier)
+            )
+    return compiled
 
-    elif action_type == "magic-folder:write-downloaded-file":
-        apply_filter(msg, "abspath", "Path")
 
-    elif action_type == "notify-when-pending":
-        apply_filter(msg, "filename", "Path")
+_ACTION_TYPE_RULES = _compile_rules(ACTION_TYPE_RULES)
+_MESSAGE_TYPE_RULES = _compile_rules(MESSAGE_TYPE_RULES)
 
-    elif action_type == "watchdog:inotify:any-event":
-        apply_filter(msg, "path", "Path")
 
+def _apply_rules(
+    msg: dict, rules: list, identifier: Optional[str] = None
+) -> dict:
+    for parents, key, is_list, tag, use_identifier in rules:
+        target = msg
+        for parent in parents:
+            child: Optional[dict] = target.get(parent)
+            if not child:
+                break
+            target = child
+        else:
+            if is_list:
+                values = target.get(key)
+                if values:
+                    target[key] = [get_mask(value, tag) for value in values]
+            else:
+                apply_filter(
+                    target, key, tag, identifier if use_identifier else None
+                )
     return msg
 
 
-def _apply_filter_by_message_type(  # noqa: C901 [max-complexity]
-    msg: dict, message_type: str
+def _apply_filter_by_action_type(
+    msg: dict, action_type: str, identifier: Optional[str] = None
 ) -> dict:
-    if message_type == "fni":
-        apply_filter(msg, "info", "Event")
-
-    elif message_type == "magic-folder:add-to-download-queue":
-        apply_filter(msg, "relpath", "Path")
-
-    elif message_type == "magic-folder:all-files":
-        files = msg.get("files")
-        if files:
-            new = []
-            for path in files:
-                new.append(get_mask(path, "Path"))
-            msg["files"] = new
-
-    elif message_type == (
-        "magic-folder:downloader:get-latest-file:collective-scan"
-    ):
-        dmds = msg.get("dmds")
-        if dmds:
-            new = []
-            for dmd in dmds:
-                new.append(get_mask(dmd, "MemberName"))
-            msg["dmds"] = new
-
-    elif message_type == "magic-folder:item:status-change":
-        apply_filter(msg, "relpath", "Path")
-
-    elif message_type == "magic-folder:maybe-upload":
-        apply_filter(msg, "relpath", "Path")
-
-    elif message_type == "magic-folder:notified-object-disappeared":
-        apply_filter(msg, "path", "Path")
-
-    elif message_type == "magic-folder:remote-dmd-entry":
-        apply_filter(msg, "relpath", "Path")
-        apply_filter(msg, "remote_uri", "Capability")
-        pathentry = msg.get("pathentry")
-        if pathentry:
-            last_downloaded_uri = pathentry.get("last_downloaded_uri")
-            if last_downloaded_uri:
-                pathentry["last_downloaded_uri"] = get_mask(
-                    last_downloaded_uri, "Capability"
-                )
-            last_uploaded_uri = pathentry.get("last_uploaded_uri")
-            if last_uploaded_uri:
-                pathentry["last_uploaded_uri"] = get_mask(
-                    last_uploaded_uri, "Capability"
-                )
-
-    elif message_type == "magic-folder:scan-batch":
-        batch = msg.get("batch")
-        if batch:
-            new = []
-            for path in batch:
-                new.append(get_mask(path, "Path"))
-            msg["batch"] = new
+    rules = _ACTION_TYPE_RULES.get(action_type)
+    if rules:
+        _apply_rules(msg, rules, identifier)
+    return msg
 
-    elif message_type == "processing":
-        apply_filter(msg, "info", "Event")
 
+def _apply_filter_by_message_type(msg: dict, message_type: str) -> dict:
+    rules = _MESSAGE_TYPE_RULES.get(message_type)
+    if rules:
+        _apply_rules(msg, rules)
     return msg
 
 
@@ -324,10 +385,23 @@ def filter_eliot_log_message(
 def filter_eliot_logs(
     messages: list[str], identifier: Optional[str] = None
 ) -> list[str]:
+    """
+    Filter each of the given eliot messages, skipping any that are not
+    valid.
+    """
     filtered = []
+    skipped = 0
     for message in messages:
         if message:
-            filtered.append(filter_eliot_log_message(message, identifier))
+            try:
+                filtered.append(filter_eliot_log_message(message, identifier))
+            except (ValueError, TypeError, AttributeError):
+                # Eliot messages are logged without being parsed first so
+                # a malformed (e.g., truncated) line may occasionally turn
+                # up here; since it cannot be filtered, leave it out.
+                skipped += 1
+    if skipped:
+        logging.warning("Skipped %i malformed eliot log message(s)", skipped)
     return filtered
 
 
@@ -340,5 +414,7 @@ def join_eliot_logs(messages: list[str]) -> str:
 
 
 def apply_eliot_filters(content: str, identifier: Optional[str] = None) -> str:
+    # filter_eliot_logs already returns canonical (i.e., key-sorted) JSON
+    # so there is no need to round-trip the messages through join_eliot_logs
     messages = content.split("\n")
-    return join_eliot_logs(filter_eliot_logs(messages, identifier))
+    return "\n".join(filter_eliot_logs(messages, identifier))
@@ -1,12 +1,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Optional, Protocol
 
 import attr
 
 from gridsync.desktop import notify
-from gridsync.gui.debug import DebugExporter
 from gridsync.gui.main_window import MainWindow
 from gridsync.gui.preferences import PreferencesWindow
 from gridsync.gui.systray import SystemTrayIcon
@@ -15,6 +14,7 @@ from gridsync.preferences import Preferences
 
 if TYPE_CHECKING:
     from gridsync.core import Core
+    from gridsync.gui.debug import DebugExporter
 
 
 class AbstractGui(Protocol):
@@ -57,7 +57,13 @@ class Gui:
     main_window: MainWindow = attr.ib()
     preferences_window: PreferencesWindow = attr.ib()
     systray: SystemTrayIcon = attr.ib()
-    debug_exporter: DebugExporter = attr.ib()
+
+    # The DebugExporter (and the log-filtering machinery that it depends
+    # on) is only needed when the user explicitly asks for it, so defer
+    # importing and constructing it until then; see `debug_exporter`.
+    _debug_exporter: Optional[DebugExporter] = attr.ib(
+        default=None, init=False
+    )
 
     @welcome_dialog.default
     def _default_welcome_dialog(self) -> WelcomeDialog:
@@ -75,9 +81,13 @@ class Gui:
     def _systray_default(self) -> SystemTrayIcon:
         return SystemTrayIcon(self)
 
-    @debug_exporter.default
-    def _debug_exporter_default(self) -> DebugExporter:
-        return DebugExporter(self.core)
+    @property
+    def debug_exporter(self) -> DebugExporter:
+        if self._debug_exporter is None:
+            from gridsync.gui.debug import DebugExporter
+
+            self._debug_exporter = DebugExporter(self.core)
+        return self._debug_exporter
 
     def show_message(
         self, title: str, message: str, duration: int = 5000
@@ -1,19 +1,36 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import json
 import logging
 import os
 import platform
 import sys
 import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Optional
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+)
 
+import attr
 from atomicwrites import atomic_write
 from qtpy.QtCore import QObject, QSize, Qt, QThread, Signal
-from qtpy.QtGui import QFontDatabase, QIcon
+from qtpy.QtGui import (
+    QFontDatabase,
+    QHideEvent,
+    QIcon,
+    QShowEvent,
+    QTextCursor,
+)
 from qtpy.QtWidgets import (
     QCheckBox,
+    QComboBox,
     QDialog,
     QFileDialog,
     QGridLayout,
@@ -32,17 +49,19 @@ from gridsync import (
 )
 from gridsync.desktop import get_clipboard_modes, set_clipboard_text
 from gridsync.filter import (
-    apply_eliot_filters,
-    apply_filters,
+    compile_filters,
+    filter_eliot_logs,
     get_filters,
     get_mask,
 )
 from gridsync.gui.widgets import HSpacer
-from gridsync.log import read_log
+from gridsync.log import iter_log
 from gridsync.msg import error
 
 if TYPE_CHECKING:
     from gridsync.core import Core
+    from gridsync.filter import Redactor
+    from gridsync.tahoe import Tahoe
 
 
 if sys.platform == "darwin":
@@ -82,106 +101,307 @@ Datetime:     {datetime.now(timezone.utc).isoformat()}
 """
 
 
-def _format_log(log_name: str, content: str) -> str:
-    if content and not content.endswith("\n"):
-        content += "\n"
+def _log_beginning(log_name: str) -> str:
     return (
         f"-------------------- Beginning of {log_name} --------------------\n"
-        f"{content}"
-        f"-------------------- End of {log_name} --------------------\n\n"
     )
 
 
+def _log_end(log_name: str) -> str:
+    return f"-------------------- End of {log_name} --------------------\n\n"
+
+
+def _format_log(log_name: str, content: str) -> str:
+    if content and not content.endswith("\n"):
+        content += "\n"
+    return f"{_log_beginning(log_name)}{content}{_log_end(log_name)}"
+
+
+def _chunked(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    chunk = []
+    for line in lines:
+        chunk.append(line.rstrip("\n"))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _since(lines: Iterable[str], since: float) -> Iterator[str]:
+    # Lines that do not begin with a timestamp are continuations of a
+    # multi-line message (e.g., a traceback) and are included (or not)
+    # along with the line that preceded them.
+    include = False
+    for line in lines:
+        try:
+            timestamp = datetime.fromisoformat(line.split(" ", 1)[0])
+        except ValueError:
+            pass
+        else:
+            include = timestamp.timestamp() >= since
+        if include:
+            yield line
+
+
+class _IterEliotLog(Protocol):
+    def __call__(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterable[str]: ...
+
+
+@attr.s(frozen=True)
+class _GatewaySnapshot:
+    gateway: Tahoe = attr.ib()
+    # Process metrics, keyed by "Tahoe-LAFS" and "Magic-Folder"
+    process_metrics: dict[str, dict] = attr.ib()
+    sync_metrics: dict = attr.ib()
+
+
+@attr.s(frozen=True)
+class _Snapshot:
+    header: str = attr.ib()
+    redactor: Redactor = attr.ib()
+    gateways: list[_GatewaySnapshot] = attr.ib()
+
+
 class LogLoader(QObject):
-    done = Signal()
+    """
+    Load (and filter) the application, Tahoe-LAFS, and Magic-Folder logs.
+
+    Logs are streamed from disk and filtered in chunks of `chunk_size`
+    lines rather than being read into memory in their entirety first.
+    If `max_lines` is set, only the last `max_lines` lines of each log are
+    loaded; if `since` is set, only the lines that were logged within the
+    last `since` seconds are. After each log has been loaded, `progress`
+    is emitted with the number of logs loaded so far and the total.
+
+    Since `load` is run in a separate thread, the state that it needs
+    from the GUI and the gateways (which are otherwise only accessed from
+    the main thread) is copied beforehand with `take_snapshot`, which
+    must be called from the main thread.
+    """
 
-    def __init__(self, core: Core) -> None:
+    done = Signal()
+    progress = Signal(int, int)
+
+    def __init__(
+        self,
+        core: Core,
+        max_lines: Optional[int] = None,
+        since: Optional[float] = None,
+        chunk_size: int = 1000,
+    ) -> None:
         super().__init__()
         self.core = core
-        self.content = ""
-        self.filtered_content = ""
+        self.max_lines = max_lines
+        self.since = since
+        self.chunk_size = chunk_size
+        # The loaded logs are kept as lists of chunks (rather than being
+        # joined into single, very large, strings); see `content`.
+        self.content_chunks: list[str] = []
+        self.filtered_content_chunks: list[str] = []
+        self._snapshot: Optional[_Snapshot] = None
+
+    def take_snapshot(self) -> None:
+        gateways = []
+        for gateway in self.core.gui.main_window.gateways:
+            gateways.append(
+                _GatewaySnapshot(
+                    gateway,
+                    {
+                        "Tahoe-LAFS": gateway.supervisor.metrics(),
+                        "Magic-Folder": (
+                            gateway.magic_folder.supervisor.metrics()
+                        ),
+                    },
+                    gateway.magic_folder.events.metrics.to_dict(),
+                )
+            )
+        self._snapshot = _Snapshot(
+            _make_header(self.core),
+            compile_filters(get_filters(self.core)),
+            gateways,
+        )
+
+    @property
+    def content(self) -> str:
+        return "".join(self.content_chunks)
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self.content_chunks = [value]
+
+    @property
+    def filtered_content(self) -> str:
+        return "".join(self.filtered_content_chunks)
+
+    @filtered_content.setter
+    def filtered_content(self, value: str) -> None:
+        self.filtered_content_chunks = [value]
+
+    def _select_lines(self, lines: Iterable[str]) -> Iterable[str]:
+        if self.since is not None:
+            lines = _since(lines, time.time() - self.since)
+        if self.max_lines is not None:
+            lines = deque(lines, maxlen=self.max_lines)
+        return lines
+
+    def _select_eliot_messages(
+        self, iter_eliot_log: _IterEliotLog
+    ) -> Iterable[str]:
+        if self.since is not None:
+            lines = iter_eliot_log(start=time.time() - self.since)
+        else:
+            lines = iter_eliot_log()
+        if self.max_lines is not None:
+            lines = deque(lines, maxlen=self.max_lines)
+        return lines
+
+    def _add_log(  # pylint: disable=too-many-arguments
+        self,
+        content: list[str],
+        filtered_content: list[str],
+        log_names: tuple[str, str],
+        lines: Iterable[str],
+        filter_lines: Callable[[list[str]], str],
+    ) -> None:
+        log_name, masked_log_name = log_names
+        empty = True
+        for chunk in _chunked(lines, self.chunk_size):
+            if empty:
+                content.append(_log_beginning(log_name))
+                filtered_content.append(_log_beginning(masked_log_name))
+                empty = False
+            content.append("\n".join(chunk) + "\n")
+            filtered_content.append(filter_lines(chunk) + "\n")
+        if not empty:
+            content.append(_log_end(log_name))
+            filtered_content.append(_log_end(masked_log_name))
 
     def load(self) -> None:
         start_time = time.time()
-        self.content = _make_header(self.core) + _format_log(
-            f"{APP_NAME} log", read_log()
+        if self._snapshot is None:
+            self.take_snapshot()
+        snapshot, self._snapshot = self._snapshot, None
+        assert snapshot is not None
+        redactor = snapshot.redactor
+        total = 1 + len(snapshot.gateways)
+        header = snapshot.header
+        # Logs are accumulated as lists of chunks (and never joined) to
+        # avoid copying ever-larger strings.
+        content = [header]
+        filtered_content = [redactor.apply(header)]
+
+        def filter_lines(chunk: list[str]) -> str:
+            return redactor.apply("\n".join(chunk))
+
+        self._add_log(
+            content,
+            filtered_content,
+            (f"{APP_NAME} log", f"{APP_NAME} log"),
+            self._select_lines(iter_log()),
+            filter_lines,
         )
-        filters = get_filters(self.core)
-        self.filtered_content = apply_filters(self.content, filters)
-        for i, gateway in enumerate(self.core.gui.main_window.gateways):
+        self.progress.emit(1, total)
+        for i, gateway_snapshot in enumerate(snapshot.gateways):
+            gateway = gateway_snapshot.gateway
             gateway_id = str(i + 1)
             gateway_mask = get_mask(gateway.name, "GatewayName", gateway_id)
 
-            tahoe_stdout = gateway.get_log("stdout")
-            if tahoe_stdout:
-                self.content += _format_log(
-                    f"{gateway.name} Tahoe-LAFS stdout log", tahoe_stdout
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Tahoe-LAFS stdout log",
-                    apply_filters(tahoe_stdout, filters),
-                )
-            tahoe_stderr = gateway.get_log("stderr")
-            if tahoe_stderr:
-                self.content += _format_log(
-                    f"{gateway.name} Tahoe-LAFS stderr log", tahoe_stderr
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Tahoe-LAFS stderr log",
-                    apply_filters(tahoe_stderr, filters),
-                )
-            tahoe_eliot = gateway.get_log("eliot")
-            if tahoe_eliot:
-                self.content += _format_log(
-                    f"{gateway.name} Tahoe-LAFS eliot log", tahoe_eliot
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Tahoe-LAFS eliot log",
-                    apply_eliot_filters(tahoe_eliot, gateway_id),
-                )
-            magic_folder_stdout = gateway.magic_folder.get_log("stdout")
-            if magic_folder_stdout:
-                self.content += _format_log(
-                    f"{gateway.name} Magic-Folder stdout log",
-                    magic_folder_stdout,
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Magic-Folder stdout log",
-                    apply_filters(magic_folder_stdout, filters),
+            def filter_eliot_lines(
+                chunk: list[str], gateway_id: str = gateway_id
+            ) -> str:
+                return "\n".join(filter_eliot_logs(chunk, gateway_id))
+
+            for process, obj in (
+                ("Tahoe-LAFS", gateway),
+                ("Magic-Folder", gateway.magic_folder),
+            ):
+                self._add_log(
+                    content,
+                    filtered_content,
+                    (
+                        f"{gateway.name} {process} process metrics",
+                        f"{gateway_mask} {process} process metrics",
+                    ),
+                    json.dumps(
+                        gateway_snapshot.process_metrics[process],
+                        indent=2,
+                        sort_keys=True,
+                    ).split("\n"),
+                    filter_lines,
                 )
-            magic_folder_stderr = gateway.magic_folder.get_log("stderr")
-            if magic_folder_stderr:
-                self.content += _format_log(
-                    f"{gateway.name} Magic-Folder stderr log",
-                    magic_folder_stderr,
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Magic-Folder stderr log",
-                    apply_filters(magic_folder_stderr, filters),
-                )
-            magic_folder_eliot = gateway.magic_folder.get_log("eliot")
-            if magic_folder_eliot:
-                self.content += _format_log(
-                    f"{gateway.name} Magic-Folder eliot log",
-                    magic_folder_eliot,
-                )
-                self.filtered_content += _format_log(
-                    f"{gateway_mask} Magic-Folder eliot log",
-                    apply_eliot_filters(magic_folder_eliot, gateway_id),
+                for stream in ("stdout", "stderr"):
+                    self._add_log(
+                        content,
+                        filtered_content,
+                        (
+                            f"{gateway.name} {process} {stream} log",
+                            f"{gateway_mask} {process} {stream} log",
+                        ),
+                        self._select_lines(obj.iter_log(stream)),
+                        filter_lines,
+                    )
+                self._add_log(
+                    content,
+                    filtered_content,
+                    (
+                        f"{gateway.name} {process} eliot log",
+                        f"{gateway_mask} {process} eliot log",
+                    ),
+                    self._select_eliot_messages(obj.iter_eliot_log),
+                    filter_eliot_lines,
                 )
+            self._add_log(
+                content,
+                filtered_content,
+                (
+                    f"{gateway.name} sync metrics",
+                    f"{gateway_mask} sync metrics",
+                ),
+                json.dumps(
+                    gateway_snapshot.sync_metrics,
+                    indent=2,
+                    sort_keys=True,
+                ).split("\n"),
+                filter_lines,
+            )
+            self.progress.emit(i + 2, total)
+        self.content_chunks = content
+        self.filtered_content_chunks = filtered_content
         self.done.emit()
         logging.debug("Loaded logs in %f seconds", time.time() - start_time)
 
 
+# The portions of the logs that may be selected for export; each is a
+# (description, max_lines, since) tuple (see `LogLoader`).
+LOG_RANGES: list[tuple[str, Optional[int], Optional[float]]] = [
+    ("Entire logs", None, None),
+    ("Last hour", None, 60 * 60),
+    ("Last 24 hours", None, 60 * 60 * 24),
+    ("Last 7 days", None, 60 * 60 * 24 * 7),
+    ("Last 10,000 lines of each log", 10_000, None),
+]
+
+
 class DebugExporter(QDialog):
-    def __init__(self, core: Core, parent: Optional[QWidget] = None) -> None:
+    def __init__(
+        self,
+        core: Core,
+        parent: Optional[QWidget] = None,
+        max_lines: Optional[int] = None,
+        since: Optional[float] = None,
+    ) -> None:
         super().__init__(parent)
         self.core = core
+        self._eliot_subscriptions: list[Tahoe] = []
 
-        self.log_loader = LogLoader(self.core)
+        self.log_loader = LogLoader(self.core, max_lines, since)
         self.log_loader_thread = QThread()
         self.log_loader.moveToThread(self.log_loader_thread)
         self.log_loader.done.connect(self.on_loaded)
+        self.log_loader.progress.connect(self.on_progress)
         self.log_loader_thread.started.connect(self.log_loader.load)
 
         self.setMinimumSize(800, 600)
@@ -201,6 +421,20 @@ class DebugExporter(QDialog):
         self.reload_button = QPushButton("Reload")
         self.reload_button.clicked.connect(self.load)
 
+        self.range_combo_box = QComboBox(self)
+        self.range_combo_box.setToolTip("The portion of the logs to include")
+        for description, max_lines_, since_ in LOG_RANGES:
+            self.range_combo_box.addItem(description, (max_lines_, since_))
+        ranges = [(lines, secs) for _, lines, secs in LOG_RANGES]
+        if (max_lines, since) in ranges:
+            index = ranges.index((max_lines, since))
+        else:
+            self.range_combo_box.addItem("Custom", (max_lines, since))
+            index = self.range_combo_box.count() - 1
+        self.range_combo_box.setCurrentIndex(index)
+        self.range_combo_box.currentIndexChanged.connect(self.load)
+        self._reload_pending = False
+
         self.checkbox = QCheckBox(
             "Conceal potentially-identifying information", self
         )
@@ -240,9 +474,10 @@ class DebugExporter(QDialog):
         checkbox_layout.addWidget(self.filter_info_button, 1, 2)
 
         buttons_layout = QGridLayout()
-        buttons_layout.addWidget(self.reload_button, 1, 1)
-        buttons_layout.addWidget(self.copy_button, 1, 2)
-        buttons_layout.addWidget(self.export_button, 1, 3)
+        buttons_layout.addWidget(self.range_combo_box, 1, 1)
+        buttons_layout.addWidget(self.reload_button, 1, 2)
+        buttons_layout.addWidget(self.copy_button, 1, 3)
+        buttons_layout.addWidget(self.export_button, 1, 4)
 
         bottom_layout = QGridLayout()
         bottom_layout.addLayout(checkbox_layout, 1, 1)
@@ -253,12 +488,41 @@ class DebugExporter(QDialog):
         layout.addWidget(self.plaintextedit, 1, 1)
         layout.addLayout(bottom_layout, 2, 1)
 
+    def showEvent(self, event: QShowEvent) -> None:
+        # Collect the eliot logs of each gateway while the dialog is open
+        # (even if logging is disabled) so that reloading it includes
+        # recent messages. If logging is disabled, nothing is collected
+        # before this point, so the logs loaded when the dialog is first
+        # shown contain no eliot messages; "Reload" to include those
+        # received since.
+        super().showEvent(event)
+        if not self._eliot_subscriptions:
+            for gateway in self.core.gui.main_window.gateways:
+                gateway.subscribe_eliot_log()
+                self._eliot_subscriptions.append(gateway)
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        for gateway in self._eliot_subscriptions:
+            gateway.unsubscribe_eliot_log()
+        self._eliot_subscriptions = []
+        super().hideEvent(event)
+
+    def _set_text(self, chunks: list[str]) -> None:
+        # Insert the logs a chunk at a time rather than joining them into
+        # one (potentially very large) string first.
+        self.plaintextedit.clear()
+        cursor = QTextCursor(self.plaintextedit.document())
+        cursor.beginEditBlock()
+        for chunk in chunks:
+            cursor.insertText(chunk)
+        cursor.endEditBlock()
+
     def on_checkbox_state_changed(self, state: int) -> None:
         scrollbar_position = self.scrollbar.value()
         if state == Qt.Checked:
-            self.plaintextedit.setPlainText(self.log_loader.filtered_content)
+            self._set_text(self.log_loader.filtered_content_chunks)
         else:
-            self.plaintextedit.setPlainText(self.log_loader.content)
+            self._set_text(self.log_loader.content_chunks)
         # Needed on some platforms to maintain scroll step accuracy/consistency
         self.scrollbar.setValue(self.scrollbar.maximum())
         self.scrollbar.setValue(scrollbar_position)
@@ -274,15 +538,34 @@ class DebugExporter(QDialog):
             msgbox.setText(self.filter_info_text)
         msgbox.show()
 
+    def on_progress(self, loaded: int, total: int) -> None:
+        self.plaintextedit.setPlainText(
+            f"Loading logs; please wait... ({loaded}/{total})"
+        )
+
     def on_loaded(self) -> None:
         self.on_checkbox_state_changed(self.checkbox.checkState())
         self.log_loader_thread.quit()
         self.log_loader_thread.wait()
+        if self._reload_pending:
+            self._reload_pending = False
+            self.load()
 
     def load(self) -> None:
         if self.log_loader_thread.isRunning():
+            if self.range_combo_box.currentData() != (
+                self.log_loader.max_lines,
+                self.log_loader.since,
+            ):
+                # The selected range changed while loading; load it again
+                # (with the new range) once the current load has finished.
+                self._reload_pending = True
             logging.warning("LogLoader thread is already running; returning")
             return
+        max_lines, since = self.range_combo_box.currentData()
+        self.log_loader.max_lines = max_lines
+        self.log_loader.since = since
+        self.log_loader.take_snapshot()
         self.log_loader_thread.start()
 
     def copy_to_clipboard(self) -> None:
@@ -1,22 +1,45 @@
 from __future__ import annotations
 
 import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, cast
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union, cast
 
+import attr
 from humanize import naturaltime
-from qtpy.QtCore import QEvent, QFileInfo, QPoint, Qt, QTimer, Slot
-from qtpy.QtGui import QCursor, QIcon, QPixmap, QShowEvent
+from qtpy.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QFileInfo,
+    QModelIndex,
+    QPoint,
+    QRect,
+    QSize,
+    Qt,
+    QTimer,
+    Signal,
+    Slot,
+)
+from qtpy.QtGui import (
+    QCursor,
+    QFontMetrics,
+    QIcon,
+    QImage,
+    QPainter,
+    QPixmap,
+    QShowEvent,
+)
 from qtpy.QtWidgets import (
     QAbstractItemView,
     QAction,
     QFileIconProvider,
     QGridLayout,
-    QLabel,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMenu,
-    QPushButton,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QWidget,
 )
 
@@ -25,140 +48,450 @@ from gridsync.desktop import open_enclosing_folder, open_path
 from gridsync.gui.color import BlendedColor
 from gridsync.gui.font import Font
 from gridsync.gui.status import StatusPanel
-from gridsync.gui.widgets import HSpacer
+from gridsync.gui.thumbnails import ThumbnailLoader, get_thumbnail_loader
+from gridsync.gui.ticker import get_relative_time_ticker
 
 if TYPE_CHECKING:
+    from qtpy.QtCore import QAbstractItemModel, QPersistentModelIndex
+    from qtpy.QtGui import QMouseEvent
+
     from gridsync.gui import AbstractGui
+    from gridsync.history_journal import HistoryEntry, HistoryJournal
     from gridsync.tahoe import Tahoe
 
 
-class HistoryItemWidget(QWidget):
-    def __init__(
-        self, action: str, path: str, mtime: int, parent: HistoryListWidget
-    ) -> None:
-        super().__init__(parent)
-        # TODO: Display author/participant info?
-        self.action = action
-        self.path = path
-        self.mtime = mtime
-        self._parent = parent
+@attr.s(eq=False)
+class HistoryItem:
+    # TODO: Display author/participant info?
+    action: str = attr.ib()
+    path: str = attr.ib()
+    mtime: int = attr.ib()
+    icon: Optional[QIcon] = attr.ib(default=None)
+    thumbnail: Optional[QPixmap] = attr.ib(default=None)
+    thumbnail_requested: bool = attr.ib(default=False)
+    # Computed once, rather than every time the item is painted
+    basename: str = attr.ib(
+        init=False,
+        default=attr.Factory(
+            lambda self: Path(self.path).resolve().name, takes_self=True
+        ),
+    )
+
+    @property
+    def details(self) -> str:
+        return "{} {}".format(
+            self.action.capitalize(),
+            naturaltime(int(time.time() - self.mtime)),
+        )
 
-        self._thumbnail_loaded = False
 
-        self.setAutoFillBackground(True)
+def _sort_key(item: HistoryItem) -> int:
+    return -item.mtime  # Newest on top
 
-        self.setToolTip(
-            f"{self.path}\n\n{self.action}: {time.ctime(self.mtime)}"
-        )
 
-        self.icon = QLabel()
-        self.icon.setPixmap(
-            QFileIconProvider().icon(QFileInfo(self.path)).pixmap(48, 48)
-        )
+class HistoryModel(QAbstractListModel):
+    """
+    A list of recently-changed files, sorted by modification time (newest
+    first) and holding (at most) `max_items` items.
 
-        self.basename_label = QLabel(Path(self.path).resolve().name)
-        self.basename_label.setFont(Font(11))
+    If `deduplicate` is set, adding an item for a path that is already in
+    the list replaces the existing item (which is found via an index of
+    paths rather than by searching through every item).
 
-        self.details_label = QLabel()
-        self.details_label.setFont(Font(10))
-        palette = self.palette()
-        dimmer_grey = BlendedColor(
-            palette.text().color(), palette.base().color(), 0.6
-        ).name()
-        self.details_label.setStyleSheet("color: {}".format(dimmer_grey))
+    Thumbnails are loaded in the background (by a ThumbnailLoader) when
+    requested with `load_thumbnail`.
 
-        self.button = QPushButton()
-        self.button.setIcon(QIcon(resource("dots-horizontal-triple.png")))
-        self.button.setStyleSheet("border: none;")
-        self.button.clicked.connect(self._parent.on_right_click)
-        self.button.hide()
+    If a `journal` is given, older items are read from it a page at a
+    time as the view requests them (see `canFetchMore` and `fetchMore`),
+    with `resolve_path` mapping the folder names and relative paths of
+    the journal's entries to (absolute) paths. Entries for which
+    `resolve_path` returns None (e.g., because the folder to which they
+    belong has not been loaded yet) are set aside until
+    `resolve_deferred` is called for their folder.
+    """
 
-        layout = QGridLayout(self)
-        layout.addWidget(self.icon, 1, 1, 2, 2)
-        layout.addWidget(self.basename_label, 1, 3)
-        layout.addWidget(self.details_label, 2, 3)
-        layout.addItem(HSpacer(), 4, 4)
-        layout.addWidget(self.button, 1, 5, 2, 2)
-
-        self.update_text()
-        QTimer.singleShot(50, self.load_thumbnail)
-
-    def update_text(self) -> None:
-        self.details_label.setText(
-            "{} {}".format(
-                self.action.capitalize(),
-                naturaltime(int(time.time() - self.mtime)),
-            )
-        )
-
-    def _do_load_thumbnail(self) -> None:
-        pixmap = QPixmap(self.path)
-        if not pixmap.isNull():
-            self.icon.setPixmap(
-                pixmap.scaled(
-                    48, 48, Qt.IgnoreAspectRatio, Qt.SmoothTransformation
-                )
-            )
+    ItemRole = Qt.UserRole
+    PathRole = Qt.UserRole + 1
 
-    def load_thumbnail(self) -> None:
-        if self.isVisible() and not self._thumbnail_loaded:
-            self._thumbnail_loaded = True
-            QTimer.singleShot(50, self._do_load_thumbnail)
-
-    def unhighlight(self) -> None:
-        self.button.hide()
-        palette = self.palette()
-        palette.setColor(self.backgroundRole(), self._parent.base_color)
-        self.setPalette(palette)
-
-    def enterEvent(self, _: QEvent) -> None:
-        self.button.show()
-        palette = self.palette()
-        palette.setColor(self.backgroundRole(), self._parent.highlighted_color)
-        self.setPalette(palette)
-        if self._parent.highlighted and self._parent.highlighted is not self:
-            try:
-                self._parent.highlighted.unhighlight()
-            except RuntimeError:  # Object has been deleted
-                pass
-        self._parent.highlighted = self
-
-
-class HistoryListWidget(QListWidget):
-    def __init__(
-        self, gateway: Tahoe, deduplicate: bool = True, max_items: int = 30
-    ) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        deduplicate: bool = True,
+        max_items: int = 10_000,
+        thumbnail_loader: Optional[ThumbnailLoader] = None,
+        journal: Optional[HistoryJournal] = None,
+        resolve_path: Optional[Callable[[str, str], Optional[str]]] = None,
+        page_size: int = 100,
+    ):
         super().__init__()
-        self.gateway = gateway
         self.deduplicate = deduplicate
         self.max_items = max_items
+        self.journal = journal
+        self.resolve_path = resolve_path or (lambda f, p: str(Path(f, p)))
+        self.page_size = page_size
+        self._journal_cursor: Optional[tuple[float, int]] = None
+        self._journal_exhausted = journal is None
+        # Journal entries (by folder) whose paths could not be resolved.
+        self._deferred: defaultdict[str, list[HistoryEntry]] = defaultdict(
+            list
+        )
+        self._deferred_count = 0
+        self._items: list[HistoryItem] = []
+        self._items_by_path: dict[str, HistoryItem] = {}
+        if thumbnail_loader is None:
+            thumbnail_loader = get_thumbnail_loader()
+        self.thumbnail_loader = thumbnail_loader
+        self.thumbnail_loader.thumbnail_loaded.connect(
+            self._on_thumbnail_loaded
+        )
+        self._thumbnail_requests: set[str] = set()
+
+    # override
+    def rowCount(
+        self, parent: Union[QModelIndex, QPersistentModelIndex] = QModelIndex()
+    ) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    # override
+    def data(  # type: ignore
+        self,
+        index: Union[QModelIndex, QPersistentModelIndex],
+        role: int = Qt.DisplayRole,
+    ) -> Any:
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+        item = self._items[index.row()]
+        value: object = None
+        if role == Qt.DisplayRole:
+            value = item.basename
+        elif role == Qt.DecorationRole:
+            if item.thumbnail is not None:
+                value = item.thumbnail
+            else:
+                if item.icon is None:
+                    item.icon = QFileIconProvider().icon(QFileInfo(item.path))
+                value = item.icon
+        elif role == Qt.ToolTipRole:
+            value = f"{item.path}\n\n{item.action}: {time.ctime(item.mtime)}"
+        elif role == HistoryModel.ItemRole:
+            value = item
+        elif role == HistoryModel.PathRole:
+            value = item.path
+        return value
+
+    # override
+    def canFetchMore(
+        self, parent: Union[QModelIndex, QPersistentModelIndex] = QModelIndex()
+    ) -> bool:
+        if parent.isValid():
+            return False
+        return (
+            not self._journal_exhausted and len(self._items) < self.max_items
+        )
 
-        palette = self.palette()
+    # override
+    def fetchMore(
+        self, parent: Union[QModelIndex, QPersistentModelIndex] = QModelIndex()
+    ) -> None:
+        if parent.isValid() or self.journal is None:
+            return
+        added = False
+        # Keep reading pages until something has been added (or there is
+        # nothing left to read); otherwise, if none of the entries of a
+        # page could be added, the view would never ask for more.
+        while not added and self.canFetchMore():
+            entries = self.journal.page(self.page_size, self._journal_cursor)
+            if len(entries) < self.page_size:
+                self._journal_exhausted = True
+            if entries:
+                self._journal_cursor = entries[-1].cursor
+            for entry in entries:
+                added |= self._add_journal_entry(entry)
+            if self._deferred_count >= self.max_items:
+                break
+
+    def _add_journal_entry(self, entry: HistoryEntry) -> bool:
+        path = self.resolve_path(entry.folder, entry.relpath)
+        if path is None:
+            if self._deferred_count < self.max_items:
+                self._deferred[entry.folder].append(entry)
+                self._deferred_count += 1
+            return False
+        mtime = int(entry.timestamp)
+        existing = self._items_by_path.get(path)
+        # Items that were added while the application was running are
+        # also in the journal; don't add them (or, if deduplicating, any
+        # older items for the same path) a second time.
+        if existing and (self.deduplicate or existing.mtime == mtime):
+            return False
+        item = HistoryItem(entry.action, path, mtime)
+        if self._insert_item(item, newest=False):
+            self._items_by_path.setdefault(path, item)
+            return True
+        return False
+
+    def resolve_deferred(self, folder: str) -> None:
+        """
+        Add the journal entries of the given folder that were set aside
+        (see `fetchMore`) because their paths could not be resolved.
+        """
+        entries = self._deferred.pop(folder, [])
+        self._deferred_count -= len(entries)
+        for entry in entries:
+            self._add_journal_entry(entry)
+
+    def forget_deferred(self, folder: str) -> None:
+        self._deferred_count -= len(self._deferred.pop(folder, []))
+
+    def item(self, row: int) -> Optional[HistoryItem]:
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def row(self, path: str) -> Optional[int]:
+        item = self._items_by_path.get(path)
+        if item is None:
+            return None
+        # Items are sorted by mtime so the row can be found by bisection
+        # (and then, among any items with the same mtime, by identity).
+        row = bisect_left(self._items, -item.mtime, key=_sort_key)
+        while row < len(self._items):
+            if self._items[row] is item:
+                return row
+            row += 1
+        return None
+
+    def _remove_row(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self._items.pop(row)
+        self.endRemoveRows()
+        if self._items_by_path.get(item.path) is item:
+            del self._items_by_path[item.path]
+
+    def add_item(self, action: str, path: str, mtime: int) -> None:
+        if self.deduplicate:
+            row = self.row(path)
+            if row is not None:
+                self._remove_row(row)
+        item = HistoryItem(action, path, mtime)
+        if self._insert_item(item):
+            self._items_by_path[path] = item
+
+    def _insert_item(self, item: HistoryItem, newest: bool = True) -> bool:
+        # Place the item before (or, if it is not the newest, after) any
+        # other items with the same mtime.
+        bisect = bisect_left if newest else bisect_right
+        row = bisect(self._items, -item.mtime, key=_sort_key)
+        if row >= self.max_items:
+            return False  # Older than everything that is being kept
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.insert(row, item)
+        self.endInsertRows()
+        while len(self._items) > self.max_items:
+            self._remove_row(len(self._items) - 1)
+        return True
+
+    def load_thumbnail(self, row: int) -> None:
+        item = self.item(row)
+        if item is None or item.thumbnail_requested:
+            return
+        item.thumbnail_requested = True
+        self._thumbnail_requests.add(item.path)
+        self.thumbnail_loader.request(item.path)
+
+    def cancel_thumbnails(self, keep: Optional[set[str]] = None) -> None:
+        """
+        Cancel the pending requests for thumbnails (other than those for
+        the paths in `keep`) so that they may be requested again later.
+        """
+        for path in self._thumbnail_requests - (keep or set()):
+            self.thumbnail_loader.cancel(path)
+            self._thumbnail_requests.discard(path)
+            item = self._items_by_path.get(path)
+            if item is not None and item.thumbnail is None:
+                item.thumbnail_requested = False
+
+    @Slot(str, QImage)
+    def _on_thumbnail_loaded(self, path: str, image: QImage) -> None:
+        if path not in self._thumbnail_requests:
+            return  # Requested by another model
+        self._thumbnail_requests.discard(path)
+        row = self.row(path)
+        if row is None or image.isNull():
+            return
+        self._items[row].thumbnail = QPixmap.fromImage(image)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class HistoryItemDelegate(QStyledItemDelegate):
+    """
+    Paint the items of a HistoryModel -- an icon (or thumbnail), the
+    basename of the file, a description of what happened to it and when,
+    and (when hovered over) an "action" button -- directly, rather than
+    creating a widget for each item.
+    """
+
+    action_button_clicked = Signal(QPoint)
+
+    ROW_HEIGHT = 64
+    ICON_SIZE = 48
+    BUTTON_SIZE = 16
+    MARGIN = 9
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        palette = parent.palette()
         self.base_color = palette.base().color()
         self.highlighted_color = BlendedColor(
             self.base_color, palette.highlight().color(), 0.88
         )  # Was #E6F1F7
-        self.highlighted: Optional[HistoryItemWidget] = None
-
+        self.details_color = BlendedColor(
+            palette.text().color(), palette.base().color(), 0.6
+        )
+        self.basename_font = Font(11)
+        self.details_font = Font(10)
         self.action_icon = QIcon(resource("dots-horizontal-triple.png"))
 
+    def button_rect(self, rect: QRect) -> QRect:
+        return QRect(
+            rect.right() - self.MARGIN - self.BUTTON_SIZE,
+            rect.center().y() - self.BUTTON_SIZE // 2,
+            self.BUTTON_SIZE,
+            self.BUTTON_SIZE,
+        )
+
+    # override
+    def sizeHint(
+        self,
+        option: QStyleOptionViewItem,
+        _index: Union[QModelIndex, QPersistentModelIndex],
+    ) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    # override
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionViewItem,
+        index: Union[QModelIndex, QPersistentModelIndex],
+    ) -> None:
+        item = index.data(HistoryModel.ItemRole)
+        if not isinstance(item, HistoryItem):
+            return
+        rect = option.rect
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        painter.save()
+        if hovered:
+            painter.fillRect(rect, self.highlighted_color)
+
+        icon_rect = QRect(
+            rect.left() + self.MARGIN,
+            rect.center().y() - self.ICON_SIZE // 2,
+            self.ICON_SIZE,
+            self.ICON_SIZE,
+        )
+        decoration = index.data(Qt.DecorationRole)
+        if isinstance(decoration, QPixmap):
+            painter.drawPixmap(icon_rect, decoration)
+        elif isinstance(decoration, QIcon):
+            decoration.paint(painter, icon_rect)
+
+        text_left = icon_rect.right() + self.MARGIN
+        text_width = self.button_rect(rect).left() - self.MARGIN - text_left
+        half_height = rect.height() // 2
+        painter.setFont(self.basename_font)
+        painter.setPen(option.palette.text().color())
+        painter.drawText(
+            QRect(text_left, rect.top(), text_width, half_height),
+            Qt.AlignLeft | Qt.AlignBottom,
+            QFontMetrics(self.basename_font).elidedText(
+                item.basename, Qt.ElideMiddle, text_width
+            ),
+        )
+        painter.setFont(self.details_font)
+        painter.setPen(self.details_color)
+        painter.drawText(
+            QRect(
+                text_left, rect.top() + half_height, text_width, half_height
+            ),
+            Qt.AlignLeft | Qt.AlignTop,
+            QFontMetrics(self.details_font).elidedText(
+                item.details, Qt.ElideRight, text_width
+            ),
+        )
+
+        if hovered:
+            self.action_icon.paint(painter, self.button_rect(rect))
+        painter.restore()
+
+    # override
+    def editorEvent(
+        self,
+        event: QEvent,
+        model: QAbstractItemModel,
+        option: QStyleOptionViewItem,
+        index: Union[QModelIndex, QPersistentModelIndex],
+    ) -> bool:
+        if event.type() == QEvent.MouseButtonRelease:
+            position = cast("QMouseEvent", event).position().toPoint()
+            if self.button_rect(option.rect).contains(position):
+                self.action_button_clicked.emit(position)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class HistoryListWidget(QListView):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        gateway: Tahoe,
+        deduplicate: bool = True,
+        max_items: int = 10_000,
+        thumbnail_loader: Optional[ThumbnailLoader] = None,
+        journal: Optional[HistoryJournal] = None,
+    ) -> None:
+        super().__init__()
+        self.gateway = gateway
+
+        self.history_model = HistoryModel(
+            deduplicate,
+            max_items,
+            thumbnail_loader,
+            journal,
+            self.resolve_path,
+        )
+        self.setModel(self.history_model)
+        self.delegate = HistoryItemDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.delegate.action_button_clicked.connect(self.on_right_click)
+
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.setFocusPolicy(Qt.NoFocus)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        # self.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.setSelectionMode(QAbstractItemView.NoSelection)
-        # self.setStyleSheet("QListWidget::item:hover { background: #E6F1F7 }")
         self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        # All rows have the same height so the view need not ask the
+        # delegate for the size of every row when laying them out.
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+
+        # Coalesce updates (e.g., after many items have been added in
+        # quick succession) into a single pass over the visible items.
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(50)
+        self._update_timer.timeout.connect(self.update_visible_widgets)
+        self.history_model.rowsInserted.connect(self._update_timer.start)
 
         self.sb = self.verticalScrollBar()
 
         self.sb.valueChanged.connect(self.update_visible_widgets)
-        self.itemDoubleClicked.connect(self.on_double_click)
+        self.doubleClicked.connect(self.on_double_click)
         self.customContextMenuRequested.connect(self.on_right_click)
 
-        self.gateway.monitor.check_finished.connect(
-            self.update_visible_widgets
-        )
+        get_relative_time_ticker().register(self, self.update_relative_times)
 
         mf_monitor = self.gateway.magic_folder.monitor
         # XXX Magic-Folder does not yet send events for different
@@ -171,64 +504,51 @@ class HistoryListWidget(QListWidget):
         mf_events = self.gateway.magic_folder.events
         mf_events.upload_finished.connect(self._on_upload_finished)
         mf_events.download_finished.connect(self._on_download_finished)
+        mf_events.folder_added.connect(self.history_model.resolve_deferred)
+        mf_events.folder_removed.connect(self.history_model.forget_deferred)
 
-    def on_double_click(self, item: QListWidgetItem) -> None:
-        w = self.itemWidget(item)
-        if isinstance(w, HistoryItemWidget):
-            open_enclosing_folder(w.path)
+    def count(self) -> int:
+        return self.history_model.rowCount()
 
-    def on_right_click(self, position: QPoint) -> None:
+    def on_double_click(
+        self, index: Union[QModelIndex, QPersistentModelIndex]
+    ) -> None:
+        path = index.data(HistoryModel.PathRole)
+        if path:
+            open_enclosing_folder(path)
+
+    def on_right_click(self, position: Optional[QPoint]) -> None:
         if not position:
             position = self.viewport().mapFromGlobal(QCursor.pos())
-        item = cast(QListWidgetItem, self.itemAt(position))
-        if not item:
-            return
-        widget = cast(HistoryItemWidget, self.itemWidget(item))
-        if not isinstance(widget, HistoryItemWidget):
+        index = self.indexAt(position)
+        if not index.isValid():
             return
+        path = index.data(HistoryModel.PathRole)
         menu = QMenu(self)
         open_file_action = QAction("Open file")
-        open_file_action.triggered.connect(lambda: open_path(widget.path))
+        open_file_action.triggered.connect(lambda: open_path(path))
         menu.addAction(open_file_action)
         open_folder_action = QAction("Open enclosing folder")
         open_folder_action.triggered.connect(
-            lambda: self.on_double_click(item)
+            lambda: open_enclosing_folder(path)
         )
         menu.addAction(open_folder_action)
         menu.exec_(self.viewport().mapToGlobal(position))
 
+    def resolve_path(self, folder: str, relpath: str) -> Optional[str]:
+        directory = self.gateway.magic_folder.get_directory(folder)
+        if not directory:
+            return None  # The folder has been left or is not loaded yet
+        return str(Path(directory, relpath))
+
     def add_item(
         self, folder: str, action: str, relpath: str, timestamp: float
     ) -> None:
-        path = str(
-            Path(self.gateway.magic_folder.get_directory(folder), relpath)
-        )
-        duplicate = None
-        if self.deduplicate:
-            for i in range(self.count()):
-                widget = self.itemWidget(self.item(i))
-                if (
-                    widget
-                    and isinstance(widget, HistoryItemWidget)
-                    and widget.path == path
-                    # and widget.data.get("member") == data.get("member")  # XXX
-                ):
-                    duplicate = i
-                    break
-        if duplicate is not None:
-            item = self.takeItem(duplicate)
-            if not item:
-                return  # Otherwise, mypy interprets item as an Optional below
-        else:
-            self.takeItem(self.max_items)
-            item = QListWidgetItem()
-        mtime = int(timestamp)
-        self.insertItem(1 - mtime, item)  # Newest on top
-        custom_widget = HistoryItemWidget(action, path, mtime, self)
-        item.setSizeHint(custom_widget.sizeHint())
-        self.setItemWidget(item, custom_widget)
-        item.setText(str(mtime))
-        self.sortItems(Qt.DescendingOrder)  # Sort by mtime; newest on top
+        path = self.resolve_path(folder, relpath)
+        if path is None:
+            return
+        self.history_model.add_item(action, path, int(timestamp))
+        get_relative_time_ticker().wake(timestamp)
 
     def _on_file_added(self, folder: str, data: dict) -> None:
         self.add_item(folder, "Added", data["relpath"], data["last-updated"])
@@ -251,22 +571,42 @@ class HistoryListWidget(QListWidget):
     ) -> None:
         self.add_item(folder, "Downloaded", relpath, int(timestamp))
 
+    def visible_rows(self) -> range:
+        rect = self.viewport().contentsRect()
+        top = self.indexAt(rect.topLeft())
+        if not top.isValid():
+            return range(0)
+        bottom = self.indexAt(rect.bottomLeft())
+        if bottom.isValid():
+            return range(top.row(), bottom.row() + 1)
+        return range(top.row(), self.count())
+
     def update_visible_widgets(self) -> None:
         if not self.isVisible():
             return
-        rect = self.viewport().contentsRect()
-        top = self.indexAt(rect.topLeft())
-        if top.isValid():
-            bottom = self.indexAt(rect.bottomLeft())
-            if not bottom.isValid():
-                bottom = self.model().index(self.count() - 1, 0)
-            for index in range(top.row(), bottom.row() + 1):
-                widget = self.itemWidget(self.item(index))
-                if widget and isinstance(widget, HistoryItemWidget):
-                    widget.update_text()
-                    widget.load_thumbnail()
-
-    def showEvent(self, _: QShowEvent) -> None:
+        # The (relative) times are computed when the items are painted
+        # so repainting the viewport is enough to bring them up to date.
+        visible = set()
+        for row in self.visible_rows():
+            self.history_model.load_thumbnail(row)
+            item = self.history_model.item(row)
+            if item:
+                visible.add(item.path)
+        # Don't bother loading thumbnails that are no longer in view.
+        self.history_model.cancel_thumbnails(keep=visible)
+        self.viewport().update()
+
+    def update_relative_times(self) -> Optional[float]:
+        # The (relative) times are computed when the items are painted
+        # so repainting the viewport is enough to bring them up to date.
+        self.viewport().update()
+        rows = self.visible_rows()
+        # Items are sorted newest first.
+        item = self.history_model.item(rows.start) if rows else None
+        return item.mtime if item else None
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
         self.update_visible_widgets()
 
 
@@ -276,11 +616,18 @@ class HistoryView(QWidget):
         gateway: Tahoe,
         gui: AbstractGui,
         deduplicate: bool = True,
-        max_items: int = 30,
+        max_items: int = 10_000,
     ) -> None:
         super().__init__()
         layout = QGridLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(HistoryListWidget(gateway, deduplicate, max_items))
+        layout.addWidget(
+            HistoryListWidget(
+                gateway,
+                deduplicate,
+                max_items,
+                journal=gateway.magic_folder.history,
+            )
+        )
         self.status_panel = StatusPanel(gateway, gui)
         layout.addWidget(self.status_panel)
@@ -12,7 +12,7 @@ from qtpy.QtCore import (
     QTimer,
     Signal,
 )
-from qtpy.QtGui import QFont, QIcon, QKeyEvent
+from qtpy.QtGui import QFont, QIcon, QKeyEvent, QShowEvent
 from qtpy.QtWidgets import (
     QAction,
     QCheckBox,
@@ -30,12 +30,6 @@ from twisted.internet import reactor as reactor_module
 from twisted.internet.defer import CancelledError, inlineCallbacks
 from twisted.internet.interfaces import IReactorCore
 from twisted.python.failure import Failure
-from wormhole.errors import (
-    LonelyError,
-    ServerConnectionError,
-    WelcomeError,
-    WrongPasswordError,
-)
 
 from gridsync import APP_NAME, resource
 from gridsync.desktop import (
@@ -47,7 +41,7 @@ from gridsync.errors import UpgradeRequiredError
 from gridsync.gui.color import BlendedColor
 from gridsync.gui.font import Font
 from gridsync.gui.widgets import HSpacer, InfoButton, VSpacer
-from gridsync.invite import is_valid_code, wordlist
+from gridsync.invite import get_wordlist, is_valid_code
 from gridsync.tor import get_tor
 from gridsync.types_ import TwistedDeferred
 from gridsync.util import b58encode
@@ -192,10 +186,11 @@ class InviteCodeLineEdit(QLineEdit):
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
-        model = QStringListModel()
-        model.setStringList(wordlist)
+        # The completion model is populated the first time the widget is
+        # shown since loading the wordlist is relatively expensive.
+        self._completion_model = QStringListModel()
         completer = InviteCodeCompleter()
-        completer.setModel(model)
+        completer.setModel(self._completion_model)
         self.setFont(Font(16))
         self.setCompleter(completer)
         self.setAlignment(Qt.AlignCenter)
@@ -219,6 +214,11 @@ class InviteCodeLineEdit(QLineEdit):
 
         self.update_action_button()
 
+    def showEvent(self, event: QShowEvent) -> None:
+        if not self._completion_model.rowCount():
+            self._completion_model.setStringList(get_wordlist())
+        super().showEvent(event)
+
     def update_action_button(self, text: Optional[str] = None) -> None:
         text = text if text else self.text()
         if not text:
@@ -491,6 +491,13 @@ class InviteCodeWidget(QWidget):
 
 
 def show_failure(failure: Failure, parent: Optional[QWidget] = None) -> None:
+    from wormhole.errors import (
+        LonelyError,
+        ServerConnectionError,
+        WelcomeError,
+        WrongPasswordError,
+    )
+
     msg = QMessageBox(parent)
     msg.setIcon(QMessageBox.Warning)
     msg.setStandardButtons(QMessageBox.Retry)
@@ -40,14 +40,9 @@ from gridsync import (
 )
 from gridsync.gui.history import HistoryView
 from gridsync.gui.password import PasswordDialog
-from gridsync.gui.phrase import (  # type: ignore
-    RecoveryPhraseExporter,
-    RecoveryPhraseImporter,
-)
 from gridsync.gui.share import InviteReceiverDialog, InviteSenderDialog
 from gridsync.gui.status import StatusPanel
 from gridsync.gui.toolbar import ComboBox, ToolBar
-from gridsync.gui.usage import UsageView
 from gridsync.gui.view import View
 from gridsync.gui.welcome import WelcomeDialog
 from gridsync.msg import error, info, question
@@ -57,6 +52,10 @@ from gridsync.util import strip_html_tags
 
 if TYPE_CHECKING:
     from gridsync.gui import AbstractGui
+    from gridsync.gui.phrase import (  # type: ignore
+        RecoveryPhraseExporter,
+        RecoveryPhraseImporter,
+    )
 
 
 @inlineCallbacks
@@ -106,6 +105,9 @@ class CentralWidget(QStackedWidget):
         self.history_views[gateway] = view
 
     def _add_usage_view(self, gateway: Tahoe) -> None:
+        # Imported here to avoid loading QtCharts before it is needed
+        from gridsync.gui.usage import UsageView
+
         gateway.load_settings()  # Ensure that zkap_unit_name is read/updated
         # mypy: "Missing positional arguments 'zkaps_used', 'zkaps_cost' ..."
         view = UsageView(gateway, self.gui)  # type: ignore[call-arg]
@@ -206,8 +208,9 @@ class MainWindow(QMainWindow):
         self.pending_news_message: Union[
             tuple[()], tuple[Tahoe, str, str]
         ] = ()
-        self.recovery_phrase_exporter = RecoveryPhraseExporter(self)
-        self.recovery_phrase_importer = RecoveryPhraseImporter(self)
+        # Constructed on first use; see the properties below
+        self._recovery_phrase_exporter: Optional[RecoveryPhraseExporter] = None
+        self._recovery_phrase_importer: Optional[RecoveryPhraseImporter] = None
 
         self.setWindowTitle(APP_NAME)
         self.setMinimumSize(QSize(755, 470))
@@ -269,6 +272,26 @@ class MainWindow(QMainWindow):
         self.toolbar.history_action_triggered.connect(self.show_history_view)
         self.toolbar.usage_action_triggered.connect(self.show_usage_view)
 
+    @property
+    def recovery_phrase_exporter(self) -> RecoveryPhraseExporter:
+        if self._recovery_phrase_exporter is None:
+            from gridsync.gui.phrase import (  # type: ignore
+                RecoveryPhraseExporter,
+            )
+
+            self._recovery_phrase_exporter = RecoveryPhraseExporter(self)
+        return self._recovery_phrase_exporter
+
+    @property
+    def recovery_phrase_importer(self) -> RecoveryPhraseImporter:
+        if self._recovery_phrase_importer is None:
+            from gridsync.gui.phrase import (  # type: ignore
+                RecoveryPhraseImporter,
+            )
+
+            self._recovery_phrase_importer = RecoveryPhraseImporter(self)
+        return self._recovery_phrase_importer
+
     def populate(self, gateways: list) -> None:
         for gateway in gateways:
             if gateway not in self.gateways:
@@ -10,7 +10,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from humanize import naturalsize, naturaltime
-from qtpy.QtCore import QFileInfo, QSize, Qt, Slot
+from qtpy.QtCore import QFileInfo, QPersistentModelIndex, QSize, Qt, Slot
 from qtpy.QtGui import QColor, QIcon, QStandardItem, QStandardItemModel
 from qtpy.QtWidgets import QAction, QFileIconProvider, QToolBar
 
@@ -20,10 +20,16 @@ if TYPE_CHECKING:
     from gridsync.view import View
 
 from gridsync import config_dir, resource
-from gridsync.gui.pixmap import CompositePixmap
+from gridsync.gui.pixmap import CompositeIconCache
+from gridsync.gui.ticker import get_relative_time_ticker
 from gridsync.magic_folder import MagicFolderStatus
+from gridsync.magic_folder_events import SyncProgress
 from gridsync.preferences import get_preference
-from gridsync.util import humanized_list
+from gridsync.util import humanized_list, progress_details
+
+# Folder icons (which are the same for most folders) are shared between
+# the Models of all gateways.
+_folder_icons = CompositeIconCache()
 
 
 class Model(QStandardItemModel):
@@ -36,6 +42,10 @@ class Model(QStandardItemModel):
         self.status_dict: dict[str, MagicFolderStatus] = {}
         self.members_dict: dict[str, list] = {}
         self._magic_folder_errors: defaultdict = defaultdict(dict)
+        # Folder names mapped to the (persistent) indexes of their rows,
+        # so that the many slots below need not search through every row
+        # of the model (with `findItems`) to locate a given folder.
+        self._folder_indexes: dict[str, QPersistentModelIndex] = {}
         self.setHeaderData(0, Qt.Horizontal, "Name")
         self.setHeaderData(1, Qt.Horizontal, "Status")
         self.setHeaderData(2, Qt.Horizontal, "Last modified")
@@ -45,18 +55,17 @@ class Model(QStandardItemModel):
         self.icon_blank = QIcon()
         self.icon_up_to_date = QIcon(resource("checkmark.png"))
         self.icon_user = QIcon(resource("user.png"))
-        self.icon_folder = QFileIconProvider().icon(QFileInfo(config_dir))
-        composite_pixmap = CompositePixmap(
-            self.icon_folder.pixmap(256, 256), overlay=None, grayout=True
-        )
-        self.icon_folder_gray = QIcon(composite_pixmap)
+        self._icon_provider = QFileIconProvider()
+        self.icon_folder = self._icon_provider.icon(QFileInfo(config_dir))
         self.icon_cloud = QIcon(resource("cloud-icon.png"))
         self.icon_action = QIcon(resource("dots-horizontal-triple.png"))
         self.icon_error = QIcon(resource("alert-circle-red.png"))
 
         self.monitor.connected.connect(self.on_connected)
         self.monitor.disconnected.connect(self.on_disconnected)
-        self.monitor.check_finished.connect(self.update_natural_times)
+        get_relative_time_ticker().register(
+            self.view, self.update_natural_times
+        )
 
         self.mf_monitor = self.gateway.magic_folder.monitor
         self.mf_monitor.folder_mtime_updated.connect(self.set_mtime)
@@ -124,21 +133,64 @@ class Model(QStandardItemModel):
             return QSize(0, 30)
         return value
 
+    def _folder_icon(
+        self,
+        folder_path: Optional[str] = None,
+        overlay_file: Optional[str] = "",
+        grayout: bool = False,
+    ) -> QIcon:
+        if folder_path:
+            icon = self._icon_provider.icon(QFileInfo(folder_path))
+        else:
+            icon = self.icon_folder
+        # Key the composed icons on the identity of the base icon (which
+        # the icon provider shares between all folders that look alike)
+        # rather than on the path of each folder, so that the cache holds
+        # an entry per distinct folder icon rather than one per folder.
+        return _folder_icons.get(
+            icon.cacheKey(),
+            lambda: icon,
+            self.view.iconSize().width(),
+            resource(overlay_file) if overlay_file else None,
+            grayout,
+        )
+
+    @property
+    def icon_folder_gray(self) -> QIcon:
+        return self._folder_icon(grayout=True)
+
+    def _folder_row(self, folder_name: str) -> Optional[int]:
+        index = self._folder_indexes.get(folder_name)
+        if index is None:
+            return None
+        if not index.isValid():  # The row was removed
+            del self._folder_indexes[folder_name]
+            return None
+        return index.row()
+
+    def _folder_item(
+        self, folder_name: str, column: int = 0
+    ) -> Optional[QStandardItem]:
+        row = self._folder_row(folder_name)
+        if row is None:
+            return None
+        return self.item(row, column)
+
     def add_folder(self, path: str) -> None:
         basename = os.path.basename(os.path.normpath(path))
-        if self.findItems(basename):
+        if self._folder_row(basename) is not None:
             logging.warning(
                 "Tried to add a folder (%s) that already exists", basename
             )
             return
-        composite_pixmap = CompositePixmap(self.icon_folder.pixmap(256, 256))
-        name = QStandardItem(QIcon(composite_pixmap), basename)
+        name = QStandardItem(self._folder_icon(), basename)
         name.setToolTip(path)
         status = QStandardItem()
         mtime = QStandardItem()
         size = QStandardItem()
         action = QStandardItem()
         self.appendRow([name, status, mtime, size, action])
+        self._folder_indexes[basename] = QPersistentModelIndex(name.index())
         action_bar = QToolBar()
         action_bar.setIconSize(QSize(16, 16))
         if sys.platform == "darwin":
@@ -158,32 +210,28 @@ class Model(QStandardItemModel):
 
     def remove_folder(self, folder_name: str) -> None:
         self.gui.systray.remove_operation((self.gateway, folder_name))
-        items = self.findItems(folder_name)
-        if items:
-            self.removeRow(items[0].row())
+        row = self._folder_row(folder_name)
+        if row is not None:
+            self.removeRow(row)
+        self._folder_indexes.pop(folder_name, None)
 
     def update_folder_icon(
         self, folder_name: str, overlay_file: Optional[str] = ""
     ) -> None:
-        items = self.findItems(folder_name)
-        if items:
+        folder_item = self._folder_item(folder_name)
+        if folder_item:
             folder_path = self.gateway.magic_folder.get_directory(folder_name)
-            if folder_path:
-                folder_icon = QFileIconProvider().icon(QFileInfo(folder_path))
-            else:
-                folder_icon = self.icon_folder_gray
-            folder_pixmap = folder_icon.pixmap(256, 256)
-            if overlay_file:
-                pixmap = CompositePixmap(folder_pixmap, resource(overlay_file))
-            else:
-                pixmap = CompositePixmap(folder_pixmap)
-            items[0].setIcon(QIcon(pixmap))
+            folder_item.setIcon(
+                self._folder_icon(
+                    folder_path, overlay_file, grayout=not folder_path
+                )
+            )
 
     def set_status_private(self, folder_name: str) -> None:
         self.update_folder_icon(folder_name)
-        items = self.findItems(folder_name)
-        if items:
-            items[0].setToolTip(
+        folder_item = self._folder_item(folder_name)
+        if folder_item:
+            folder_item.setToolTip(
                 "{}\n\nThis folder is private; only you can view and\nmodify "
                 "its contents.".format(
                     self.gateway.magic_folder.get_directory(folder_name)
@@ -193,9 +241,9 @@ class Model(QStandardItemModel):
 
     def set_status_shared(self, folder_name: str) -> None:
         self.update_folder_icon(folder_name, "laptop.png")
-        items = self.findItems(folder_name)
-        if items:
-            items[0].setToolTip(
+        folder_item = self._folder_item(folder_name)
+        if folder_item:
+            folder_item.setToolTip(
                 "{}\n\nAt least one other device can view and modify\n"
                 "this folder's contents.".format(
                     self.gateway.magic_folder.get_directory(folder_name)
@@ -209,9 +257,9 @@ class Model(QStandardItemModel):
         #     self.set_status_shared(folder_name)
         # else:
         #     self.set_status_private(folder_name)
-        items = self.findItems(folder_name)
-        if items:
-            items[0].setToolTip(
+        folder_item = self._folder_item(folder_name)
+        if folder_item:
+            folder_item.setToolTip(
                 self.gateway.magic_folder.get_directory(folder_name)
                 or folder_name + " (Stored remotely)"
             )
@@ -239,10 +287,9 @@ class Model(QStandardItemModel):
 
     @Slot(str, object)
     def set_status(self, name: str, status: MagicFolderStatus) -> None:
-        items = self.findItems(name)
-        if not items:
+        item = self._folder_item(name, 1)
+        if not item:
             return
-        item = self.item(items[0].row(), 1)
         if status == MagicFolderStatus.LOADING:
             item.setIcon(self.icon_blank)
             item.setText("Loading...")
@@ -282,38 +329,37 @@ class Model(QStandardItemModel):
                 item.setToolTip(self._errors_to_str(errors))
         if status == MagicFolderStatus.SYNCING:
             self.gui.systray.add_operation((self.gateway, name))
-            self.gui.systray.update()
         else:
             self.gui.systray.remove_operation((self.gateway, name))
         item.setData(status, Qt.UserRole)
         self.status_dict[name] = status
 
-    @Slot(str, object, object)
+    @Slot(str, object)
     def set_transfer_progress(
-        self, folder_name: str, transferred: int, total: int
+        self, folder_name: str, progress: SyncProgress
     ) -> None:
-        items = self.findItems(folder_name)
-        if not items:
+        item = self._folder_item(folder_name, 1)
+        if not item:
             return
-        percent_done = int(transferred / total * 100)
+        percent_done = progress.percent
         if percent_done and percent_done != 100:
-            self.set_status(folder_name, MagicFolderStatus.SYNCING)  # XXX
-            item = self.item(items[0].row(), 1)
+            if self.status_dict.get(folder_name) != MagicFolderStatus.SYNCING:
+                self.set_status(folder_name, MagicFolderStatus.SYNCING)  # XXX
             item.setText(f"Syncing ({percent_done}%)")
+            item.setToolTip(
+                "This folder is syncing. New files are being uploaded or "
+                f"downloaded.\n\nSynced {progress_details(progress)}"
+            )
 
     def fade_row(
         self, folder_name: str, overlay_file: Optional[str] = ""
     ) -> None:
-        try:
-            folder_item = self.findItems(folder_name)[0]
-        except IndexError:
+        folder_item = self._folder_item(folder_name)
+        if not folder_item:
             return
-        if overlay_file:
-            folder_pixmap = self.icon_folder_gray.pixmap(256, 256)
-            pixmap = CompositePixmap(folder_pixmap, resource(overlay_file))
-            folder_item.setIcon(QIcon(pixmap))
-        else:
-            folder_item.setIcon(self.icon_folder_gray)
+        folder_item.setIcon(
+            self._folder_icon(None, overlay_file, grayout=True)
+        )
         row = folder_item.row()
         for i in range(4):
             item = self.item(row, i)
@@ -323,8 +369,9 @@ class Model(QStandardItemModel):
             item.setForeground(QColor("gray"))
 
     def unfade_row(self, folder_name: str) -> None:
-        folder_item = self.findItems(folder_name)[0]
-        row = folder_item.row()
+        row = self._folder_row(folder_name)
+        if row is None:
+            return
         for i in range(4):
             item = self.item(row, i)
             font = item.font()
@@ -336,12 +383,12 @@ class Model(QStandardItemModel):
     def set_mtime(self, name: str, mtime: int) -> None:
         if not mtime:
             return
-        items = self.findItems(name)
-        if items:
-            item = self.item(items[0].row(), 2)
+        item = self._folder_item(name, 2)
+        if item:
             item.setData(mtime, Qt.UserRole)
             item.setText(naturaltime(int(time.time() - mtime)))
             item.setToolTip("Last modified: {}".format(time.ctime(mtime)))
+            get_relative_time_ticker().wake(mtime)
 
     @Slot(str, str, float)
     def _on_operation_finished(
@@ -351,19 +398,35 @@ class Model(QStandardItemModel):
 
     @Slot(str, object)
     def set_size(self, name: str, size: int) -> None:
-        items = self.findItems(name)
-        if items:
-            item = self.item(items[0].row(), 3)
+        item = self._folder_item(name, 3)
+        if item:
             item.setText(naturalsize(size))
             item.setData(size, Qt.UserRole)
 
-    @Slot()
-    def update_natural_times(self) -> None:
-        for i in range(self.rowCount()):
+    def visible_rows(self) -> range:
+        rect = self.view.viewport().contentsRect()
+        top = self.view.indexAt(rect.topLeft())
+        if not top.isValid():
+            return range(0)
+        bottom = self.view.indexAt(rect.bottomLeft())
+        if bottom.isValid():
+            return range(top.row(), bottom.row() + 1)
+        return range(top.row(), self.rowCount())
+
+    def update_natural_times(self) -> Optional[float]:
+        """
+        Refresh the "Last modified" times of the rows currently visible in
+        the view, returning the most recent of those times (if any).
+        """
+        now = time.time()
+        newest = None
+        for i in self.visible_rows():
             item = self.item(i, 2)
             mtime = item.data(Qt.UserRole)
             if mtime:
-                item.setText(naturaltime(int(time.time() - mtime)))
+                item.setText(naturaltime(int(now - mtime)))
+                newest = mtime if newest is None else max(newest, mtime)
+        return newest
 
     @Slot(str)
     @Slot(str, str)
@@ -15,7 +15,6 @@ from qtpy.QtWidgets import (
     QLineEdit,
     QProgressBar,
 )
-from zxcvbn import zxcvbn
 
 from gridsync import resource
 from gridsync.gui.font import Font
@@ -118,6 +117,8 @@ class PasswordDialog(QDialog):
             self.lineedit.setEchoMode(QLineEdit.Password)
 
     def update_stats(self, text: str) -> None:  # noqa: max-complexity=11 XXX
+        from zxcvbn import zxcvbn
+
         if not text:
             self.time_label.setText("")
             self.rating_label.setText("")
@@ -1,8 +1,17 @@
 # -*- coding: utf-8 -*-
-from typing import Optional
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
 
 from qtpy.QtCore import QRect, Qt
-from qtpy.QtGui import QBrush, QColor, QPainter, QPen, QPixmap
+from qtpy.QtGui import (
+    QBrush,
+    QColor,
+    QGuiApplication,
+    QIcon,
+    QPainter,
+    QPen,
+    QPixmap,
+)
 
 from gridsync import resource
 
@@ -42,6 +51,62 @@ class CompositePixmap(QPixmap):
         self.swap(base_pixmap)
 
 
+class CompositeIconCache:
+    """
+    A least-recently-used cache of icons composed (with `CompositePixmap`)
+    from a base icon and an optional overlay, keyed by the combination of
+    base icon, overlay, grayout, and (display) size.
+
+    Since obtaining the base icon may itself be costly (e.g., in the case
+    of `QFileIconProvider.icon`), it is passed as a callable that is only
+    called when the requested icon is not already in the cache; `base_key`
+    must uniquely identify the icon that it returns.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = maxsize
+        self._icons: OrderedDict[tuple, QIcon] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._icons)
+
+    def get(  # pylint: disable=too-many-arguments
+        self,
+        base_key: Hashable,
+        base: Callable[[], QIcon],
+        size: int,
+        overlay: Optional[str] = None,
+        grayout: bool = False,
+    ) -> QIcon:
+        app = QGuiApplication.instance()
+        ratio = app.devicePixelRatio() if app else 1.0
+        key = (base_key, overlay, grayout, size, ratio)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self.hits += 1
+            self._icons.move_to_end(key)
+            return icon
+        self.misses += 1
+        # Render at the size at which the icon will actually be displayed
+        # (in device pixels) rather than at some larger size to be scaled
+        # down (and so, repeatedly, re-scaled) later.
+        device_size = round(size * ratio)
+        pixmap = CompositePixmap(
+            base().pixmap(device_size, device_size), overlay, grayout
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        icon = QIcon(pixmap)
+        self._icons[key] = icon
+        if len(self._icons) > self.maxsize:
+            self._icons.popitem(last=False)
+        return icon
+
+    def clear(self) -> None:
+        self._icons.clear()
+
+
 class BadgedPixmap(QPixmap):
     TopLeft = (0, 0)
     TopRight = (1, 0)
@@ -61,9 +126,8 @@ class BadgedPixmap(QPixmap):
         base_size = base_pixmap.size()
         base_max = min(base_size.height(), base_size.width())
         if not base_max:
-            # Because gridsync.gui.systray.animation.currentPixmap() returns
-            # a blank pixmap when unpausing the animation for the first time.
-            # Returning early to prevents QPainter from spewing warnings.
+            # Painting on a null pixmap would make QPainter spew warnings
+            # so return it as-is.
             self.swap(base_pixmap)
             return
 
@@ -1,11 +1,12 @@
 from io import BytesIO
 
-import segno
 from qtpy.QtGui import QImage
 
 
 class QRCode(QImage):
     def __init__(self, data: str) -> None:
+        import segno
+
         super().__init__()
         buffer = BytesIO()
         segno.make_qr(data).save(buffer, kind="png", border=1)
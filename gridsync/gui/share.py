@@ -6,7 +6,6 @@ import os
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-import wormhole.errors
 from qtpy.QtCore import QEvent, QFileInfo, Qt, Signal
 from qtpy.QtGui import QCloseEvent, QIcon, QKeyEvent
 from qtpy.QtWidgets import (
@@ -215,7 +214,9 @@ class InviteSenderDialog(QDialog):
                         model.on_members_updated(folder, [None, None])
 
     def handle_failure(self, failure: Failure) -> None:
-        if failure.type == wormhole.errors.LonelyError:
+        from wormhole.errors import LonelyError
+
+        if failure.type == LonelyError:
             return
         logging.error(str(failure))
         show_failure(failure, self)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from humanize import naturalsize
 from qtpy.QtCore import QSize, Qt, Slot
@@ -21,7 +21,8 @@ from gridsync.gui.menu import Menu
 from gridsync.gui.pixmap import Pixmap
 from gridsync.gui.widgets import HSpacer
 from gridsync.magic_folder import MagicFolderStatus
-from gridsync.util import future_date
+from gridsync.magic_folder_events import SyncProgress
+from gridsync.util import future_date, progress_details
 
 
 class StatusPanel(QWidget):
@@ -34,6 +35,7 @@ class StatusPanel(QWidget):
         self.num_connected = 0
         self.num_known = 0
         self.available_space: str = ""
+        self.sync_progress: Optional[SyncProgress] = None
 
         self.checkmark_icon = QLabel()
         self.checkmark_icon.setPixmap(Pixmap("checkmark.png", 20))
@@ -138,6 +140,9 @@ class StatusPanel(QWidget):
         self.gateway.magic_folder.events.overall_status_changed.connect(
             self.on_sync_status_updated
         )
+        self.gateway.magic_folder.events.overall_progress_updated.connect(
+            self.on_sync_progress_updated
+        )
 
         self.on_sync_status_updated(self.status)
 
@@ -168,7 +173,11 @@ class StatusPanel(QWidget):
             self.checkmark_icon.hide()
             self.error_icon.hide()
         elif self.status == MagicFolderStatus.SYNCING:
-            self.status_label.setText("Syncing")
+            progress = self.sync_progress
+            if progress and 0 < progress.percent < 100:
+                self.status_label.setText(f"Syncing ({progress.percent}%)")
+            else:
+                self.status_label.setText("Syncing")
             self.checkmark_icon.hide()
             self.error_icon.hide()
             self.syncing_icon.show()
@@ -185,23 +194,25 @@ class StatusPanel(QWidget):
             self.syncing_icon.hide()
             self.checkmark_icon.hide()
             self.error_icon.show()
+        tooltip = "Connected to {} of {} storage nodes".format(
+            self.num_connected, self.num_known
+        )
         if self.available_space:
-            self.status_label.setToolTip(
-                "Connected to {} of {} storage nodes\n{} available".format(
-                    self.num_connected, self.num_known, self.available_space
-                )
-            )
-        else:
-            self.status_label.setToolTip(
-                "Connected to {} of {} storage nodes".format(
-                    self.num_connected, self.num_known
-                )
+            tooltip += "\n{} available".format(self.available_space)
+        if self.status == MagicFolderStatus.SYNCING and self.sync_progress:
+            tooltip += "\nSyncing {}".format(
+                progress_details(self.sync_progress)
             )
+        self.status_label.setToolTip(tooltip)
 
     def on_sync_status_updated(self, status: MagicFolderStatus) -> None:
         self.status = status
         self._update_status_label()
 
+    def on_sync_progress_updated(self, progress: SyncProgress) -> None:
+        self.sync_progress = progress
+        self._update_status_label()
+
     def on_space_updated(self, bytes_available: int) -> None:
         self.available_space = naturalsize(bytes_available)
         self._update_status_label()
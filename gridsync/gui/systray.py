@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import logging
+import math
 import sys
-from typing import TYPE_CHECKING
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Optional, Union
 
-from qtpy.QtGui import QIcon, QMovie, QPixmap
+from qtpy.QtCore import QElapsedTimer, QTimer
+from qtpy.QtGui import QIcon, QImageReader, QPixmap
 from qtpy.QtWidgets import QSystemTrayIcon
 
 if TYPE_CHECKING:
@@ -14,9 +18,18 @@ from gridsync import resource, settings
 from gridsync.gui.menu import Menu
 from gridsync.gui.pixmap import BadgedPixmap
 
+# The maximum number of times per second that the (animated) tray icon is
+# redrawn; frames of the animation that would be shown more often than
+# this are skipped rather than slowing the animation down.
+DEFAULT_MAX_FPS = 10.0
+
+STATIC_FRAME = -1
+
 
 class SystemTrayIcon(QSystemTrayIcon):
-    def __init__(self, gui: Gui) -> None:
+    def __init__(
+        self, gui: Gui, max_fps: Optional[Union[float, str]] = None
+    ) -> None:
         super().__init__()
         self.gui = gui
         self._operations: set = set()
@@ -32,45 +45,141 @@ class SystemTrayIcon(QSystemTrayIcon):
 
         self.messageClicked.connect(self.gui.show_main_window)
 
-        self.animation = QMovie()
-        self.animation.setFileName(
-            resource(settings["application"]["tray_icon_sync"])
+        self.animation_path = resource(
+            settings["application"]["tray_icon_sync"]
         )
-        self.animation.updated.connect(self.update)
-        self.animation.setCacheMode(QMovie.CacheAll)
+        # The frames of the animation (and the times, in milliseconds from
+        # the start of the animation, at which each should be shown) are
+        # decoded once, the first time that the animation is started.
+        self._frames: list[QPixmap] = []
+        self._frame_offsets: list[int] = []
+        self._animation_duration = 0
+        # Icons for each frame (or, for STATIC_FRAME, the app icon) and
+        # badge text; see `_icon`.
+        self._icons: dict[tuple[int, str], QIcon] = {}
+        self._badge = ""
+        self._current: tuple[int, str] = (STATIC_FRAME, "")
+
+        self._elapsed = QElapsedTimer()
+        self.animation_timer = QTimer(self)
+        self.animation_timer.timeout.connect(self._show_next_frame)
+        if max_fps is None:
+            max_fps = settings["application"].get(
+                "tray_icon_fps", DEFAULT_MAX_FPS
+            )
+        self.set_max_fps(max_fps)
+
+    def _load_frames(self) -> None:
+        reader = QImageReader(self.animation_path)
+        offset = 0
+        while True:
+            image = reader.read()
+            if image.isNull():
+                break
+            self._frames.append(QPixmap.fromImage(image))
+            self._frame_offsets.append(offset)
+            offset += max(reader.nextImageDelay(), 0)
+        self._animation_duration = offset
+        if not self._frames:
+            self._frames.append(self.app_pixmap)
+            self._frame_offsets.append(0)
+
+    def set_max_fps(self, max_fps: Union[float, str]) -> None:
+        try:
+            fps = float(max_fps)
+        except (TypeError, ValueError):
+            fps = math.nan
+        if not fps > 0 or math.isinf(fps):
+            logging.warning(
+                "Invalid tray icon frame rate %r; using %s instead",
+                max_fps,
+                DEFAULT_MAX_FPS,
+            )
+            fps = DEFAULT_MAX_FPS
+        self.max_fps = fps
+        self.animation_timer.setInterval(max(int(1000 / fps), 1))
+
+    def _icon(self, frame: int, badge: str) -> QIcon:
+        icon = self._icons.get((frame, badge))
+        if icon is None:
+            if frame == STATIC_FRAME:
+                pixmap = self.app_pixmap
+            else:
+                pixmap = self._frames[frame]
+            if badge:
+                icon = QIcon(BadgedPixmap(pixmap, badge, 0.6))
+            elif frame == STATIC_FRAME:
+                icon = self.app_icon
+            else:
+                icon = QIcon(pixmap)
+            self._icons[(frame, badge)] = icon
+        return icon
+
+    def _prerender(self) -> None:
+        for frame in range(len(self._frames)):
+            self._icon(frame, self._badge)
+
+    def _show_frame(self, frame: int) -> None:
+        if (frame, self._badge) == self._current:
+            return
+        self.setIcon(self._icon(frame, self._badge))
+        self._current = (frame, self._badge)
+
+    def _show_next_frame(self) -> None:
+        if self._animation_duration:
+            position = self._elapsed.elapsed() % self._animation_duration
+            frame = bisect_right(self._frame_offsets, position) - 1
+        else:
+            frame = 0
+        self._show_frame(frame)
+
+    def is_animating(self) -> bool:
+        return self.animation_timer.isActive()
+
+    def start_animation(self) -> None:
+        if self.is_animating():
+            return
+        if not self._frames:
+            self._load_frames()
+        self._prerender()
+        self._elapsed.start()
+        self.animation_timer.start()
+        self._show_next_frame()
+
+    def stop_animation(self) -> None:
+        self.animation_timer.stop()
+        self._show_frame(STATIC_FRAME)
 
     def add_operation(self, operation: tuple) -> None:
         self._operations.add(operation)
+        self.start_animation()
 
     def remove_operation(self, operation: tuple) -> None:
-        try:
-            self._operations.remove(operation)
-        except KeyError:
-            pass
+        self._operations.discard(operation)
+        if not self._operations:
+            self.stop_animation()
 
     def update(self) -> None:
-        if self._operations:
-            self.animation.setPaused(False)
-            pixmap = self.animation.currentPixmap()
-            if self.gui.unread_messages:
-                pixmap = BadgedPixmap(
-                    pixmap, str(len(self.gui.unread_messages)), 0.6
-                )
-            self.setIcon(QIcon(pixmap))
+        badge = (
+            str(len(self.gui.unread_messages))
+            if self.gui.unread_messages
+            else ""
+        )
+        if badge != self._badge:
+            # Only the icons for the current badge (and those without a
+            # badge) are worth keeping around.
+            self._icons = {
+                key: icon
+                for key, icon in self._icons.items()
+                if key[1] in ("", badge)
+            }
+            self._badge = badge
+            if self.is_animating():
+                self._prerender()
+        if self.is_animating():
+            self._show_next_frame()
         else:
-            self.animation.setPaused(True)
-            if self.gui.unread_messages:
-                self.setIcon(
-                    QIcon(
-                        BadgedPixmap(
-                            self.app_pixmap,
-                            str(len(self.gui.unread_messages)),
-                            0.6,
-                        )
-                    )
-                )
-            else:
-                self.setIcon(self.app_icon)
+            self._show_frame(STATIC_FRAME)
 
     def on_click(self, value: int) -> None:
         if value == QSystemTrayIcon.Trigger and sys.platform != "darwin":
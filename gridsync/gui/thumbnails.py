@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Load thumbnails of (possibly very large) image files off of the GUI thread.
+
+Images are decoded with `QImageReader` -- which, for some formats (e.g.,
+JPEG), can decode the image directly at the (much smaller) size of the
+thumbnail -- by a small pool of worker threads. Loaded thumbnails are
+saved to an on-disk cache keyed by the path, modification time, and size
+of the original file so that they need only be decoded once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from qtpy.QtCore import QObject, QSize, QThreadPool, Signal
+from qtpy.QtGui import QImage, QImageReader
+
+from gridsync import config_dir
+
+THUMBNAIL_SIZE = QSize(48, 48)
+
+
+def cache_key(path: str) -> Optional[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return hashlib.sha256(
+        f"{path}\0{st.st_mtime_ns}\0{st.st_size}".encode("utf-8")
+    ).hexdigest()
+
+
+def read_thumbnail(path: str, size: QSize = THUMBNAIL_SIZE) -> QImage:
+    reader = QImageReader(path)
+    if not reader.canRead():
+        return QImage()
+    # Decode the image at (or, depending on the format, scale it while
+    # decoding it to) the size of the thumbnail instead of decoding it at
+    # its full size and scaling it down afterwards.
+    reader.setScaledSize(size)
+    return reader.read()
+
+
+class _ThumbnailJob:
+    def __init__(self, loader: ThumbnailLoader, path: str) -> None:
+        self.loader = loader
+        self.path = path
+        self.cancelled = False
+
+    def __call__(self) -> None:
+        if self.cancelled:
+            return
+        try:
+            image = self.loader.load(self.path)
+        except Exception as e:  # pylint: disable=broad-except
+            logging.warning("Error loading thumbnail: %s", str(e))
+            image = QImage()
+        if not self.cancelled:
+            # The signal is delivered (via a queued connection) to the
+            # thread in which the loader lives; i.e., the GUI thread.
+            self.loader.job_finished.emit(self.path, image)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Load thumbnails in the background, on a pool of (at most)
+    `max_threads` worker threads, emitting `thumbnail_loaded` with the
+    path of the original file and its (possibly null) thumbnail once each
+    has been loaded.
+
+    Requests may be cancelled (e.g., when the item for which the
+    thumbnail was requested has been scrolled out of view); a cancelled
+    request that has not yet been started will be skipped and the result
+    of one that has will not be emitted.
+    """
+
+    thumbnail_loaded = Signal(str, QImage)
+    job_finished = Signal(str, QImage)
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        max_threads: int = 2,
+        max_cache_files: int = 10_000,
+        size: QSize = THUMBNAIL_SIZE,
+    ) -> None:
+        super().__init__()
+        if cache_path is None:
+            cache_path = Path(config_dir, "thumbnails")
+        self.cache_path = cache_path
+        self.max_cache_files = max_cache_files
+        self.size = size
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._jobs: dict[str, _ThumbnailJob] = {}
+        self.job_finished.connect(self._on_job_finished)
+
+    def _cache_file(self, key: str) -> Path:
+        return Path(self.cache_path, f"{key}.png")
+
+    def load(self, path: str) -> QImage:
+        """
+        Return the thumbnail of the image at `path`, from the cache if
+        possible. This blocks and so should not be called from the GUI
+        thread.
+        """
+        key = cache_key(path)
+        if key is None:
+            return QImage()
+        cache_file = self._cache_file(key)
+        if cache_file.exists():
+            image = QImage(str(cache_file))
+            if not image.isNull():
+                try:
+                    os.utime(cache_file)  # For pruning; see `prune`
+                except OSError:
+                    pass
+                return image
+        image = read_thumbnail(path, self.size)
+        if not image.isNull():
+            self.cache_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+            if image.save(str(tmp_file), "PNG"):
+                os.replace(tmp_file, cache_file)
+        return image
+
+    def request(self, path: str) -> None:
+        if path in self._jobs:
+            return
+        job = _ThumbnailJob(self, path)
+        self._jobs[path] = job
+        self._pool.start(job)
+
+    def cancel(self, path: str) -> None:
+        job = self._jobs.pop(path, None)
+        if job is None:
+            return
+        job.cancelled = True
+
+    def pending(self) -> set[str]:
+        return set(self._jobs)
+
+    def _on_job_finished(self, path: str, image: QImage) -> None:
+        job = self._jobs.get(path)
+        if job is None or job.cancelled:
+            return
+        del self._jobs[path]
+        self.thumbnail_loaded.emit(path, image)
+
+    def prune(self) -> int:
+        """
+        Remove the least-recently-used thumbnails from the on-disk cache
+        such that no more than `max_cache_files` remain, returning the
+        number of thumbnails removed.
+        """
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.cache_path)
+                if entry.name.endswith(".png")
+            ]
+        except FileNotFoundError:
+            return 0
+        excess = len(entries) - self.max_cache_files
+        if excess <= 0:
+            return 0
+
+        def last_used(entry: os.DirEntry) -> float:
+            try:
+                return entry.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        entries.sort(key=last_used)
+        removed = 0
+        for entry in entries[:excess]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            removed += 1
+        return removed
+
+    def _prune(self) -> None:
+        self.prune()
+
+    def prune_in_background(self) -> None:
+        # QThreadPool.start expects a callable that returns None
+        self._pool.start(self._prune)
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._pool.waitForDone(msecs)
+
+
+_loader: Optional[ThumbnailLoader] = None
+
+
+def get_thumbnail_loader() -> ThumbnailLoader:
+    global _loader  # pylint: disable=global-statement
+    if _loader is None:
+        _loader = ThumbnailLoader()
+        _loader.prune_in_background()
+    return _loader
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+A single, application-wide timer for refreshing relative times (e.g.,
+"5 minutes ago") displayed by the GUI.
+
+Rather than having every view refresh all of its rows on a fixed schedule,
+views register a callback that refreshes only those rows that are
+currently visible and returns the most recent timestamp among them. Since
+the text of a relative time changes less frequently the older the time is
+("12 seconds ago" changes every second; "3 hours ago" only every hour),
+the ticker uses that timestamp to decide when next to tick. The ticker
+stops altogether while none of the registered widgets are visible (e.g.,
+while the main window is hidden) and is woken up again when one is shown
+-- or when one is scrolled or resized, since that may bring rows whose
+times have not been refreshed into view.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+from qtpy.QtCore import QEvent, QObject, QTimer
+from qtpy.QtWidgets import QAbstractScrollArea, QWidget
+
+# The longest time that a relative time of a given age (in seconds) may go
+# without being refreshed; i.e., roughly the "granularity" with which times
+# of that age are displayed.
+REFRESH_INTERVALS = (
+    (60, 1),  # "N seconds ago"
+    (60 * 60, 30),  # "N minutes ago"
+    (60 * 60 * 24, 60 * 10),  # "N hours ago"
+)
+MAX_REFRESH_INTERVAL = 60 * 60
+
+
+def refresh_interval(age: float) -> float:
+    for max_age, interval in REFRESH_INTERVALS:
+        if age < max_age:
+            return interval
+    return MAX_REFRESH_INTERVAL
+
+
+class RelativeTimeTicker(QObject):
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        super().__init__()
+        self._clock = clock
+        self._subscribers: dict[QWidget, Callable[[], Optional[float]]] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.tick)
+
+    def register(
+        self, widget: QWidget, refresh: Callable[[], Optional[float]]
+    ) -> None:
+        """
+        Call `refresh` on every tick for as long as `widget` is visible.
+        `refresh` should update the relative times of the visible items
+        of `widget` and return the most recent timestamp among them (or
+        None if there are no such items).
+        """
+        self._subscribers[widget] = refresh
+        widget.installEventFilter(self)
+        widget.destroyed.connect(lambda: self.unregister(widget))
+        if isinstance(widget, QAbstractScrollArea):
+            widget.verticalScrollBar().valueChanged.connect(
+                lambda _: self.wake()
+            )
+        self.wake()
+
+    def unregister(self, widget: QWidget) -> None:
+        self._subscribers.pop(widget, None)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if (
+            event.type() in (QEvent.Show, QEvent.Resize)
+            and obj in self._subscribers
+        ):
+            self.wake()
+        return False
+
+    def is_active(self) -> bool:
+        return self._timer.isActive()
+
+    def wake(self, timestamp: Optional[float] = None) -> None:
+        """
+        Make sure that the next tick happens soon enough for a relative
+        time computed from `timestamp` to be kept up to date or, if no
+        timestamp is given, that it happens immediately (e.g., because
+        a widget was just shown and its relative times may be stale).
+        """
+        if timestamp is None:
+            msec = 0
+        else:
+            msec = int(refresh_interval(self._clock() - timestamp) * 1000)
+        if not self._timer.isActive() or self._timer.remainingTime() > msec:
+            self._timer.start(msec)
+
+    def tick(self) -> None:
+        newest = None
+        for widget, refresh in list(self._subscribers.items()):
+            if not widget.isVisible():
+                continue
+            timestamp = refresh()
+            if timestamp is not None and (
+                newest is None or timestamp > newest
+            ):
+                newest = timestamp
+        # If nothing is visible -- or nothing that is visible displays a
+        # relative time -- there is nothing to update until that changes
+        # (at which point `wake` will be called again).
+        if newest is None:
+            self._timer.stop()
+            return
+        age = self._clock() - newest
+        self._timer.start(int(refresh_interval(age) * 1000))
+
+
+_ticker: Optional[RelativeTimeTicker] = None
+
+
+def get_relative_time_ticker() -> RelativeTimeTicker:
+    global _ticker  # pylint: disable=global-statement
+    if _ticker is None:
+        _ticker = RelativeTimeTicker()
+    return _ticker
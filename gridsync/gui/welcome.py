@@ -21,11 +21,6 @@ from qtpy.QtWidgets import (
 from twisted.internet import reactor
 from twisted.internet.defer import CancelledError, Deferred
 from twisted.python.failure import Failure
-from wormhole.errors import (
-    ServerConnectionError,
-    WelcomeError,
-    WrongPasswordError,
-)
 
 from gridsync import APP_NAME, load_settings_from_cheatcode, resource
 from gridsync import settings as global_settings
@@ -326,6 +321,12 @@ class WelcomeDialog(QStackedWidget):
         self.page_2.icon_overlay.setPixmap(Pixmap(filepath, 100))
 
     def handle_failure(self, failure: Failure) -> None:
+        from wormhole.errors import (
+            ServerConnectionError,
+            WelcomeError,
+            WrongPasswordError,
+        )
+
         log.error(str(failure))
         if failure.type == CancelledError:
             if self.progressbar.value() <= 2:
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+A persistent, append-only journal of the files synced to/from a gateway's
+magic-folders, so that (unlike the events from which it is fed) the sync
+history survives restarts.
+
+Entries are buffered in memory and written to an SQLite database in
+batches -- either once `batch_size` entries have accumulated or
+`flush_interval` seconds after the first unwritten entry was recorded --
+and only the most recent `max_entries` are kept. Entries are read back a
+page at a time (newest first), so that the size of the journal affects
+neither memory usage nor startup time.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Optional, cast
+
+import attr
+from twisted.internet.interfaces import IDelayedCall, IReactorTime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    folder TEXT NOT NULL,
+    action TEXT NOT NULL,
+    relpath TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp, id);
+CREATE INDEX IF NOT EXISTS history_folder ON history (folder, timestamp, id);
+"""
+
+
+@attr.s(frozen=True)
+class HistoryEntry:
+    id: int = attr.ib()
+    timestamp: float = attr.ib()
+    folder: str = attr.ib()
+    action: str = attr.ib()
+    relpath: str = attr.ib()
+
+    @property
+    def cursor(self) -> tuple[float, int]:
+        """
+        The position of this entry in the journal; pass this as the
+        `before` argument of `HistoryJournal.page` to get the next page.
+        """
+        return (self.timestamp, self.id)
+
+
+class HistoryJournal:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: Path,
+        reactor: Optional[IReactorTime] = None,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_entries: int = 100_000,
+    ) -> None:
+        if reactor is None:
+            from twisted.internet import reactor as reactor_
+
+            # To avoid mypy "assignment" error ("expression has type Module")
+            reactor = cast(IReactorTime, reactor_)
+        self._reactor = reactor
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: list[tuple[float, str, str, str]] = []
+        self._flush_call: Optional[IDelayedCall] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # The database is opened (and, if necessary, created) on first use
+        # rather than at startup.
+        if self._connection is None:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def record(
+        self, folder: str, action: str, relpath: str, timestamp: float
+    ) -> None:
+        self._pending.append((timestamp, folder, action, relpath))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif not self._flush_call or not self._flush_call.active():
+            self._flush_call = self._reactor.callLater(
+                self.flush_interval, self.flush
+            )
+
+    def flush(self) -> None:
+        if self._flush_call and self._flush_call.active():
+            self._flush_call.cancel()
+        self._flush_call = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT INTO history (timestamp, folder, action, relpath) "
+                    "VALUES (?, ?, ?, ?)",
+                    pending,
+                )
+                # Since ids are assigned in ascending order, this removes
+                # all but the most recent `max_entries` entries.
+                connection.execute(
+                    "DELETE FROM history WHERE id <= "
+                    "(SELECT MAX(id) FROM history) - ?",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            logging.error("Error writing sync history: %s", str(e))
+
+    def forget_folder(self, folder: str) -> None:
+        """
+        Remove all the entries for the given folder (e.g., because it has
+        been left).
+        """
+        self._pending = [p for p in self._pending if p[1] != folder]
+        if self._connection is None and not self.path.exists():
+            return
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "DELETE FROM history WHERE folder = ?", (folder,)
+                )
+        except sqlite3.Error as e:
+            logging.error("Error removing sync history: %s", str(e))
+
+    def page(
+        self,
+        limit: int = 100,
+        before: Optional[tuple[float, int]] = None,
+        folder: Optional[str] = None,
+    ) -> list[HistoryEntry]:
+        """
+        Return (at most) `limit` entries -- newest first and, optionally,
+        only those for the given folder -- that precede the entry whose
+        `cursor` is `before` (or, if `before` is None, the newest ones).
+        """
+        self.flush()
+        conditions = []
+        params: list = []
+        if before is not None:
+            conditions.append("(timestamp, id) < (?, ?)")
+            params.extend(before)
+        if folder is not None:
+            conditions.append("folder = ?")
+            params.append(folder)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        try:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT id, timestamp, folder, action, relpath "
+                    f"FROM history {where} "
+                    "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                    params,
+                )
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logging.error("Error reading sync history: %s", str(e))
+            return []
+        return [HistoryEntry(*row) for row in rows]
+
+    def close(self) -> None:
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -2,31 +2,38 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional
 
 from qtpy.QtCore import QObject, Signal
 from twisted.internet.defer import Deferred, inlineCallbacks
 
-try:
-    from wormhole.wordlist import raw_words
-except ImportError:  # TODO: Switch to new magic-wormhole completion API?
-    from wormhole._wordlist import raw_words
-
 from gridsync import cheatcodes, load_settings_from_cheatcode
 from gridsync.setup import SetupRunner, validate_settings
 from gridsync.types_ import TwistedDeferred
-from gridsync.wormhole_ import Wormhole
 
 if TYPE_CHECKING:
     from gridsync.tahoe import Tahoe
 
 
-wordlist = []  # type: list
-for word in raw_words.items():
-    wordlist.extend(word[1])
-for c in cheatcodes:
-    wordlist.extend(c.split("-"))
-wordlist = sorted([word.lower() for word in wordlist])
+@lru_cache(maxsize=1)
+def get_wordlist() -> list[str]:
+    """
+    Return the (sorted, lowercase) list of words that may appear in an
+    invite code. Importing the magic-wormhole wordlist pulls in the rest
+    of the magic-wormhole package, so this is deferred until first use.
+    """
+    try:
+        from wormhole.wordlist import raw_words
+    except ImportError:  # TODO: Switch to new magic-wormhole completion API?
+        from wormhole._wordlist import raw_words
+
+    wordlist = []
+    for word in raw_words.items():
+        wordlist.extend(word[1])
+    for c in cheatcodes:
+        wordlist.extend(c.split("-"))
+    return sorted([word.lower() for word in wordlist])
 
 
 def is_valid_code(code: str) -> bool:
@@ -35,6 +42,7 @@ def is_valid_code(code: str) -> bool:
         return False
     if not words[0].isdigit():
         return False
+    wordlist = get_wordlist()
     if words[1] not in wordlist:
         return False
     if words[2] not in wordlist:
@@ -61,6 +69,8 @@ class InviteReceiver(QObject):
     done = Signal(object)
 
     def __init__(self, known_gateways: list, use_tor: bool = False) -> None:
+        from gridsync.wormhole_ import Wormhole
+
         super().__init__()
         self.known_gateways = known_gateways
         self.use_tor = use_tor
@@ -121,6 +131,8 @@ class InviteSender(QObject):
     closed = Signal()
 
     def __init__(self, use_tor: bool = False) -> None:
+        from gridsync.wormhole_ import Wormhole
+
         super().__init__()
         self.use_tor = use_tor
 
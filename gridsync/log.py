@@ -1,13 +1,17 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
 from datetime import datetime, timezone
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 from twisted.python.log import PythonLoggingObserver, startLogging
 
 from gridsync import APP_NAME, config_dir, settings
+from gridsync.eliot_store import EliotLogStore
 from gridsync.util import to_bool
 
 _logging_settings = settings.get("logging", {})
@@ -21,21 +25,222 @@ else:
 LOGGING_ENABLED = to_bool(_logging_settings.get("enabled", "false"))
 LOGGING_MAX_BYTES = int(_logging_settings.get("max_bytes", 10_000_000))
 LOGGING_BACKUP_COUNT = int(_logging_settings.get("backup_count", 1))
+LOGGING_QUEUE_SIZE = int(_logging_settings.get("queue_size", 10_000))
+LOGGING_ELIOT_SEGMENT_BYTES = int(
+    _logging_settings.get("eliot_segment_bytes", 1_000_000)
+)
+LOGGING_ELIOT_SEGMENTS = int(_logging_settings.get("eliot_segments", 100))
+LOGGING_ELIOT_BUFFER_SIZE = int(
+    _logging_settings.get("eliot_buffer_size", 1000)
+)
 
 
 class LogFormatter(logging.Formatter):
     def formatTime(
         self, record: logging.LogRecord, datefmt: Optional[str] = None
     ) -> str:
-        return datetime.now(timezone.utc).isoformat()
+        # Use the time at which the record was created (rather than the
+        # current time) since records may be formatted some time later by
+        # the LogWriter thread.
+        return datetime.fromtimestamp(record.created, timezone.utc).isoformat()
 
 
-def make_file_logger(
+class LogWriter(threading.Thread):
+    """
+    A background thread that writes log records on behalf of one or more
+    AsyncRotatingFileHandlers (or EliotLogHandlers).
+
+    Records are passed to the thread through a bounded queue and written
+    in batches -- with one write (and rollover check) per file, per
+    batch -- so that the threads producing log messages (e.g., the
+    reactor/GUI thread, when logging the output of subprocesses) never
+    block on disk I/O. If the queue is full, records are dropped (and
+    counted) rather than blocking the caller.
+    """
+
+    def __init__(
+        self, maxsize: int = LOGGING_QUEUE_SIZE, batch_size: int = 1000
+    ) -> None:
+        super().__init__(name="LogWriter", daemon=True)
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._dropped_reported = 0
+
+    def submit(
+        self,
+        handler: Union["AsyncRotatingFileHandler", "EliotLogHandler"],
+        record: logging.LogRecord,
+    ) -> None:
+        try:
+            self.queue.put_nowait((handler, record))
+        except queue.Full:
+            handler.dropped += 1
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until all of the records submitted before this call have
+        been written, returning False if this did not happen in time.
+        """
+        if not self.is_alive():
+            return self.queue.empty()
+        event = threading.Event()
+        try:
+            self.queue.put((None, event), timeout=timeout)
+        except queue.Full:
+            return False
+        return event.wait(timeout)
+
+    def run(self) -> None:
+        while True:
+            items = [self.queue.get()]
+            try:
+                while len(items) < self.batch_size:
+                    items.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            self._write(items)
+
+    def _write(self, items: list) -> None:
+        batches: dict[
+            Union["AsyncRotatingFileHandler", "EliotLogHandler"], list[str]
+        ] = {}
+        events = []
+        for handler, item in items:
+            if handler is None:
+                events.append(item)
+                continue
+            try:
+                line = handler.format(item) + handler.terminator
+            except Exception:  # pylint: disable=broad-except
+                handler.handleError(item)
+            else:
+                batches.setdefault(handler, []).append(line)
+        for handler, lines in batches.items():
+            handler.write_batch("".join(lines))
+        dropped = self.dropped
+        if dropped != self._dropped_reported:
+            logging.warning(
+                "Dropped %i log message(s) due to logging overload",
+                dropped - self._dropped_reported,
+            )
+            self._dropped_reported = dropped
+        for event in events:
+            event.set()
+
+
+_log_writer: Optional[LogWriter] = None
+_log_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> LogWriter:
+    global _log_writer  # pylint: disable=global-statement
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = LogWriter()
+            _log_writer.start()
+            atexit.register(_log_writer.flush)
+        return _log_writer
+
+
+class AsyncRotatingFileHandler(RotatingFileHandler):
+    """
+    A RotatingFileHandler that hands records off to a LogWriter thread
+    instead of writing them synchronously in the thread that emits them.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        writer: Optional[LogWriter] = None,
+    ) -> None:
+        super().__init__(
+            filename,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+        self.writer = writer if writer is not None else get_log_writer()
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.writer.submit(self, record)
+
+    def flush(self) -> None:
+        # Called by logging.shutdown(), among others.
+        if threading.current_thread() is not self.writer:
+            self.writer.flush()
+        super().flush()
+
+    def write_batch(self, text: str) -> None:
+        """
+        Write (and flush) the given pre-formatted text, rolling the file
+        over beforehand if the text would otherwise exceed max_bytes.
+        """
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0:
+                self.stream.seek(0, 2)
+                position = self.stream.tell()
+                if position and position + len(text) >= self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:  # Not re-opened when delay=True
+                        self.stream = self._open()
+            self.stream.write(text)
+            self.stream.flush()
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(
+                logging.makeLogRecord({"msg": "Error writing log batch"})
+            )
+        finally:
+            self.release()
+
+
+class EliotLogHandler(logging.Handler):
+    """
+    A handler that (via a LogWriter thread) appends eliot log messages to
+    a compressed, indexed EliotLogStore instead of a plain-text file.
+    """
+
+    terminator = "\n"
+
+    def __init__(
+        self, store: EliotLogStore, writer: Optional[LogWriter] = None
+    ) -> None:
+        super().__init__()
+        self.store = store
+        self.writer = writer if writer is not None else get_log_writer()
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.writer.submit(self, record)
+
+    def flush(self) -> None:
+        if threading.current_thread() is not self.writer:
+            self.writer.flush()
+
+    def write_batch(self, text: str) -> None:
+        try:
+            self.store.append(text)
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(
+                logging.makeLogRecord({"msg": "Error writing eliot log batch"})
+            )
+
+
+def make_file_logger(  # pylint: disable=too-many-arguments
     name: Optional[str] = None,
     max_bytes: int = LOGGING_MAX_BYTES,
     backup_count: int = LOGGING_BACKUP_COUNT,
     fmt: Optional[str] = "%(asctime)s %(levelname)s %(funcName)s %(message)s",
     use_null_handler: bool = False,
+    asynchronous: bool = False,
 ) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
@@ -49,6 +254,12 @@ def make_file_logger(
     handler: Union[logging.NullHandler, RotatingFileHandler]
     if use_null_handler or not LOGGING_ENABLED:
         handler = logging.NullHandler()
+    elif asynchronous:
+        handler = AsyncRotatingFileHandler(
+            Path(LOGS_PATH, f"{name}.log"),
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+        )
     else:
         handler = RotatingFileHandler(
             Path(LOGS_PATH, f"{name}.log"),
@@ -89,10 +300,33 @@ def read_log(path: Optional[Path] = None) -> str:
         return ""
 
 
+def iter_log(path: Optional[Path] = None) -> Iterator[str]:
+    """
+    Like `read_log` but yield the lines of the log one at a time instead
+    of reading the whole file into memory.
+    """
+    if path is None:
+        path = Path(LOGS_PATH, f"{APP_NAME}.log")
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            yield from f
+    except FileNotFoundError:
+        pass
+
+
 class MultiFileLogger:
     def __init__(self, basename: str) -> None:
         self.basename = basename
         self._loggers: dict[str, logging.Logger] = {}
+        self.eliot_store = EliotLogStore(
+            Path(LOGS_PATH, f"{basename}.eliot"),
+            max_segment_bytes=LOGGING_ELIOT_SEGMENT_BYTES,
+            max_segments=LOGGING_ELIOT_SEGMENTS,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return LOGGING_ENABLED
 
     def log(
         self, logger_name: str, message: str, omit_fmt: bool = False
@@ -103,23 +337,110 @@ class MultiFileLogger:
         logger = self._loggers.get(name)
         if not logger:
             if omit_fmt:
-                logger = make_file_logger(name, fmt=None)
+                logger = make_file_logger(name, fmt=None, asynchronous=True)
             else:
-                logger = make_file_logger(name)
+                logger = make_file_logger(name, asynchronous=True)
             self._loggers[name] = logger
         logger.debug(message)
 
+    def log_eliot(self, message: str) -> None:
+        if not LOGGING_ENABLED:
+            return
+        name = f"{self.basename}.eliot"
+        logger = self._loggers.get(name)
+        if not logger:
+            logger = logging.getLogger(name)
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+            logger.addHandler(EliotLogHandler(self.eliot_store))
+            self._loggers[name] = logger
+        logger.debug(message)
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of messages that were dropped (rather than written)
+        because the LogWriter was overloaded.
+        """
+        return sum(
+            getattr(handler, "dropped", 0)
+            for logger in self._loggers.values()
+            for handler in logger.handlers
+        )
+
+    def flush(self) -> None:
+        for logger in self._loggers.values():
+            for handler in logger.handlers:
+                handler.flush()
+
     def read_log(self, logger_name: str) -> str:
+        self.flush()
         return read_log(Path(LOGS_PATH, f"{self.basename}.{logger_name}.log"))
 
+    def iter_log(self, logger_name: str) -> Iterator[str]:
+        self.flush()
+        return iter_log(Path(LOGS_PATH, f"{self.basename}.{logger_name}.log"))
+
+    def iter_eliot_log(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        task_uuid: Optional[str] = None,
+    ) -> Iterator[str]:
+        self.flush()
+        return self.eliot_store.query(start, end, task_uuid)
+
+    def read_eliot_log(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        task_uuid: Optional[str] = None,
+    ) -> str:
+        """
+        Return the stored eliot messages -- optionally only those logged
+        between the `start` and `end` timestamps and/or belonging to the
+        given task -- one per line.
+        """
+        return "\n".join(self.iter_eliot_log(start, end, task_uuid))
+
 
 class NullLogger:
+    dropped = 0
+    enabled = False
+
     def log(
         self, logger_name: str, message: str, omit_fmt: bool = False
     ) -> None:
         pass
 
+    def log_eliot(self, message: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
     def read_log(  # pylint: disable=unused-argument
         self, logger_name: str
     ) -> str:
         return ""
+
+    def iter_log(  # pylint: disable=unused-argument
+        self, logger_name: str
+    ) -> Iterator[str]:
+        return iter([])
+
+    def iter_eliot_log(  # pylint: disable=unused-argument
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        task_uuid: Optional[str] = None,
+    ) -> Iterator[str]:
+        return iter([])
+
+    def read_eliot_log(  # pylint: disable=unused-argument
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        task_uuid: Optional[str] = None,
+    ) -> str:
+        return ""
@@ -7,7 +7,7 @@ import sqlite3
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Union, cast
+from typing import TYPE_CHECKING, Iterator, Optional, Union, cast
 
 import treq
 from qtpy.QtCore import QObject, Signal
@@ -24,6 +24,7 @@ from gridsync import APP_NAME
 from gridsync.capabilities import diminish
 from gridsync.crypto import randstr
 from gridsync.filter import is_eliot_log_message
+from gridsync.history_journal import HistoryJournal
 from gridsync.log import MultiFileLogger, NullLogger
 from gridsync.magic_folder_events import (
     MagicFolderEventHandler,
@@ -32,6 +33,7 @@ from gridsync.magic_folder_events import (
 )
 from gridsync.msg import critical
 from gridsync.supervisor import Supervisor
+from gridsync.sync_metrics import PROMETHEUS_TEXTFILE_DIR
 from gridsync.system import SubprocessProtocol, which
 from gridsync.watchdog import Watchdog
 
@@ -136,7 +138,9 @@ class MagicFolderMonitor(QObject):
 
         self._watchdog = MagicFolderWatchdog(self.magic_folder)
 
-        self.event_handler = MagicFolderEventHandler()
+        self.event_handler = MagicFolderEventHandler(
+            size_of=self._get_file_size
+        )
         self.events_monitor = MagicFolderEventsMonitor(self.event_handler)
 
         self.event_handler.folder_added.connect(
@@ -149,6 +153,15 @@ class MagicFolderMonitor(QObject):
             lambda f, s: Deferred.fromCoroutine(self.do_check())
         )
 
+    def _get_file_size(self, folder_name: str, relpath: str) -> Optional[int]:
+        directory = self.magic_folder.get_directory(folder_name)
+        if not directory:
+            return None
+        try:
+            return os.path.getsize(Path(directory, relpath))
+        except OSError:
+            return None
+
     def compare_folders(
         self,
         current_folders: dict[str, dict],
@@ -297,6 +310,15 @@ class MagicFolderMonitor(QObject):
             self.magic_folder.api_port, self.magic_folder.api_token
         )
         self._watchdog.start()
+        if PROMETHEUS_TEXTFILE_DIR:
+            gateway_name = self.magic_folder.gateway.name
+            self.event_handler.metrics.start(
+                Path(
+                    PROMETHEUS_TEXTFILE_DIR,
+                    f"{APP_NAME.lower()}-{gateway_name}.prom",
+                ),
+                {"gateway": gateway_name},
+            )
         self.running = True
         # XXX Something should wait on the result
         Deferred.fromCoroutine(self.do_check())
@@ -305,6 +327,7 @@ class MagicFolderMonitor(QObject):
         self.running = False
         self._watchdog.stop()
         self.events_monitor.stop()
+        self.event_handler.metrics.stop()
 
 
 class MagicFolder:
@@ -329,6 +352,17 @@ class MagicFolder:
             Path(self.configdir) / "running.process",
         )
 
+        self.history = HistoryJournal(
+            Path(gateway.nodedir, "private", "history.sqlite")
+        )
+        self.events.upload_finished.connect(
+            lambda f, p, t: self.history.record(f, "Uploaded", p, t)
+        )
+        self.events.download_finished.connect(
+            lambda f, p, t: self.history.record(f, "Downloaded", p, t)
+        )
+        self.events.folder_removed.connect(self.history.forget_folder)
+
         self.logger: Union[MultiFileLogger, NullLogger]
         if enable_logging:
             self.logger = MultiFileLogger(f"{gateway.name}.Magic-Folder")
@@ -340,14 +374,26 @@ class MagicFolder:
 
     def on_stderr_line_received(self, line: str) -> None:
         if is_eliot_log_message(line):
-            line = json.dumps(json.loads(line), sort_keys=True)
-            self.logger.log("eliot", line, omit_fmt=True)
+            self.logger.log_eliot(line)
         else:
             self.logger.log("stderr", line)
 
     def get_log(self, name: str) -> str:
         return self.logger.read_log(name)
 
+    def get_eliot_log(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> str:
+        return self.logger.read_eliot_log(start, end)
+
+    def iter_log(self, name: str) -> Iterator[str]:
+        return self.logger.iter_log(name)
+
+    def iter_eliot_log(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[str]:
+        return self.logger.iter_eliot_log(start, end)
+
     def _base_command_args(self) -> list[str]:
         if not self.executable:
             self.executable = which("magic-folder")
@@ -374,6 +420,7 @@ class MagicFolder:
 
     async def stop(self) -> None:
         self.monitor.stop()
+        self.history.close()
         await self.supervisor.stop()
 
     def _read_api_token(self) -> str:
@@ -594,6 +641,7 @@ class MagicFolder:
             del self.magic_folders[folder_name]
         except KeyError:
             pass
+        self.history.forget_folder(folder_name)
 
     def get_directory(self, folder_name: str) -> str:
         return self.magic_folders.get(folder_name, {}).get("magic_path", "")
@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 import logging
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import Enum, auto
+from typing import Callable, Optional
 
-from qtpy.QtCore import QObject, Signal, Slot
+import attr
+from qtpy.QtCore import QObject, QTimer, Signal, Slot
 
+from gridsync.sync_metrics import SyncMetrics
 from gridsync.websocket import WebSocketReaderService
 
 
@@ -109,41 +112,247 @@ class MagicFolderOperationsMonitor:
         self._update_status(folder)
 
 
+@attr.s(frozen=True)
+class SyncProgress:
+    """
+    The progress of the files queued to be synced to or from a folder (or,
+    for the overall progress, all folders) since it was last up to date.
+
+    :ivar bytes_total: The total size of the queued files. Since the size
+        of a file that is queued to be downloaded is not known until it
+        has been downloaded, this is partially an estimate.
+
+    :ivar throughput: The rate, in bytes per second, at which files have
+        been synced over (roughly) the last `THROUGHPUT_WINDOW` seconds.
+
+    :ivar eta: The number of seconds that syncing the remaining files
+        is estimated to take or None if this cannot yet be estimated.
+    """
+
+    folder: str = attr.ib()
+    files_done: int = attr.ib()
+    files_total: int = attr.ib()
+    bytes_done: int = attr.ib()
+    bytes_total: int = attr.ib()
+    throughput: float = attr.ib(default=0.0)
+    eta: Optional[float] = attr.ib(default=None)
+
+    @property
+    def percent(self) -> int:
+        if self.bytes_total:
+            done, total = self.bytes_done, self.bytes_total
+        else:
+            done, total = self.files_done, self.files_total
+        if not total:
+            return 0
+        return min(int(done / total * 100), 100)
+
+
+class _FolderProgress:
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.queued: list[str] = []
+        self.finished: list[str] = []
+        # The sizes of the queued (but not yet finished) files, or None
+        # for those of unknown size.
+        self.sizes: dict[str, Optional[int]] = {}
+        self.known_bytes = 0  # The total size of the files of known size
+        self.known_files = 0
+        self.unknown_files = 0
+        self.finished_bytes = 0
+        # (timestamp, size) pairs for the files finished recently; see
+        # `MagicFolderProgressMonitor.THROUGHPUT_WINDOW`.
+        self.transfers: deque[tuple[float, int]] = deque()
+
+    def queue(self, relpath: str, size: Optional[int]) -> None:
+        self.queued.append(relpath)
+        if relpath in self.sizes:
+            return
+        self.sizes[relpath] = size
+        if size is None:
+            self.unknown_files += 1
+        else:
+            self.known_bytes += size
+            self.known_files += 1
+
+    def finish(self, relpath: str, size: Optional[int], now: float) -> None:
+        self.finished.append(relpath)
+        try:
+            expected = self.sizes.pop(relpath)
+        except KeyError:
+            # Finished without having been queued (or queued more than
+            # once); count it towards the total as well.
+            expected = size or 0
+            self.known_bytes += expected
+            self.known_files += 1
+        else:
+            if expected is None:
+                expected = size or 0
+                self.unknown_files -= 1
+                self.known_bytes += expected
+                self.known_files += 1
+        self.finished_bytes += expected
+        self.transfers.append((now, expected))
+
+    def throughput(self, now: float, window: float) -> float:
+        while self.transfers and self.transfers[0][0] < now - window:
+            self.transfers.popleft()
+        elapsed = min(now - self.started, window)
+        if not self.transfers or elapsed <= 0:
+            return 0.0
+        return sum(size for _, size in self.transfers) / elapsed
+
+    def snapshot(self, folder: str, now: float, window: float) -> SyncProgress:
+        bytes_total = self.known_bytes
+        if self.unknown_files and self.known_files:
+            # Assume that the files of unknown size are, on average, the
+            # same size as those whose size is known.
+            bytes_total += int(
+                self.unknown_files * self.known_bytes / self.known_files
+            )
+        throughput = self.throughput(now, window)
+        remaining = max(bytes_total - self.finished_bytes, 0)
+        return SyncProgress(
+            folder=folder,
+            files_done=len(self.finished),
+            files_total=len(self.queued),
+            bytes_done=min(self.finished_bytes, bytes_total),
+            bytes_total=bytes_total,
+            throughput=throughput,
+            eta=remaining / throughput if throughput else None,
+        )
+
+
 class MagicFolderProgressMonitor:
-    def __init__(self, event_handler: MagicFolderEventHandler) -> None:
+    """
+    Track the progress -- weighted by the sizes of the files -- of the
+    uploads and downloads queued for each folder, emitting it (for the
+    folder concerned and for all folders combined) no more than `max_rate`
+    times per second so that large syncs don't flood the GUI with updates.
+    """
+
+    THROUGHPUT_WINDOW = 10.0
+
+    def __init__(
+        self,
+        event_handler: MagicFolderEventHandler,
+        size_of: Optional[Callable[[str, str], Optional[int]]] = None,
+        max_rate: float = 4.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.event_handler = event_handler
+        # Return the size, in bytes, of the given file (folder, relpath)
+        # or None if it is not known.
+        self.size_of = size_of
+        self._clock = clock
+
+        self._folders: dict[str, _FolderProgress] = {}
+        self._dirty: set[str] = set()
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(int(1000 / max_rate))
+        self._timer.timeout.connect(self._emit_pending)
+
+    def _size(self, folder: str, relpath: str) -> Optional[int]:
+        if self.size_of is None:
+            return None
+        return self.size_of(folder, relpath)
+
+    def _folder(self, folder: str) -> _FolderProgress:
+        progress = self._folders.get(folder)
+        if progress is None:
+            progress = _FolderProgress(self._clock())
+            self._folders[folder] = progress
+        return progress
+
+    def get_progress(self, folder: str) -> SyncProgress:
+        progress = self._folders.get(folder)
+        if progress is None:
+            return SyncProgress(folder, 0, 0, 0, 0)
+        return progress.snapshot(folder, self._clock(), self.THROUGHPUT_WINDOW)
+
+    def get_overall_progress(self) -> SyncProgress:
+        now = self._clock()
+        snapshots = [
+            p.snapshot(f, now, self.THROUGHPUT_WINDOW)
+            for f, p in self._folders.items()
+        ]
+        throughput = sum(s.throughput for s in snapshots)
+        bytes_total = sum(s.bytes_total for s in snapshots)
+        bytes_done = sum(s.bytes_done for s in snapshots)
+        return SyncProgress(
+            folder="",
+            files_done=sum(s.files_done for s in snapshots),
+            files_total=sum(s.files_total for s in snapshots),
+            bytes_done=bytes_done,
+            bytes_total=bytes_total,
+            throughput=throughput,
+            eta=(
+                (bytes_total - bytes_done) / throughput if throughput else None
+            ),
+        )
 
-        self._queued: defaultdict[str, list] = defaultdict(list)
-        self._finished: defaultdict[str, list] = defaultdict(list)
+    def _emit(self, folders: set[str]) -> None:
+        for folder in folders:
+            self.event_handler.sync_progress_updated.emit(
+                folder, self.get_progress(folder)
+            )
+        self.event_handler.overall_progress_updated.emit(
+            self.get_overall_progress()
+        )
+
+    def _emit_pending(self) -> None:
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        self._emit(dirty)
+        # Wait (at least) another interval before emitting again.
+        self._timer.start()
 
     def _update_progress(self, folder: str) -> None:
-        files = self._finished[folder]
-        current = len(files)
-        total = len(self._queued[folder])
-        self.event_handler.sync_progress_updated.emit(folder, current, total)
+        progress = self._folders[folder]
+        current = len(progress.finished)
+        total = len(progress.queued)
         if total and current == total:  # 100%
-            self._queued[folder] = []
-            self._finished[folder] = []
-            self.event_handler.files_updated.emit(folder, files)
+            # Emit the final progress immediately, lest it appear to be
+            # stuck just short of 100% until the next interval.
+            self._dirty.discard(folder)
+            self.event_handler.sync_progress_updated.emit(
+                folder, self.get_progress(folder)
+            )
+            del self._folders[folder]
+            self.event_handler.overall_progress_updated.emit(
+                self.get_overall_progress()
+            )
+            self.event_handler.files_updated.emit(folder, progress.finished)
+            return
+        self._dirty.add(folder)
+        if not self._timer.isActive():
+            self._emit_pending()
 
     @Slot(str, str)
     def on_upload_queued(self, folder: str, relpath: str) -> None:
-        self._queued[folder].append(relpath)
+        self._folder(folder).queue(relpath, self._size(folder, relpath))
         self._update_progress(folder)
 
     @Slot(str, str)
     def on_upload_finished(self, folder: str, relpath: str) -> None:
-        self._finished[folder].append(relpath)
+        self._folder(folder).finish(
+            relpath, self._size(folder, relpath), self._clock()
+        )
         self._update_progress(folder)
 
     @Slot(str, str)
     def on_download_queued(self, folder: str, relpath: str) -> None:
-        self._queued[folder].append(relpath)
+        # The size of a file that has yet to be downloaded is not known.
+        self._folder(folder).queue(relpath, None)
         self._update_progress(folder)
 
     @Slot(str, str)
     def on_download_finished(self, folder: str, relpath: str) -> None:
-        self._finished[folder].append(relpath)
+        self._folder(folder).finish(
+            relpath, self._size(folder, relpath), self._clock()
+        )
         self._update_progress(folder)
 
 
@@ -195,10 +404,13 @@ class MagicFolderEventHandler(QObject):
     overall_status_changed = Signal(object)  # MagicFolderStatus
 
     # From MagicFolderProgressMonitor
-    sync_progress_updated = Signal(str, object, object)  # folder, cur, total
+    sync_progress_updated = Signal(str, object)  # folder, SyncProgress
+    overall_progress_updated = Signal(object)  # SyncProgress
     files_updated = Signal(str, list)  # folder, files
 
-    def __init__(self) -> None:
+    def __init__(
+        self, size_of: Optional[Callable[[str, str], Optional[int]]] = None
+    ) -> None:
         super().__init__()
 
         _om = MagicFolderOperationsMonitor(self)
@@ -217,7 +429,7 @@ class MagicFolderEventHandler(QObject):
         self.poll_completed.connect(lambda f, t: _om.on_poll_completed(f, t))
         self.operations_monitor = _om
 
-        _pm = MagicFolderProgressMonitor(self)
+        _pm = MagicFolderProgressMonitor(self, size_of)
         self.upload_queued.connect(lambda f, p: _pm.on_upload_queued(f, p))
         self.upload_finished.connect(lambda f, p: _pm.on_upload_finished(f, p))
         self.download_queued.connect(lambda f, p: _pm.on_download_queued(f, p))
@@ -226,9 +438,14 @@ class MagicFolderEventHandler(QObject):
         )
         self.progress_monitor = _pm
 
+        self.metrics = SyncMetrics(size_of)
+
     def handle(self, event: dict) -> None:  # noqa: C901 [max-complexity]
         folder = event.get("folder", "")
         timestamp = float(event.get("timestamp", time.time()))
+        self.metrics.observe(
+            event.get("kind", ""), folder, event.get("relpath"), timestamp
+        )
         match event:
             case {"kind": "folder-added"}:
                 self.folder_added.emit(folder)
@@ -3,11 +3,12 @@ from __future__ import annotations
 import logging
 import secrets
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional, cast
 
 from atomicwrites import atomic_write
-from twisted.internet.defer import DeferredLock
+from twisted.internet.defer import Deferred, DeferredList, DeferredLock
 from twisted.internet.threads import deferToThread
+from twisted.python.failure import Failure
 
 from gridsync import APP_NAME, features
 from gridsync.errors import UpgradeRequiredError
@@ -211,6 +212,21 @@ class RootcapManager:
         finally:
             self.lock.release()
 
+    async def add_backups(self, dirname: str, backups: dict[str, str]) -> None:
+        """
+        Add multiple backups to the same backup directory at once.
+
+        :param dirname: same meaning as add_backup
+        :param backups: A mapping of names to the capabilities that
+            should be added beneath them.
+        """
+        backup_cap = await self.get_backup_cap(dirname)
+        await self.lock.acquire()
+        try:
+            await self.gateway.link_many(backup_cap, backups)
+        finally:
+            self.lock.release()
+
     async def get_backup(self, dirname: str, name: str) -> str:
         """
         Retrieve a backup previously added with `add_backup`.
@@ -240,7 +256,41 @@ class RootcapManager:
         finally:
             self.lock.release()
 
-    async def import_rootcap(self, source_dircap: str) -> None:
+    async def _list_backupdirs(
+        self, backupdirs: dict[str, dict]
+    ) -> dict[str, Optional[dict[str, dict]]]:
+        results = await DeferredList(
+            [
+                Deferred.fromCoroutine(self.gateway.ls(data["cap"]))
+                for data in backupdirs.values()
+            ],
+            consumeErrors=True,
+        )
+        contents: dict[str, Optional[dict[str, dict]]] = {}
+        for backupdir_name, (success, result) in zip(backupdirs, results):
+            if not success:
+                cast(Failure, result).raiseException()
+            contents[backupdir_name] = result
+        return contents
+
+    async def import_rootcap(
+        self,
+        source_dircap: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """
+        Restore the backups found beneath the base directory of another
+        rootcap (e.g., one embedded in a Recovery Key) into this one.
+
+        The source backup directories are listed concurrently and their
+        contents are then linked into the corresponding local backup
+        directories with a single request per directory.
+
+        :param source_dircap: The rootcap to import backups from.
+        :param progress_callback: An optional callable that will be
+            called with the number of backup directories restored so far
+            and the total number of backup directories to restore.
+        """
         src_dirs = await self.gateway.ls(source_dircap, exclude_filenodes=True)
         if src_dirs is None:
             raise ValueError("Failed to list source directory contents")
@@ -258,13 +308,32 @@ class RootcapManager:
         if not src_backupdirs:
             logging.warning("No backups found in imported rootcap")
             return
-        for backupdir_name, backupdir_data in src_backupdirs.items():
-            dir_contents = await self.gateway.ls(backupdir_data["cap"])
+        backupdir_contents = await self._list_backupdirs(src_backupdirs)
+        links = {}
+        for backupdir_name, dir_contents in backupdir_contents.items():
             if not dir_contents:
                 logging.warning(
                     'Backup directory "%s" is empty; not restoring',
                     backupdir_name,
                 )
                 continue
-            for name, data in dir_contents.items():
-                await self.add_backup(backupdir_name, name, data["cap"])
+            links[backupdir_name] = {
+                name: data["cap"] for name, data in dir_contents.items()
+            }
+        total = len(links)
+        if progress_callback:
+            progress_callback(0, total)
+        # Backups are applied one directory at a time since concurrent
+        # calls to `get_backup_cap` could otherwise race to create (and
+        # thereby replace) the same backup directory.
+        for i, (backupdir_name, backups) in enumerate(links.items(), 1):
+            await self.add_backups(backupdir_name, backups)
+            logging.debug(
+                'Restored %i backup(s) into "%s" (%i/%i)',
+                len(backups),
+                backupdir_name,
+                i,
+                total,
+            )
+            if progress_callback:
+                progress_callback(i, total)
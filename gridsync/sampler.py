@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Optional
+
+import attr
+from psutil import AccessDenied, NoSuchProcess, Process
+from twisted.internet.task import LoopingCall
+
+if TYPE_CHECKING:
+    from gridsync.supervisor import Supervisor
+
+
+@attr.s(frozen=True)
+class ResourceSample:
+    """
+    :ivar timestamp: The time at which the sample was taken.
+
+    :ivar pid: The PID of the sampled process.
+
+    :ivar cpu_percent: The CPU usage of the process (as a percentage of
+        one CPU) since the previous sample or None for the first sample
+        taken of a given process.
+
+    :ivar rss: The resident set size of the process, in bytes.
+
+    :ivar num_fds: The number of file descriptors (or, on Windows,
+        handles) that the process has open.
+
+    :ivar num_threads: The number of threads used by the process.
+
+    :ivar read_bytes: The total number of bytes read by the process, or
+        None where this is not supported (e.g., on macOS).
+
+    :ivar write_bytes: The total number of bytes written by the process,
+        or None where this is not supported (e.g., on macOS).
+    """
+
+    timestamp: float = attr.ib()
+    pid: int = attr.ib()
+    cpu_percent: Optional[float] = attr.ib()
+    rss: int = attr.ib()
+    num_fds: int = attr.ib()
+    num_threads: int = attr.ib()
+    read_bytes: Optional[int] = attr.ib()
+    write_bytes: Optional[int] = attr.ib()
+
+
+def _sample(process: Process) -> tuple[ResourceSample, float]:
+    with process.oneshot():
+        now = time.time()
+        cpu_times = process.cpu_times()
+        cpu_time = cpu_times.user + cpu_times.system
+        rss = process.memory_info().rss
+        if sys.platform == "win32":
+            num_fds = process.num_handles()
+        else:
+            num_fds = process.num_fds()
+        num_threads = process.num_threads()
+        try:
+            io_counters = process.io_counters()
+        except (AttributeError, AccessDenied):
+            read_bytes = write_bytes = None
+        else:
+            read_bytes = io_counters.read_bytes
+            write_bytes = io_counters.write_bytes
+    return (
+        ResourceSample(
+            timestamp=now,
+            pid=process.pid,
+            cpu_percent=None,
+            rss=rss,
+            num_fds=num_fds,
+            num_threads=num_threads,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+        ),
+        cpu_time,
+    )
+
+
+class ResourceSampler:
+    """
+    Periodically sample the resource usage of a supervised process,
+    keeping the last `size` samples in a ring buffer.
+
+    CPU usage is derived from the difference in the CPU times of the
+    process between samples (rather than with `Process.cpu_percent`) so
+    that sampling does not interfere with other callers of psutil.
+    """
+
+    def __init__(
+        self, supervisor: Supervisor, interval: float = 5.0, size: int = 720
+    ) -> None:
+        self.supervisor = supervisor
+        self.interval = interval
+        self._samples: deque[ResourceSample] = deque(maxlen=size)
+        self._last_cpu_time: Optional[float] = None
+        self._timer = LoopingCall(self.sample)
+
+    def start(self) -> None:
+        if not self._timer.running:
+            self._timer.start(self.interval, now=True)
+
+    def stop(self) -> None:
+        if self._timer.running:
+            self._timer.stop()
+
+    def sample(self) -> Optional[ResourceSample]:
+        process = self.supervisor.process
+        if process is None:
+            return None
+        previous = self.latest()
+        if previous is not None and previous.pid != process.pid:
+            previous = None  # The process has been restarted
+        try:
+            sample, cpu_time = _sample(process)
+        except (NoSuchProcess, AccessDenied) as e:
+            logging.debug("Error sampling process resources: %s", str(e))
+            return None
+        if previous is not None and self._last_cpu_time is not None:
+            elapsed = sample.timestamp - previous.timestamp
+            if elapsed > 0:
+                sample = attr.evolve(
+                    sample,
+                    cpu_percent=round(
+                        (cpu_time - self._last_cpu_time) / elapsed * 100, 1
+                    ),
+                )
+        self._last_cpu_time = cpu_time
+        self._samples.append(sample)
+        return sample
+
+    def latest(self) -> Optional[ResourceSample]:
+        return self._samples[-1] if self._samples else None
+
+    def samples(self, since: Optional[float] = None) -> list[ResourceSample]:
+        """
+        Return the recorded samples (oldest first), optionally only those
+        taken at or after the timestamp `since`.
+        """
+        if since is None:
+            return list(self._samples)
+        return [s for s in self._samples if s.timestamp >= since]
+
+    def summary(self, since: Optional[float] = None) -> dict:
+        """
+        Summarize the samples taken at or after `since` (or all of the
+        recorded samples): the mean and peak CPU usage, the peak RSS,
+        file descriptor, and thread counts, and the number of bytes read
+        and written by the process over that period.
+        """
+        samples = self.samples(since)
+        if not samples:
+            return {}
+        cpu = [s.cpu_percent for s in samples if s.cpu_percent is not None]
+        cpu_mean = round(sum(cpu) / len(cpu), 1) if cpu else None
+        summary = {
+            "samples": len(samples),
+            "first_timestamp": samples[0].timestamp,
+            "last_timestamp": samples[-1].timestamp,
+            "cpu_percent_mean": cpu_mean,
+            "cpu_percent_max": max(cpu) if cpu else None,
+            "rss_max": max(s.rss for s in samples),
+            "num_fds_max": max(s.num_fds for s in samples),
+            "num_threads_max": max(s.num_threads for s in samples),
+            "read_bytes": None,
+            "write_bytes": None,
+        }
+        # I/O counters are cumulative and reset when the process restarts
+        # so only compare samples taken from the most recent process.
+        current = [s for s in samples if s.pid == samples[-1].pid]
+        first, last = current[0], current[-1]
+        if first.read_bytes is not None and last.read_bytes is not None:
+            summary["read_bytes"] = last.read_bytes - first.read_bytes
+        if first.write_bytes is not None and last.write_bytes is not None:
+            summary["write_bytes"] = last.write_bytes - first.write_bytes
+        return summary
@@ -401,7 +401,16 @@ class SetupRunner(QObject):
                         f"snapshot(s) found in recovery-capability.{help_text}"
                     )
                 await self._restore_zkaps(recovery_cap)
-            await self.gateway.rootcap_manager.import_rootcap(rootcap)
+
+            def restore_progress(restored: int, total: int) -> None:
+                if total:
+                    self.update_progress.emit(
+                        f"Restoring from Recovery Key ({restored}/{total})..."
+                    )
+
+            await self.gateway.rootcap_manager.import_rootcap(
+                rootcap, restore_progress
+            )
             if zkapauthz:
                 # This must happen *after* the `import_rootcap` call
                 # above, since both `import_rootcap` and `backup_zkaps`
@@ -1,14 +1,18 @@
 import logging
 import os
+import random
 import time
 from pathlib import Path
 from typing import Callable, Optional
 
 from filelock import FileLock
-from psutil import Process
+from psutil import AccessDenied, NoSuchProcess, Process
 from twisted.internet import reactor
 from twisted.internet.defer import inlineCallbacks
+from twisted.internet.interfaces import IDelayedCall
+from twisted.python.failure import Failure
 
+from gridsync.sampler import ResourceSampler
 from gridsync.system import (
     SubprocessProtocol,
     terminate,
@@ -35,19 +39,41 @@ def parse_pidfile(pidfile: Path) -> tuple[int, float]:
 
 
 class Supervisor:
-    def __init__(
+    """
+    Start a process and keep it running, restarting it whenever it exits
+    unexpectedly.
+
+    Restarts are delayed with exponential back-off (beginning at
+    `restart_delay` seconds and doubling with each consecutive restart,
+    up to `max_restart_delay`), with up to +/- `jitter` (as a fraction of
+    the delay) of random jitter added. The back-off is reset once the
+    process has stayed up for at least `stable_uptime` seconds.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         pidfile: Path,
-        restart_delay: int = 1,
+        restart_delay: float = 1,
+        max_restart_delay: float = 60,
+        stable_uptime: float = 60,
+        jitter: float = 0.1,
     ) -> None:
         self.pidfile: Path = pidfile
-        self.restart_delay: int = restart_delay
+        self.restart_delay: float = restart_delay
+        self.max_restart_delay: float = max_restart_delay
+        self.stable_uptime: float = stable_uptime
+        self.jitter: float = jitter
         self.time_started: Optional[float] = None
+        self.restart_count: int = 0
+        self.consecutive_restarts: int = 0
+        self.last_exit_reason: str = ""
+        self.last_exit_time: Optional[float] = None
         # _protocol is non-None only when we have a running subprocess
         self._protocol: Optional[SubprocessProtocol] = None
         # _process lazily created to match _protocol.pid
         self._process: Optional[Process] = None
         self._keep_alive: bool = True
+        self._restart_call: Optional[IDelayedCall] = None
         self._args: list[str] = []
         self._started_trigger = ""
         self._stdout_line_collector: Optional[Callable] = None
@@ -55,6 +81,7 @@ class Supervisor:
         self._call_before_start: Optional[Callable] = None
         self._call_after_start: Optional[Callable] = None
         self._on_process_ended: Optional[Callable] = None
+        self.resource_sampler = ResourceSampler(self)
 
     def is_running(self) -> bool:
         return self.process.is_running() if self.process else False
@@ -64,6 +91,14 @@ class Supervisor:
         if self._process is None:
             if self._protocol is not None:
                 self._process = Process(self._protocol.transport.pid)  # type: ignore
+                # The first call to `cpu_percent` (without an interval)
+                # only records a baseline and always returns 0.0; make it
+                # now -- i.e., when the process (re)starts -- so that the
+                # first call in `metrics` measures usage since then.
+                try:
+                    self._process.cpu_percent(interval=None)
+                except (NoSuchProcess, AccessDenied):
+                    pass
         return self._process
 
     @property
@@ -72,9 +107,59 @@ class Supervisor:
             return ""
         return self.process.name
 
+    @property
+    def uptime(self) -> float:
+        if self.time_started is None or not self.is_running():
+            return 0.0
+        return time.time() - self.time_started
+
+    def metrics(self) -> dict:
+        """
+        Return a snapshot of the health of the supervised process: its
+        PID, uptime, CPU usage (as a percentage, since the last time
+        `metrics` was called or, the first time, since the process was
+        started) and resident set size (in bytes), along with the number
+        of times it has been restarted and the reason it last exited.
+        """
+        process = self.process
+        pid: Optional[int] = None
+        cpu_percent: Optional[float] = None
+        rss: Optional[int] = None
+        if process is not None:
+            pid = process.pid
+            try:
+                with process.oneshot():
+                    cpu_percent = process.cpu_percent(interval=None)
+                    rss = process.memory_info().rss
+            except (NoSuchProcess, AccessDenied):
+                pass
+        return {
+            "args": self._args,
+            "pid": pid,
+            "running": self.is_running(),
+            "uptime": self.uptime,
+            "restart_count": self.restart_count,
+            "consecutive_restarts": self.consecutive_restarts,
+            "restart_pending": self._restart_call is not None,
+            "last_exit_reason": self.last_exit_reason,
+            "last_exit_time": self.last_exit_time,
+            "cpu_percent": cpu_percent,
+            "rss": rss,
+            "resources": self.resource_sampler.summary(),
+        }
+
     @inlineCallbacks
     def stop(self) -> TwistedDeferred[None]:
         self._keep_alive = False
+        self.resource_sampler.stop()
+        if self._restart_call is not None:
+            # The process has already exited and is waiting to restart
+            if self._restart_call.active():
+                self._restart_call.cancel()
+            self._restart_call = None
+            self._protocol = None
+            self._process = None
+            return
         if self._protocol is None:
             logging.warning(
                 "Tried to stop a supervised process that wasn't running"
@@ -121,32 +206,54 @@ class Supervisor:
         assert self.process is not None
         return (self.process.pid, self.name)
 
-    def _schedule_restart(self, _) -> None:  # type: ignore
-        if self._keep_alive:
-            logging.debug(
-                "Restarting supervised process: %s", " ".join(self._args)
-            )
-            reactor.callLater(  # type: ignore
-                self.restart_delay, self._start_process
+    def _get_restart_delay(self) -> float:
+        delay = min(
+            self.restart_delay * 2 ** (self.consecutive_restarts - 1),
+            self.max_restart_delay,
+        )
+        return max(
+            0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+        )
+
+    def _restart(self) -> None:
+        self._restart_call = None
+        self.restart_count += 1
+        d = self._start_process()
+        d.addErrback(
+            lambda f: logging.warning(
+                "Error restarting supervised process: %s", f.getErrorMessage()
             )
+        )
 
-    @inlineCallbacks
-    def start(  # pylint: disable=too-many-arguments
-        self,
-        args: list[str],
-        started_trigger: str = "",
-        stdout_line_collector: Optional[Callable] = None,
-        stderr_line_collector: Optional[Callable] = None,
-        call_before_start: Optional[Callable] = None,
-        call_after_start: Optional[Callable] = None,
-    ) -> TwistedDeferred[tuple[int, str]]:
-        self._args = args
-        self._started_trigger = started_trigger
-        self._stdout_line_collector = stdout_line_collector
-        self._stderr_line_collector = stderr_line_collector
-        self._call_before_start = call_before_start
-        self._call_after_start = call_after_start
+    def _schedule_restart(self, reason: Failure) -> None:
+        now = time.time()
+        uptime = now - self.time_started if self.time_started else 0.0
+        self.last_exit_reason = str(reason.value)
+        self.last_exit_time = now
+        if not self._keep_alive:
+            return
+        if uptime >= self.stable_uptime:
+            self.consecutive_restarts = 0
+        self.consecutive_restarts += 1
+        delay = self._get_restart_delay()
+        logging.debug(
+            "Restarting supervised process in %.1f seconds (after %.1f "
+            "seconds of uptime; restart #%i): %s",
+            delay,
+            uptime,
+            self.consecutive_restarts,
+            " ".join(self._args),
+        )
+        self._restart_call = reactor.callLater(  # type: ignore
+            delay, self._restart
+        )
 
+    @inlineCallbacks
+    def cleanup_stale_process(self) -> TwistedDeferred[None]:
+        """
+        Terminate any process left over from a previous run (as recorded
+        in the pidfile) and remove the pidfile.
+        """
         # examine our process' corresponding pidfile, which means one
         # of these is true:
         #  1. there is no pidfile
@@ -154,6 +261,8 @@ class Supervisor:
         #  3. the pid is a tahoe (or magic-folder etc) process
         #  4. the pid is some other process
 
+        if not self.pidfile.exists():  # 1. (without needing to lock)
+            return
         lockfile = self.pidfile.with_name(self.pidfile.name + ".lock")
         with FileLock(lockfile, timeout=2):
             try:
@@ -175,7 +284,27 @@ class Supervisor:
                 # to remove the file so our subprocess can start
                 self.pidfile.unlink()
 
+    @inlineCallbacks
+    def start(  # pylint: disable=too-many-arguments
+        self,
+        args: list[str],
+        started_trigger: str = "",
+        stdout_line_collector: Optional[Callable] = None,
+        stderr_line_collector: Optional[Callable] = None,
+        call_before_start: Optional[Callable] = None,
+        call_after_start: Optional[Callable] = None,
+    ) -> TwistedDeferred[tuple[int, str]]:
+        self._args = args
+        self._started_trigger = started_trigger
+        self._stdout_line_collector = stdout_line_collector
+        self._stderr_line_collector = stderr_line_collector
+        self._call_before_start = call_before_start
+        self._call_after_start = call_after_start
+
+        yield self.cleanup_stale_process()
+
         logging.debug("Starting supervised process: %s", " ".join(self._args))
         result = yield self._start_process()
+        self.resource_sampler.start()
         pid, name = result
         return (pid, name)
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+Measure how fast files are actually synced, from the upload and download
+events emitted by Magic-Folder: per folder (and, combined, per gateway)
+the number of files and bytes synced, the current throughput, the number
+of files waiting in the queue, and the latency from a file being queued
+to it being finished.
+
+All state is of a fixed size (apart from the set of files currently in
+the queue): throughput is computed from a ring of per-second byte counts
+and latencies are counted in fixed histogram buckets, from which
+percentiles are estimated. Metrics can be exported as a dict (e.g., for
+inclusion, as JSON, in debug information) or written, periodically, to a
+local text file in the Prometheus exposition format (for collection by,
+e.g., the "textfile" collector of the Prometheus node exporter).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from atomicwrites import atomic_write
+from twisted.internet.task import LoopingCall
+
+from gridsync import APP_NAME, settings
+
+_metrics_settings = settings.get("metrics", {})
+
+PROMETHEUS_TEXTFILE_DIR = _metrics_settings.get("prometheus_textfile_dir", "")
+PROMETHEUS_WRITE_INTERVAL = float(
+    _metrics_settings.get("prometheus_write_interval", 15)
+)
+
+# Upper bounds, in seconds, of the buckets of the latency histograms.
+LATENCY_BUCKETS = (
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+    900.0,
+    3600.0,
+    math.inf,
+)
+
+DIRECTIONS = ("upload", "download")
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate the `q`-th percentile (0-100) by interpolating linearly
+        within the bucket in which it falls, as Prometheus'
+        `histogram_quantile` does. Values in the last (unbounded) bucket
+        are estimated to be equal to the upper bound of the bucket
+        before it.
+        """
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and cumulative + count >= rank:
+                if math.isinf(bound):
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound if not math.isinf(bound) else lower
+        return lower
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class RateWindow:
+    """
+    Count the bytes transferred in each of the last `seconds` seconds (in
+    a ring of fixed size) so as to compute the average rate over them.
+    """
+
+    def __init__(self, seconds: int = 60) -> None:
+        self.seconds = seconds
+        self._bytes = [0] * seconds
+        self._times = [-1] * seconds
+
+    def add(self, timestamp: float, size: int) -> None:
+        second = int(timestamp)
+        i = second % self.seconds
+        if self._times[i] != second:
+            self._times[i] = second
+            self._bytes[i] = 0
+        self._bytes[i] += size
+
+    def rate(self, now: float) -> float:
+        second = int(now)
+        total = sum(
+            size
+            for size, t in zip(self._bytes, self._times)
+            if second - self.seconds < t <= second
+        )
+        return total / self.seconds
+
+
+class TransferStats:
+    def __init__(self) -> None:
+        # Files currently queued (but not yet finished), mapped to the
+        # times at which they were first queued.
+        self.queued: dict[str, float] = {}
+        self.files = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+        self.window = RateWindow()
+
+    def on_queued(self, relpath: str, timestamp: float) -> None:
+        self.queued.setdefault(relpath, timestamp)
+
+    def on_finished(
+        self, relpath: str, timestamp: float, size: Optional[int]
+    ) -> None:
+        queued_at = self.queued.pop(relpath, None)
+        if queued_at is not None:
+            self.latency.observe(max(timestamp - queued_at, 0.0))
+        self.files += 1
+        self.bytes += size or 0
+        self.window.add(timestamp, size or 0)
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "queue_depth": len(self.queued),
+            "files": self.files,
+            "bytes": self.bytes,
+            "throughput": round(self.window.rate(now), 3),
+            "latency": self.latency.to_dict(),
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, str]) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class SyncMetrics:
+    def __init__(
+        self,
+        size_of: Optional[Callable[[str, str], Optional[int]]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        # Return the size, in bytes, of the given file (folder, relpath)
+        # or None if it is not known.
+        self.size_of = size_of
+        self._clock = clock
+        self._folders: dict[str, dict[str, TransferStats]] = {}
+        self._timer: Optional[LoopingCall] = None
+
+    def _stats(self, folder: str, direction: str) -> TransferStats:
+        stats = self._folders.get(folder)
+        if stats is None:
+            stats = {d: TransferStats() for d in DIRECTIONS}
+            self._folders[folder] = stats
+        return stats[direction]
+
+    def observe(
+        self, kind: str, folder: str, relpath: Optional[str], timestamp: float
+    ) -> None:
+        if kind == "folder-left":
+            self._folders.pop(folder, None)
+            return
+        direction, _, stage = kind.partition("-")
+        if direction not in DIRECTIONS or relpath is None:
+            return
+        if stage == "queued":
+            self._stats(folder, direction).on_queued(relpath, timestamp)
+        elif stage == "finished":
+            size = self.size_of(folder, relpath) if self.size_of else None
+            self._stats(folder, direction).on_finished(
+                relpath, timestamp, size
+            )
+
+    def to_dict(self) -> dict:
+        """
+        Return the metrics of each folder, keyed by folder name, and those
+        of all folders combined (as "gateway").
+        """
+        now = self._clock()
+        folders = {}
+        for folder, stats in self._folders.items():
+            folders[folder] = {d: stats[d].to_dict(now) for d in DIRECTIONS}
+        gateway = {}
+        for d in DIRECTIONS:
+            all_stats = [stats[d] for stats in self._folders.values()]
+            latency = LatencyHistogram()
+            for s in all_stats:
+                latency.merge(s.latency)
+            gateway[d] = {
+                "queue_depth": sum(len(s.queued) for s in all_stats),
+                "files": sum(s.files for s in all_stats),
+                "bytes": sum(s.bytes for s in all_stats),
+                "throughput": round(
+                    sum(s.window.rate(now) for s in all_stats), 3
+                ),
+                "latency": latency.to_dict(),
+            }
+        return {"folders": folders, "gateway": gateway}
+
+    def to_prometheus(self, labels: Optional[dict[str, str]] = None) -> str:
+        """
+        Render the metrics of each folder in the Prometheus text-based
+        exposition format, with the given (e.g., gateway) `labels` added
+        to every sample. Per-gateway totals are left to be computed (e.g.,
+        with `sum by (gateway)`) by Prometheus.
+        """
+        now = self._clock()
+        # Metric names may only contain letters, digits, and underscores.
+        prefix = re.sub(r"[^a-z0-9_]", "_", f"{APP_NAME.lower()}_sync")
+        metrics: dict[str, tuple[str, str, list[str]]] = {
+            "files": ("counter", "Files synced.", []),
+            "bytes": ("counter", "Bytes synced.", []),
+            "queue_depth": ("gauge", "Files queued to be synced.", []),
+            "throughput_bytes_per_second": (
+                "gauge",
+                "Bytes synced per second over the last minute.",
+                [],
+            ),
+            "latency_seconds": (
+                "histogram",
+                "Time from a file being queued to being synced.",
+                [],
+            ),
+        }
+        for folder, stats in sorted(self._folders.items()):
+            for d in DIRECTIONS:
+                s = stats[d]
+                lbl = dict(labels or {}, folder=folder, direction=d)
+                base = _labels(lbl)
+                metrics["files"][2].append(
+                    f"{prefix}_files_total{{{base}}} {s.files}"
+                )
+                metrics["bytes"][2].append(
+                    f"{prefix}_bytes_total{{{base}}} {s.bytes}"
+                )
+                metrics["queue_depth"][2].append(
+                    f"{prefix}_queue_depth{{{base}}} {len(s.queued)}"
+                )
+                metrics["throughput_bytes_per_second"][2].append(
+                    f"{prefix}_throughput_bytes_per_second{{{base}}} "
+                    f"{_number(s.window.rate(now))}"
+                )
+                samples = metrics["latency_seconds"][2]
+                cumulative = 0
+                for bound, count in zip(s.latency.buckets, s.latency.counts):
+                    cumulative += count
+                    bucket = _labels(dict(lbl, le=_number(bound)))
+                    samples.append(
+                        f"{prefix}_latency_seconds_bucket{{{bucket}}} "
+                        f"{cumulative}"
+                    )
+                samples.append(
+                    f"{prefix}_latency_seconds_sum{{{base}}} "
+                    f"{_number(s.latency.sum)}"
+                )
+                samples.append(
+                    f"{prefix}_latency_seconds_count{{{base}}} "
+                    f"{s.latency.count}"
+                )
+        lines = []
+        for name, (kind, description, samples) in metrics.items():
+            if kind == "counter":
+                name = f"{name}_total"
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(
+        self, path: Path, labels: Optional[dict[str, str]] = None
+    ) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(str(path), mode="w", overwrite=True) as f:
+                f.write(self.to_prometheus(labels))
+        except OSError as e:
+            logging.warning("Error writing sync metrics: %s", str(e))
+
+    def start(
+        self,
+        path: Path,
+        labels: Optional[dict[str, str]] = None,
+        interval: float = PROMETHEUS_WRITE_INTERVAL,
+    ) -> None:
+        """
+        Write the metrics to the text file at `path` every `interval`
+        seconds until `stop` is called.
+        """
+        self.stop()
+        self._timer = LoopingCall(self.write_textfile, path, labels)
+        self._timer.start(interval, now=True)
+
+    def stop(self) -> None:
+        if self._timer is not None and self._timer.running:
+            self._timer.stop()
+        self._timer = None
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import codecs
 import logging
+import os
 import shutil
-import time
-from io import BytesIO
+from collections import deque
 from typing import TYPE_CHECKING, Callable, Optional, Union
 
-from psutil import NoSuchProcess, Process, TimeoutExpired
+from psutil import STATUS_ZOMBIE, NoSuchProcess, Process
 from twisted.internet import reactor
-from twisted.internet.defer import Deferred, DeferredList, inlineCallbacks
+from twisted.internet.defer import (
+    CancelledError,
+    Deferred,
+    DeferredList,
+    inlineCallbacks,
+)
 from twisted.internet.error import ProcessDone
+from twisted.internet.interfaces import IReadDescriptor
 from twisted.internet.protocol import ProcessProtocol
-from twisted.internet.task import deferLater
+from twisted.internet.task import LoopingCall, deferLater
+from zope.interface import implementer
 
 from gridsync import APP_NAME
 from gridsync.types_ import TwistedDeferred
@@ -40,8 +48,81 @@ def which(cmd: str) -> str:
     return path
 
 
+@implementer(IReadDescriptor)
+class _PidfdReader:
+    """
+    Fire `exited` when the process referred to by the given pidfd exits
+    (at which point the pidfd becomes readable).
+    """
+
+    def __init__(self, pidfd: int) -> None:
+        self._pidfd: Optional[int] = pidfd
+        self.exited: Deferred[None] = Deferred()
+
+    def fileno(self) -> int:
+        return self._pidfd if self._pidfd is not None else -1
+
+    def logPrefix(self) -> str:
+        return "pidfd"
+
+    def doRead(self) -> None:
+        self._finish()
+
+    def connectionLost(self, _reason: Failure) -> None:
+        self._finish()
+
+    def _finish(self) -> None:
+        if self._pidfd is None:
+            return
+        reactor.removeReader(self)  # type: ignore
+        os.close(self._pidfd)
+        self._pidfd = None
+        self.exited.callback(None)
+
+
+def _poll_for_exit(proc: Process, interval: float) -> Deferred[None]:
+    d: Deferred[None] = Deferred()
+
+    def check() -> None:
+        try:
+            exited = proc.status() == STATUS_ZOMBIE or not proc.is_running()
+        except NoSuchProcess:
+            exited = True
+        if exited:
+            loop.stop()
+            d.callback(None)
+
+    loop = LoopingCall(check)
+    loop.clock = reactor  # type: ignore
+    loop.start(interval, now=True)
+    return d
+
+
+def wait_for_exit(proc: Process, poll_interval: float = 0.1) -> Deferred[None]:
+    """
+    Return a Deferred that fires when the given process has exited.
+
+    Where supported (i.e., on Linux 5.3 and later), this is notified by
+    the kernel via a pidfd; elsewhere, the process is polled every
+    `poll_interval` seconds instead.
+    """
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is not None:
+        try:
+            pidfd = pidfd_open(proc.pid)
+        except OSError:
+            pass  # The process has already exited or pidfds are disabled
+        else:
+            if proc.is_running():  # The PID has not been reused since
+                reader = _PidfdReader(pidfd)
+                reactor.addReader(reader)  # type: ignore
+                return reader.exited
+            os.close(pidfd)
+    return _poll_for_exit(proc, poll_interval)
+
+
 @inlineCallbacks
-def terminate_if_matching(  # noqa: max-complexity
+def terminate_if_matching(
     pid: int,
     create_time: float,
     kill_after: Optional[Union[int, float]] = None,
@@ -57,27 +138,30 @@ def terminate_if_matching(  # noqa: max-complexity
         proc = Process(pid)
         if proc.create_time() != create_time:
             return False
+        exited = wait_for_exit(proc)
         proc.terminate()
     except NoSuchProcess:
         return False
 
-    limit = time.time() + kill_after if kill_after else 0
-    while proc.is_running():
-        try:
-            if proc.wait(timeout=0) in (None, 0):
-                return False
-            return True
-        except NoSuchProcess:
-            break
-        except TimeoutExpired:
-            pass
-        if limit and time.time() >= limit:
-            try:
-                proc.kill()
-            except NoSuchProcess:
-                return False
-        yield deferLater(reactor, 0.1, lambda: None)  # type: ignore
-    return False  # appease mypy; we shouldn't get here
+    if not kill_after:
+        yield exited
+        return False
+    timeout = deferLater(reactor, kill_after, lambda: None)  # type: ignore
+    # The timeout is cancelled if the process exits first.
+    timeout.addErrback(lambda f: f.trap(CancelledError))
+    _, idx = yield DeferredList(
+        [exited, timeout], fireOnOneCallback=True, fireOnOneErrback=True
+    )
+    if idx == 0:
+        timeout.cancel()
+        return False
+    logging.debug("Failed to terminate, sending KILL to %i", pid)
+    try:
+        proc.kill()
+    except NoSuchProcess:
+        return False
+    yield exited
+    return True
 
 
 @inlineCallbacks
@@ -90,7 +174,7 @@ def terminate(
     :returns: a Deferred that fires when the process has terminated or been killed.
     """
     # mypy is very confused by zope.interface
-    proc.transport.signalProcess("TERM")  # type:ignore
+    proc.transport.signalProcess("TERM")  # type: ignore
 
     waiting = [proc.when_exited()]
     if kill_after:
@@ -102,9 +186,9 @@ def terminate(
         # the timeout fired (not when_exited())
         logging.debug(
             "Failed to terminate, sending KILL to %i",
-            proc.transport.pid,  # type:ignore
+            proc.transport.pid,  # type: ignore
         )
-        proc.transport.signalProcess("KILL")  # type:ignore
+        proc.transport.signalProcess("KILL")  # type: ignore
         try:
             yield proc.when_exited()
         except Exception:  # pylint: disable=broad-except
@@ -116,6 +200,17 @@ class SubprocessError(Exception):
 
 
 class SubprocessProtocol(ProcessProtocol):
+    """
+    A ProcessProtocol that frames the output of a process into lines
+    (passing each complete line of stdout or stderr to the corresponding
+    collector) and that fires `done` with the process's output when a
+    line matches one of the `callback_triggers` (or fails `done` when a
+    line matches one of the `errback_triggers`), or when it exits.
+
+    At most the last `max_output` characters of output are kept for the
+    result of `done`; output is no longer kept once `done` has fired.
+    """
+
     def __init__(  # pylint: disable=too-many-arguments
         self,
         callback_triggers: Optional[list[str]] = None,
@@ -123,46 +218,90 @@ class SubprocessProtocol(ProcessProtocol):
         stdout_line_collector: Optional[Callable] = None,
         stderr_line_collector: Optional[Callable] = None,
         on_process_ended: Optional[Callable] = None,
+        max_output: int = 1_000_000,
     ) -> None:
         self.callback_triggers = callback_triggers
         self.errback_triggers = errback_triggers
         self.stdout_line_collector = stdout_line_collector
         self.stderr_line_collector = stderr_line_collector
         self._on_process_ended = on_process_ended
-        self._output = BytesIO()
+        self.max_output = max_output
+        self._output: deque[str] = deque()
+        self._output_size = 0
+        # Per-fd decoders and partial (i.e., not-yet-terminated) lines
+        self._decoders: dict[int, codecs.IncrementalDecoder] = {}
+        self._partial_lines: dict[int, str] = {}
         self.done: Deferred = Deferred()
         # becomes None once we've exited
         self._awaiting_ended: Optional[list[Deferred]] = []
 
+    def _capture(self, text: str) -> None:
+        self._output.append(text)
+        self._output_size += len(text)
+        # Discard the oldest chunks that are no longer needed to make up
+        # the last `max_output` characters
+        while (
+            len(self._output) > 1
+            and self._output_size - len(self._output[0]) >= self.max_output
+        ):
+            self._output_size -= len(self._output.popleft())
+
+    def _get_output(self) -> str:
+        return "".join(self._output)[-self.max_output :].strip()
+
     def _check_triggers(self, line: str) -> None:
         if self.callback_triggers:
             for text in self.callback_triggers:
                 if text and text in line:
-                    self.done.callback(
-                        self._output.getvalue().decode("utf-8").strip()
-                    )
+                    self.done.callback(self._get_output())
+                    return
         if self.errback_triggers:
             for pair in self.errback_triggers:
                 if not pair:
                     continue
                 text, exception = pair
                 if text and exception and text in line:
-                    self.done.errback(
-                        exception(
-                            self._output.getvalue().decode("utf-8").strip()
-                        )
-                    )
+                    self.done.errback(exception(self._get_output()))
+                    return
+
+    def _line_received(self, childFD: int, line: str) -> None:
+        if line.endswith("\r"):
+            line = line[:-1]
+        if self.stdout_line_collector and childFD == 1:
+            self.stdout_line_collector(line)
+        elif self.stderr_line_collector and childFD == 2:
+            self.stderr_line_collector(line)
+        if not self.done.called:
+            self._check_triggers(line)
+
+    def _decode(self, childFD: int, data: bytes, final: bool = False) -> str:
+        decoder = self._decoders.get(childFD)
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            self._decoders[childFD] = decoder
+        return decoder.decode(data, final)
 
     def childDataReceived(self, childFD: int, data: bytes) -> None:
+        # Multi-byte characters and lines may be split across chunks of
+        # data so decode incrementally and carry any incomplete line over
+        # until the remainder of it has been received.
+        text = self._decode(childFD, data)
         if not self.done.called:
-            self._output.write(data)
-        for line in data.decode("utf-8").strip().split("\n"):
-            if self.stdout_line_collector and childFD == 1:
-                self.stdout_line_collector(line)
-            elif self.stderr_line_collector and childFD == 2:
-                self.stderr_line_collector(line)
-            if not self.done.called:
-                self._check_triggers(line)
+            self._capture(text)
+        lines = (self._partial_lines.pop(childFD, "") + text).split("\n")
+        partial_line = lines.pop()
+        if partial_line:
+            self._partial_lines[childFD] = partial_line
+        for line in lines:
+            self._line_received(childFD, line)
+
+    def childConnectionLost(self, childFD: int) -> None:
+        text = self._decode(childFD, b"", final=True)
+        if text and not self.done.called:
+            self._capture(text)
+        line = self._partial_lines.pop(childFD, "") + text
+        if line:
+            self._line_received(childFD, line)
 
     def when_exited(self) -> Deferred[None]:
         """
@@ -177,8 +316,10 @@ class SubprocessProtocol(ProcessProtocol):
         return d
 
     def processEnded(self, reason: Failure) -> None:
+        for childFD in list(self._partial_lines):
+            self.childConnectionLost(childFD)
         if not self.done.called:
-            output = self._output.getvalue().decode("utf-8").strip()
+            output = self._get_output()
             if isinstance(reason.value, ProcessDone):
                 self.done.callback(output)
             else:
@@ -6,13 +6,14 @@ import os
 import re
 import shutil
 from base64 import urlsafe_b64encode
+from collections import deque
 from pathlib import Path
-from typing import Optional, Union, cast
+from typing import Iterator, Optional, Union, cast
 
 import treq
 import yaml
 from atomicwrites import atomic_write
-from twisted.internet.defer import Deferred
+from twisted.internet.defer import Deferred, DeferredList
 from twisted.internet.error import ConnectError
 from twisted.internet.interfaces import IReactorTime
 
@@ -21,13 +22,14 @@ from gridsync import settings as global_settings
 from gridsync.capabilities import diminish
 from gridsync.config import Config
 from gridsync.crypto import pem_to_der, trunchash
+from gridsync.eliot_store import get_timestamp
 from gridsync.errors import (
     TahoeCommandError,
     TahoePluginError,
     TahoeWebError,
     UpgradeRequiredError,
 )
-from gridsync.log import MultiFileLogger, NullLogger
+from gridsync.log import LOGGING_ELIOT_BUFFER_SIZE, MultiFileLogger, NullLogger
 from gridsync.magic_folder import MagicFolder
 from gridsync.monitor import Monitor
 from gridsync.msg import critical
@@ -154,6 +156,18 @@ class Tahoe:
         else:
             self.logger = NullLogger()
 
+        # Eliot messages are only streamed from the node while they are
+        # wanted -- i.e., while logging is enabled or while something
+        # (like the debug exporter) has subscribed to them -- and the most
+        # recent messages are kept in memory regardless of whether logging
+        # is enabled so that debug exports still include some context.
+        # Note that, with logging disabled, this means that the buffer is
+        # empty until something subscribes: the first export made after
+        # opening the debug exporter includes no eliot messages, and only
+        # those received while it is open are included when it is
+        # reloaded.
+        self.eliot_buffer: deque[str] = deque(maxlen=LOGGING_ELIOT_BUFFER_SIZE)
+        self._eliot_subscribers = 0
         self._ws_reader: Optional[WebSocketReaderService] = None
 
     def _log_stdout_message(self, message: str) -> None:
@@ -163,12 +177,39 @@ class Tahoe:
         self.logger.log("stderr", message)
 
     def _log_eliot_message(self, message: str) -> None:
-        try:
-            message = json.dumps(json.loads(message), sort_keys=True)
-        except json.decoder.JSONDecodeError:
-            log.warning("Error decoding JSON message: %s", message)
-            return
-        self.logger.log("eliot", message, omit_fmt=True)
+        # Messages are stored as-is; they are parsed and canonicalized
+        # only when exported (see `filter.apply_eliot_filters`).
+        self.eliot_buffer.append(message)
+        self.logger.log_eliot(message)
+
+    def subscribe_eliot_log(self) -> None:
+        """
+        Start collecting eliot messages from the node (if they are not
+        being collected already) until a matching call is made to
+        `unsubscribe_eliot_log`.
+        """
+        self._eliot_subscribers += 1
+        self._update_eliot_subscription()
+
+    def unsubscribe_eliot_log(self) -> None:
+        self._eliot_subscribers = max(0, self._eliot_subscribers - 1)
+        self._update_eliot_subscription()
+
+    def _update_eliot_subscription(self) -> None:
+        wanted = self.logger.enabled or self._eliot_subscribers > 0
+        if wanted and self.state == Tahoe.STARTED and not self._ws_reader:
+            log.debug('Subscribing to "%s" eliot log...', self.name)
+            self._ws_reader = WebSocketReaderService(
+                self.nodeurl.replace("http://", "ws://") + "/private/logs/v1",
+                headers={"Authorization": f"tahoe-lafs {self.api_token}"},
+                collector=self._log_eliot_message,
+                reactor=self._reactor,
+            )
+            self._ws_reader.start()
+        elif not wanted and self._ws_reader:
+            log.debug('Unsubscribing from "%s" eliot log...', self.name)
+            self._ws_reader.stop()
+            self._ws_reader = None
 
     def load_newscap(self) -> None:
         news_settings = global_settings.get("news:{}".format(self.name))
@@ -470,15 +511,51 @@ class Tahoe:
             await self.rootcap_manager.lock.acquire()
             self.rootcap_manager.lock.release()
             log.debug("Lock released; resuming stop operation...")
+        # Stop the magic-folder and Tahoe-LAFS processes concurrently so
+        # that one being slow to exit does not delay stopping the other
+        stopping = [self.supervisor.stop()]
         if not self.is_storage_node():
-            await self.magic_folder.stop()
-        await self.supervisor.stop()
+            stopping.append(Deferred.fromCoroutine(self.magic_folder.stop()))
+        await DeferredList(stopping, consumeErrors=True)
         self.state = Tahoe.STOPPED
         log.debug('Finished stopping "%s" tahoe client', self.name)
 
     def get_log(self, name: str) -> str:
         return self.logger.read_log(name)
 
+    def get_eliot_log(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> str:
+        return "\n".join(self.iter_eliot_log(start, end))
+
+    def iter_log(self, name: str) -> Iterator[str]:
+        return self.logger.iter_log(name)
+
+    def iter_eliot_log(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[str]:
+        if self.logger.enabled:
+            return self.logger.iter_eliot_log(start, end)
+        return self._iter_eliot_buffer(start, end)
+
+    def _iter_eliot_buffer(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[str]:
+        # Copy the buffer first; it may be appended to (by the reactor)
+        # while it is being iterated over (e.g., by the LogLoader thread).
+        for message in list(self.eliot_buffer):
+            if start is None and end is None:
+                yield message
+                continue
+            timestamp = get_timestamp(message)
+            if timestamp is None:
+                continue
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                continue
+            yield message
+
     def _on_started(self) -> None:
         self.load_settings()
 
@@ -500,15 +577,8 @@ class Tahoe:
                 encoding="utf-8"
             ).strip()
 
-        self._ws_reader = WebSocketReaderService(
-            self.nodeurl.replace("http://", "ws://") + "/private/logs/v1",
-            headers={"Authorization": f"tahoe-lafs {self.api_token}"},
-            collector=self._log_eliot_message,
-            reactor=self._reactor,
-        )
-        self._ws_reader.start()
-
         self.state = Tahoe.STARTED
+        self._update_eliot_subscription()
 
         if not self.is_storage_node():
             # XXX Should something wait on this?
@@ -538,26 +608,28 @@ class Tahoe:
         shutil.copy2(tahoe_cfg, tahoe_cfg_tmp)
 
         config = Config(tahoe_cfg_tmp)
+        with config.batch():
+            hide_ip = settings.get("hide-ip")
+            if hide_ip:
+                config.set("node", "reveal-ip-address", "false")
 
-        hide_ip = settings.get("hide-ip")
-        if hide_ip:
-            config.set("node", "reveal-ip-address", "false")
+            introducer_furl = settings.get("introducer")
+            if introducer_furl:
+                config.set("client", "introducer.furl", introducer_furl)
 
-        introducer_furl = settings.get("introducer")
-        if introducer_furl:
-            config.set("client", "introducer.furl", introducer_furl)
-
-        shares_needed = settings.get("shares-needed", settings.get("needed"))
-        if shares_needed:
-            config.set("client", "shares.needed", shares_needed)
+            shares_needed = settings.get(
+                "shares-needed", settings.get("needed")
+            )
+            if shares_needed:
+                config.set("client", "shares.needed", shares_needed)
 
-        shares_happy = settings.get("shares-happy", settings.get("happy"))
-        if shares_happy:
-            config.set("client", "shares.happy", shares_happy)
+            shares_happy = settings.get("shares-happy", settings.get("happy"))
+            if shares_happy:
+                config.set("client", "shares.happy", shares_happy)
 
-        shares_total = settings.get("shares-total", settings.get("total"))
-        if shares_total:
-            config.set("client", "shares.total", shares_total)
+            shares_total = settings.get("shares-total", settings.get("total"))
+            if shares_total:
+                config.set("client", "shares.total", shares_total)
 
         servers_yaml = os.path.join(self.nodedir, "private", "servers.yaml")
         servers_yaml_tmp = os.path.join(
@@ -790,6 +862,38 @@ class Tahoe:
             dircap_hash,
         )
 
+    async def link_many(self, dircap: str, children: dict[str, str]) -> None:
+        """
+        Link multiple children into a directory with a single request.
+
+        :param dircap: The capability of the directory to link into.
+        :param children: A mapping of childnames to the capabilities
+            that should be linked beneath them.
+        """
+        if not children:
+            return
+        dircap_hash = trunchash(dircap)
+        log.debug("Linking %i children into %s...", len(children), dircap_hash)
+        body = {}
+        for childname, childcap in children.items():
+            node_type = (
+                "dirnode" if childcap.startswith("URI:DIR") else "filenode"
+            )
+            body[childname] = [
+                node_type,
+                {"rw_uri": childcap, "ro_uri": childcap},
+            ]
+        await self.await_ready()
+        await self._request(
+            "POST",
+            f"/uri/{dircap}/",
+            params={"t": "set_children"},
+            data=json.dumps(body).encode("utf-8"),
+        )
+        log.debug(
+            "Done linking %i children into %s", len(children), dircap_hash
+        )
+
     async def unlink(
         self, dircap: str, childname: str, missing_ok: bool = False
     ) -> None:
@@ -9,6 +9,7 @@ from traceback import format_exception
 from typing import TYPE_CHECKING, Callable, Coroutine, Optional, TypeVar, Union
 
 import attr
+from humanize import naturaldelta, naturalsize
 from twisted.internet.defer import Deferred, ensureDeferred, inlineCallbacks
 from twisted.internet.interfaces import IReactorTime
 from twisted.internet.task import deferLater
@@ -20,6 +21,7 @@ B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
 
 
 if TYPE_CHECKING:
+    from gridsync.magic_folder_events import SyncProgress
     from gridsync.types_ import TwistedDeferred
 
 
@@ -110,6 +112,28 @@ def future_date(days_from_now: int) -> str:
         return "Centuries"
 
 
+def progress_details(progress: SyncProgress) -> str:
+    """
+    Describe the amount synced so far, the rate at which it is being
+    synced, and the estimated time remaining; e.g., "12.3 MB of 40.0 MB
+    (1.2 MB/s, about 23 seconds remaining)".
+    """
+    if progress.bytes_total:
+        details = "{} of {}".format(
+            naturalsize(progress.bytes_done), naturalsize(progress.bytes_total)
+        )
+    else:
+        details = "{} of {} files".format(
+            progress.files_done, progress.files_total
+        )
+    if progress.throughput:
+        rate = "{}/s".format(naturalsize(progress.throughput))
+        if progress.eta is not None:
+            rate += ", about {} remaining".format(naturaldelta(progress.eta))
+        details += " ({})".format(rate)
+    return details
+
+
 class _TagStripper(HTMLParser):  # pylint: disable=abstract-method
     def __init__(self) -> None:
         super().__init__()
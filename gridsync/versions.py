@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+
+from atomicwrites import atomic_write
+
+from gridsync import config_dir
+
+
+class VersionCache:
+    """
+    Remember the versions reported by external executables (such as
+    "tahoe" or "magic-folder") across launches so that they needn't be
+    re-spawned with "--version" every time the application starts.
+
+    Cached versions are keyed by the path of the executable and are only
+    considered valid for as long as the modification time and size of
+    that executable remain unchanged (i.e., they will be refreshed
+    automatically after the executable has been upgraded or replaced).
+    """
+
+    def __init__(self, path: str = "") -> None:
+        if not path:
+            path = os.path.join(config_dir, "versions.json")
+        self.path = path
+        self._entries: Optional[dict] = None
+
+    @staticmethod
+    def _fingerprint(executable: str) -> Optional[list[int]]:
+        try:
+            st = os.stat(executable)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _load(self) -> dict:
+        if self._entries is not None:
+            return self._entries
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            entries = {}
+        except (OSError, ValueError) as e:
+            logging.warning("Error loading version cache: %s", str(e))
+            entries = {}
+        if not isinstance(entries, dict):
+            entries = {}
+        self._entries = entries
+        return entries
+
+    def get(self, executable: str) -> Optional[str]:
+        """
+        Return the cached version of the given executable or None if no
+        valid version has been cached for it.
+        """
+        entry = self._load().get(executable)
+        if not isinstance(entry, dict):
+            return None
+        fingerprint = self._fingerprint(executable)
+        if fingerprint is None or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry.get("version")
+
+    def set(self, executable: str, version: str) -> None:
+        """
+        Cache the version of the given executable.
+        """
+        fingerprint = self._fingerprint(executable)
+        if fingerprint is None:
+            return
+        entries = self._load()
+        entries[executable] = {"fingerprint": fingerprint, "version": version}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with atomic_write(self.path, mode="w", overwrite=True) as f:
+                f.write(json.dumps(entries, sort_keys=True))
+        except OSError as e:
+            logging.warning("Error saving version cache: %s", str(e))
+
+    async def get_version(
+        self, executable: str, probe: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Return the version of the given executable, calling (and caching
+        the result of) `probe` only if no valid cached version exists.
+        """
+        version = self.get(executable)
+        if version is not None:
+            logging.debug(
+                "Using cached version of %s: %s", executable, version
+            )
+            return version
+        version = await probe()
+        self.set(executable, version)
+        return version
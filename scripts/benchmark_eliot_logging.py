@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the per-line cost of handling eliot log messages.
+
+Compares the approach previously used for each line received from a
+magic-folder/Tahoe-LAFS subprocess (parsing the line to detect whether it
+is an eliot message, then parsing and re-serializing it with sorted keys
+before logging it) with the current approach (a cheap check of the line's
+contents, deferring all parsing until the logs are exported), and also
+reports the time taken to export (i.e., filter and canonicalize) the
+resulting log.
+
+Usage: python scripts/benchmark_eliot_logging.py [--lines N] [--runs N]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+
+from gridsync.filter import apply_eliot_filters, is_eliot_log_message
+
+
+def make_lines(count):
+    lines = []
+    for i in range(count):
+        lines.append(
+            json.dumps(
+                {
+                    "task_uuid": str(uuid.uuid4()),
+                    "timestamp": time.time(),
+                    "task_level": [i % 7, 1],
+                    "action_type": "magic-folder:process-item",
+                    "action_status": "started",
+                    "item": {"relpath": f"Documents/file-{i}.txt", "size": i},
+                }
+            )
+        )
+        if i % 10 == 0:
+            lines.append(f"Some non-eliot output on stderr ({i})")
+    return lines
+
+
+def _old_is_eliot_log_message(s):
+    try:
+        data = json.loads(s)
+    except json.decoder.JSONDecodeError:
+        return False
+    return (
+        isinstance(data, dict) and "timestamp" in data and "task_uuid" in data
+    )
+
+
+def receive_old(lines):
+    stored = []
+    for line in lines:
+        if _old_is_eliot_log_message(line):
+            stored.append(json.dumps(json.loads(line), sort_keys=True))
+    return stored
+
+
+def receive_new(lines):
+    stored = []
+    for line in lines:
+        if is_eliot_log_message(line):
+            stored.append(line)
+    return stored
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines)
+    old, new, export = [], [], []
+    for _ in range(args.runs):
+        elapsed, _ = timed(receive_old, lines)
+        old.append(elapsed)
+        elapsed, stored = timed(receive_new, lines)
+        new.append(elapsed)
+        elapsed, _ = timed(apply_eliot_filters, "\n".join(stored), "1")
+        export.append(elapsed)
+
+    def per_line(timings):
+        return statistics.median(timings) / len(lines) * 1_000_000
+
+    print(f"{len(lines)} lines, median of {args.runs} runs:")
+    print(f"  Receive (before): {per_line(old):8.3f} us/line")
+    print(f"  Receive (after):  {per_line(new):8.3f} us/line")
+    print(f"  Export:           {per_line(export):8.3f} us/line")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
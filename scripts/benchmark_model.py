@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the time taken by the folder Model's slots to handle updates.
+
+Populates a Model with several hundred folders and then fires a series of
+sync progress (and size and modification time) updates at randomly
+chosen folders, comparing the current approach (looking up each folder's
+row via a persistent index) with the previous one (searching through
+every row of the model with `findItems`).
+
+Usage: python scripts/benchmark_model.py [--folders N] [--updates N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from unittest.mock import MagicMock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position
+from qtpy.QtWidgets import QApplication, QTreeView
+
+from gridsync.gui.model import Model
+
+
+class FakeView(QTreeView):
+    def __init__(self):
+        super().__init__()
+        self.gui = MagicMock()
+        self.gateway = MagicMock()
+        self.gateway.name = "TestGrid"
+        self.gateway.magic_folder.get_directory = lambda _: None
+
+    def on_right_click(self):
+        pass
+
+    def hide_drop_label(self):
+        pass
+
+
+class LinearModel(Model):
+    def _folder_row(self, folder_name):
+        items = self.findItems(folder_name)
+        return items[0].row() if items else None
+
+
+def make_model(cls, folders):
+    model = cls(FakeView())
+    # The systray is not what is being measured here.
+    model.gui.systray = MagicMock()
+    for i in range(folders):
+        model.add_folder(f"Folder {i}")
+    return model
+
+
+def fire_updates(model, names, updates):
+    start = time.perf_counter()
+    for i in range(updates):
+        name = names[i % len(names)]
+        model.set_transfer_progress(name, i % 99 + 1, 100)
+        if i % 10 == 0:
+            model.set_size(name, i)
+            model.set_mtime(name, 1_600_000_000 + i)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--folders", type=int, default=300)
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+    rng = random.Random(0)
+    names = [f"Folder {rng.randrange(args.folders)}" for _ in range(1000)]
+    results = {}
+    for label, cls in (("findItems", LinearModel), ("index", Model)):
+        model = make_model(cls, args.folders)
+        results[label] = statistics.median(
+            fire_updates(model, names, args.updates) for _ in range(args.runs)
+        )
+
+    print(
+        f"{args.folders} folders, {args.updates} progress updates, "
+        f"median of {args.runs} runs:"
+    )
+    for label, elapsed in results.items():
+        per_update = elapsed / args.updates * 1_000_000
+        print(f"  {label:10} {elapsed:8.3f} s ({per_update:8.2f} us/update)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
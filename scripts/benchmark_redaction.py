@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the time taken to redact a large log with `filter.apply_filters`.
+
+The previous implementation, which made one `str.replace` pass over the
+entire log per filter, is compared against the current one, which makes
+a single pass using a (trie-structured) regular expression compiled from
+all of the filters. A synthetic log is used; its size and the number of
+filters can be adjusted.
+
+Usage: python scripts/benchmark_redaction.py [--mb N] [--filters N]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+
+from gridsync.filter import apply_filters
+
+
+def random_string(length):
+    return "".join(random.choices(string.ascii_letters + "/:-_", k=length))
+
+
+def make_filters(count):
+    filters = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            s = f"/home/user/{random_string(20)}"
+        elif kind == 1:
+            s = f"URI:DIR2:{random_string(26)}:{random_string(52)}"
+        else:
+            s = random_string(8)
+        filters.append((s, f"Filter:{i}"))
+    filters.append(("/home/user", "HomeDir"))
+    return filters
+
+
+def make_log(size, filters):
+    lines = []
+    length = 0
+    while length < size:
+        line = (
+            "2021-01-01T00:00:00.000000+00:00 DEBUG on_stdout_line_received "
+            + random_string(40)
+        )
+        if random.random() < 0.1:
+            line += " " + random.choice(filters)[0]
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def apply_filters_sequentially(in_str, filters):
+    filtered = in_str
+    for s, mask in filters:
+        if s and mask:
+            filtered = filtered.replace(s, "<Filtered:{}>".format(mask))
+    return filtered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--mb", type=float, default=10)
+    parser.add_argument("--filters", type=int, default=100)
+    args = parser.parse_args()
+
+    random.seed(0)
+    filters = make_filters(args.filters)
+    log = make_log(int(args.mb * 1_000_000), filters)
+    print(f"{len(log) / 1_000_000:.1f} MB log, {len(filters)} filters:")
+
+    start = time.perf_counter()
+    before = apply_filters_sequentially(log, filters)
+    print(f"  Sequential str.replace: {time.perf_counter() - start:.3f} s")
+
+    start = time.perf_counter()
+    after = apply_filters(log, filters)
+    print(
+        f"  Single-pass (incl. compile): {time.perf_counter() - start:.3f} s"
+    )
+
+    if before != after:
+        print("WARNING: The outputs differ")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Measure how long it takes for Gridsync to start.
+
+This reports two metrics (each as the median of several runs):
+
+* The cumulative time spent importing ``gridsync.gui`` (as reported by
+  ``python -X importtime``), along with the slowest individual imports.
+* The "time-to-systray"; i.e., the time between the creation of the
+  Python process and the system tray icon being shown.
+
+Additionally, it verifies that modules which are only needed on demand
+(e.g., QtCharts, magic-wormhole, zxcvbn) are *not* imported at startup
+and exits with a non-zero status if any of them are.
+
+Usage: python scripts/benchmark_startup.py [--runs N] [--top N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Modules that should only be loaded lazily, on first use.
+LAZY_MODULES = [
+    "distro",
+    "gridsync.gui.charts",
+    "gridsync.gui.debug",
+    "gridsync.gui.usage",
+    "gridsync.wormhole_",
+    "mnemonic",
+    "qtpy.QtCharts",
+    "segno",
+    "wormhole",
+    "zxcvbn",
+]
+
+SYSTRAY_SNIPPET = """\
+import argparse
+import time
+
+from psutil import Process
+
+from gridsync.core import Core
+
+core = Core(argparse.Namespace(debug=False))
+core.gui.show_systray()
+print(time.time() - Process().create_time())
+"""
+
+
+def _environ(logging_path):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["GRIDSYNC_LOGGING_PATH"] = logging_path
+    return env
+
+
+def measure_imports(env):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import gridsync.gui"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = [
+            s.strip() for s in line.replace("import time:", "|").split("|")
+        ]
+        if self_us.isdigit():
+            modules[name] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_systray(env):
+    result = subprocess.run(
+        [sys.executable, "-c", SYSTRAY_SNIPPET],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as logging_path:
+        env = _environ(logging_path)
+        import_runs = [measure_imports(env) for _ in range(args.runs)]
+        systray_runs = [measure_systray(env) for _ in range(args.runs)]
+
+    totals = [run["gridsync.gui"][1] / 1000 for run in import_runs]
+    print(f"import gridsync.gui: {statistics.median(totals):.1f} ms (median)")
+    print("Slowest imports (self time, last run):")
+    slowest = sorted(
+        import_runs[-1].items(), key=lambda item: item[1][0], reverse=True
+    )
+    for name, (self_us, cumulative_us) in slowest[: args.top]:
+        print(
+            f"  {self_us / 1000:8.1f} ms {cumulative_us / 1000:8.1f} ms  {name}"
+        )
+    print(
+        f"Time-to-systray: {statistics.median(systray_runs) * 1000:.1f} ms "
+        "(median)"
+    )
+
+    eagerly_imported = sorted(set(LAZY_MODULES) & set(import_runs[-1]))
+    if eagerly_imported:
+        print(
+            "ERROR: The following modules should be imported lazily but "
+            f"were imported at startup: {', '.join(eagerly_imported)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ from unittest.mock import Mock
 import pytest
 from qtpy.QtCore import Qt
 
-from gridsync.gui.debug import DebugExporter, LogLoader, system
+from gridsync.gui.debug import DebugExporter, LogLoader, _since, system
 
 
 def test_system_module_variable_is_not_none():
@@ -21,8 +21,21 @@ def core():
     fake_gateway.newscap = "URI:NEWSCAP"
     fake_gateway.magic_folder = Mock()
     fake_gateway.magic_folder.get_log = Mock(return_value='{"test": 123}')
+    fake_gateway.magic_folder.iter_log = Mock(return_value=["test 123"])
+    fake_gateway.magic_folder.iter_eliot_log = Mock(
+        return_value=['{"test": 123}']
+    )
     fake_gateway.magic_folder.magic_folders = {}
     fake_gateway.get_log = Mock(return_value='{"test": 123}')
+    fake_gateway.iter_log = Mock(return_value=["test 123"])
+    fake_gateway.supervisor.metrics = Mock(return_value={"restart_count": 0})
+    fake_gateway.magic_folder.supervisor.metrics = Mock(
+        return_value={"restart_count": 0}
+    )
+    fake_gateway.magic_folder.events.metrics.to_dict = Mock(
+        return_value={"folders": {}, "gateway": {}}
+    )
+    fake_gateway.iter_eliot_log = Mock(return_value=['{"test": 123}'])
     fake_gateway.get_settings = Mock(return_value={})
     fake_core.gateways = [fake_gateway]
     fake_core.gui.main_window.gateways = fake_core.gateways
@@ -41,6 +54,81 @@ def test_log_loader_load_filtered_content(core):
     assert core.gateways[0].name not in log_loader.filtered_content
 
 
+def test_log_loader_load_max_lines(core):
+    core.gateways[0].iter_log = Mock(
+        return_value=[f"line {i}\n" for i in range(100)]
+    )
+    log_loader = LogLoader(core, max_lines=2)
+    log_loader.load()
+    assert "line 97" not in log_loader.content
+    assert "line 98\nline 99\n" in log_loader.content
+
+
+def test_log_loader_load_filters_in_chunks(core):
+    core.gateways[0].iter_log = Mock(
+        return_value=[f"TestGridOne {i}\n" for i in range(10)]
+    )
+    log_loader = LogLoader(core, chunk_size=3)
+    log_loader.load()
+    assert "<Filtered:GatewayName:1> 9" in log_loader.filtered_content
+    assert "TestGridOne" not in log_loader.filtered_content
+
+
+def test_log_loader_load_passes_time_window_to_eliot_log(core):
+    log_loader = LogLoader(core, since=60)
+    log_loader.load()
+    assert "start" in core.gateways[0].iter_eliot_log.call_args[1]
+
+
+def test_log_loader_load_includes_process_metrics(core):
+    core.gateways[0].supervisor.metrics.return_value = {"restart_count": 3}
+    log_loader = LogLoader(core)
+    log_loader.load()
+    assert "Tahoe-LAFS process metrics" in log_loader.content
+    assert '"restart_count": 3' in log_loader.content
+
+
+def test_log_loader_load_includes_sync_metrics(core):
+    core.gateways[0].magic_folder.events.metrics.to_dict.return_value = {
+        "gateway": {"upload": {"files": 42}}
+    }
+    log_loader = LogLoader(core)
+    log_loader.load()
+    assert "TestGridOne sync metrics" in log_loader.content
+    assert '"files": 42' in log_loader.content
+
+
+def test_log_loader_load_uses_snapshot(core):
+    log_loader = LogLoader(core)
+    log_loader.take_snapshot()
+    core.gateways[0].supervisor.metrics.return_value = {"restart_count": 3}
+    log_loader.load()
+    assert '"restart_count": 3' not in log_loader.content
+
+
+def test_log_loader_load_takes_snapshot_only_once(core):
+    log_loader = LogLoader(core)
+    log_loader.take_snapshot()
+    log_loader.load()
+    assert core.gateways[0].supervisor.metrics.call_count == 1
+
+
+def test_log_loader_load_emits_progress(core, qtbot):
+    log_loader = LogLoader(core)
+    with qtbot.wait_signals([log_loader.progress] * 2):
+        log_loader.load()
+
+
+def test_since_includes_continuation_lines():
+    lines = [
+        "2000-01-01T00:00:00+00:00 DEBUG old\n",
+        "Traceback (old)\n",
+        "2100-01-01T00:00:00+00:00 DEBUG new\n",
+        "Traceback (new)\n",
+    ]
+    assert list(_since(lines, 946684800 + 1)) == lines[2:]
+
+
 @pytest.mark.parametrize(
     "checkbox_state, expected_content",
     [
@@ -94,6 +182,22 @@ def test_debug_exporter_load_filtered_content(core, qtbot):
     assert core.gateways[0].name not in de.plaintextedit.toPlainText()
 
 
+def test_debug_exporter_subscribes_to_eliot_logs_while_shown(core, qtbot):
+    de = DebugExporter(core)
+    qtbot.add_widget(de)
+    de.show()
+    de.show()
+    assert core.gateways[0].subscribe_eliot_log.call_count == 1
+
+
+def test_debug_exporter_unsubscribes_from_eliot_logs_when_hidden(core, qtbot):
+    de = DebugExporter(core)
+    qtbot.add_widget(de)
+    de.show()
+    de.hide()
+    assert core.gateways[0].unsubscribe_eliot_log.call_count == 1
+
+
 def test_debug_exporter_load_return_early_thread_running(core, qtbot):
     de = DebugExporter(core)
     de.log_loader_thread = Mock()
@@ -103,6 +207,65 @@ def test_debug_exporter_load_return_early_thread_running(core, qtbot):
     assert de.log_loader_thread.start.call_count == 0
 
 
+def test_debug_exporter_range_defaults_to_entire_logs():
+    de = DebugExporter(None)
+    assert de.range_combo_box.currentData() == (None, None)
+
+
+def test_debug_exporter_range_selects_matching_preset():
+    de = DebugExporter(None, max_lines=10_000)
+    assert de.range_combo_box.currentText().startswith("Last 10,000 lines")
+
+
+def test_debug_exporter_range_adds_custom_item():
+    de = DebugExporter(None, max_lines=5, since=60)
+    assert de.range_combo_box.currentText() == "Custom"
+    assert de.range_combo_box.currentData() == (5, 60)
+
+
+def test_debug_exporter_load_applies_selected_range(core, qtbot):
+    de = DebugExporter(core)
+    de.range_combo_box.blockSignals(True)
+    de.range_combo_box.setCurrentIndex(1)  # "Last hour"
+    de.range_combo_box.blockSignals(False)
+    with qtbot.wait_signal(de.log_loader.done):
+        de.load()
+    assert (de.log_loader.max_lines, de.log_loader.since) == (None, 60 * 60)
+
+
+def test_debug_exporter_range_changed_while_loading_reloads(core, qtbot):
+    de = DebugExporter(core)
+    de.log_loader_thread = Mock()
+    de.log_loader_thread.isRunning.return_value = True
+    de.range_combo_box.setCurrentIndex(1)
+    assert de._reload_pending
+    de.log_loader_thread.isRunning.return_value = False
+    de.on_loaded()
+    assert de.log_loader_thread.start.call_count == 1
+    assert de.log_loader.since == 60 * 60
+
+
+def test_debug_exporter_load_takes_snapshot_before_starting_thread(core):
+    calls = []
+    de = DebugExporter(core)
+    de.log_loader_thread = Mock()
+    de.log_loader_thread.isRunning.return_value = False
+    de.log_loader_thread.start.side_effect = lambda: calls.append("start")
+    de.log_loader.take_snapshot = Mock(
+        side_effect=lambda: calls.append("snapshot")
+    )
+    de.load()
+    assert calls == ["snapshot", "start"]
+
+
+def test_debug_exporter_shows_content_chunks():
+    de = DebugExporter(None)
+    de.log_loader.content_chunks = ["one\n", "two\n"]
+    de.checkbox.setCheckState(Qt.Unchecked)
+    de.on_checkbox_state_changed(Qt.Unchecked)
+    assert de.plaintextedit.toPlainText() == "one\ntwo\n"
+
+
 def test_debug_exporter_copy_to_clipboard(monkeypatch):
     de = DebugExporter(None)
     de.plaintextedit.setPlainText("TESTING123")
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+
+import pytest
+
+from gridsync.gui.debug import DebugExporter
+
+
+def test_gui_debug_exporter_is_constructed_on_first_use(gui):
+    assert gui._debug_exporter is None
+    assert isinstance(gui.debug_exporter, DebugExporter)
+
+
+def test_gui_debug_exporter_is_constructed_only_once(gui):
+    assert gui.debug_exporter is gui.debug_exporter
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "gridsync.gui.charts",
+        "gridsync.gui.debug",
+        "gridsync.gui.phrase",
+        "gridsync.wormhole_",
+        "segno",
+        "wormhole",
+        "zxcvbn",
+    ],
+)
+def test_importing_gui_does_not_import_lazily_loaded_module(module):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, gridsync.gui; print({module!r} in sys.modules)",
+        ],
+        env=env,
+        text=True,
+    )
+    assert output.strip() == "False"
@@ -3,105 +3,356 @@ import shutil
 from unittest.mock import Mock, call
 
 import pytest
+from qtpy.QtCore import QPoint, Qt
+from qtpy.QtGui import QIcon, QPixmap
+from twisted.internet.task import Clock
 
 from gridsync.gui.history import (
-    HistoryItemWidget,
+    HistoryItem,
     HistoryListWidget,
+    HistoryModel,
     HistoryView,
 )
+from gridsync.gui.thumbnails import ThumbnailLoader
+from gridsync.history_journal import HistoryJournal
+
+
+def test_history_item_basename():
+    item = HistoryItem("Added", os.path.join("a", "b", "c.txt"), 123456789)
+    assert item.basename == "c.txt"
+
+
+def test_history_item_basename_is_resolved_once(monkeypatch):
+    item = HistoryItem("Added", os.path.join("a", "b", "c.txt"), 123456789)
+    fake_resolve = Mock(side_effect=AssertionError("resolved again"))
+    monkeypatch.setattr("gridsync.gui.history.Path.resolve", fake_resolve)
+    assert item.basename == "c.txt"
+
+
+def test_history_item_details():
+    item = HistoryItem("added", "c.txt", 0)
+    assert item.details.startswith("Added ")
 
 
 @pytest.fixture(scope="function")
-def hiw(tmpdir_factory):
-    src = os.path.join(os.getcwd(), "gridsync", "resources", "pixel.png")
-    dst = str(tmpdir_factory.mktemp("test-magic-folder"))
-    shutil.copy(src, dst)
-    gateway = Mock()
-    gateway.magic_folder.get_directory.return_value = dst
-    return HistoryItemWidget(
-        "Added", "pixel.png", 123456789, HistoryListWidget(gateway)
+def thumbnail_loader(tmp_path):
+    loader = ThumbnailLoader(tmp_path / "thumbnails")
+    yield loader
+    loader.wait()
+
+
+@pytest.fixture(scope="function")
+def model(thumbnail_loader):
+    return HistoryModel(thumbnail_loader=thumbnail_loader)
+
+
+def test_history_model_add_item(model):
+    model.add_item("Added", "a.txt", 1)
+    assert model.rowCount() == 1
+
+
+def test_history_model_add_item_newest_on_top(model):
+    model.add_item("Added", "a.txt", 2)
+    model.add_item("Added", "b.txt", 3)
+    model.add_item("Added", "c.txt", 1)
+    assert [model.item(i).path for i in range(3)] == [
+        "b.txt",
+        "a.txt",
+        "c.txt",
+    ]
+
+
+def test_history_model_add_item_same_mtime_most_recently_added_on_top(model):
+    model.add_item("Added", "a.txt", 1)
+    model.add_item("Added", "b.txt", 1)
+    assert model.item(0).path == "b.txt"
+
+
+def test_history_model_add_item_deduplicate(model):
+    model.add_item("Added", "a.txt", 1)
+    model.add_item("Added", "b.txt", 2)
+    model.add_item("Updated", "a.txt", 3)
+    assert (model.rowCount(), model.item(0).action) == (2, "Updated")
+
+
+def test_history_model_add_item_no_deduplicate(thumbnail_loader):
+    model = HistoryModel(deduplicate=False, thumbnail_loader=thumbnail_loader)
+    model.add_item("Added", "a.txt", 1)
+    model.add_item("Updated", "a.txt", 2)
+    assert model.rowCount() == 2
+
+
+def test_history_model_row(model):
+    for i in range(10):
+        model.add_item("Added", f"{i}.txt", i % 3)
+    assert all(
+        model.item(model.row(f"{i}.txt")).path == f"{i}.txt" for i in range(10)
     )
 
 
-def test_history_item_widget_init(hiw):
-    assert hiw
+def test_history_model_row_unknown_path(model):
+    assert model.row("unknown.txt") is None
 
 
-def test_history_item_widget__do_load_thumbnail(hiw):
-    hiw._do_load_thumbnail()
-    assert hiw.icon.pixmap() is not None
+def test_history_model_max_items_removes_oldest(thumbnail_loader):
+    model = HistoryModel(max_items=2, thumbnail_loader=thumbnail_loader)
+    model.add_item("Added", "a.txt", 1)
+    model.add_item("Added", "b.txt", 2)
+    model.add_item("Added", "c.txt", 3)
+    assert (model.rowCount(), model.row("a.txt")) == (2, None)
 
 
-def test_history_item_widget_load_thumbnail(hiw, monkeypatch):
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryItemWidget.isVisible", lambda _: True
+def test_history_model_max_items_ignores_older_items(thumbnail_loader):
+    model = HistoryModel(max_items=2, thumbnail_loader=thumbnail_loader)
+    model.add_item("Added", "a.txt", 2)
+    model.add_item("Added", "b.txt", 3)
+    model.add_item("Added", "c.txt", 1)
+    assert model.row("c.txt") is None
+
+
+def test_history_model_data_display_role(model):
+    model.add_item("Added", os.path.join("a", "b.txt"), 1)
+    assert model.data(model.index(0), Qt.DisplayRole) == "b.txt"
+
+
+def test_history_model_data_tooltip_role(model):
+    model.add_item("Added", "b.txt", 1)
+    assert model.data(model.index(0), Qt.ToolTipRole).startswith("b.txt")
+
+
+def test_history_model_data_decoration_role_icon(model):
+    model.add_item("Added", "b.txt", 1)
+    assert isinstance(model.data(model.index(0), Qt.DecorationRole), QIcon)
+
+
+def test_history_model_data_invalid_index(model):
+    assert model.data(model.index(0), Qt.DisplayRole) is None
+
+
+@pytest.fixture(scope="function")
+def journal(tmp_path):
+    journal = HistoryJournal(tmp_path / "history.sqlite", reactor=Clock())
+    for i in range(5):
+        journal.record("TestFolder", "Uploaded", f"{i}.txt", i)
+    yield journal
+    journal.close()
+
+
+@pytest.fixture(scope="function")
+def journal_model(journal, thumbnail_loader):
+    return HistoryModel(
+        thumbnail_loader=thumbnail_loader, journal=journal, page_size=2
     )
-    hiw.load_thumbnail()
-    assert hiw._thumbnail_loaded is True
 
 
-def test_history_item_widget_unhilight(hiw):
-    hiw.button.show()
-    hiw.unhighlight()
-    assert hiw.button.isHidden()
+def test_history_model_can_fetch_more_without_journal(model):
+    assert not model.canFetchMore()
 
 
-def test_history_item_widget_enter_event(hiw):
-    hiw.enterEvent(None)
-    assert hiw.parent().highlighted == hiw
+def test_history_model_fetch_more_reads_a_page(journal_model):
+    journal_model.fetchMore()
+    assert [journal_model.item(i).path for i in range(2)] == [
+        os.path.join("TestFolder", "4.txt"),
+        os.path.join("TestFolder", "3.txt"),
+    ]
 
 
-def test_history_item_widget_enter_event_call_unhighlight(hiw):
-    m = Mock()
-    hiw.parent().highlighted = m
-    hiw.enterEvent(None)
-    assert m.method_calls == [call.unhighlight()]
+def test_history_model_fetch_more_until_exhausted(journal_model):
+    while journal_model.canFetchMore():
+        journal_model.fetchMore()
+    assert journal_model.rowCount() == 5
+
+
+def test_history_model_fetch_more_skips_items_added_live(journal_model):
+    journal_model.add_item("Uploaded", os.path.join("TestFolder", "4.txt"), 4)
+    while journal_model.canFetchMore():
+        journal_model.fetchMore()
+    assert journal_model.rowCount() == 5
+
+
+def test_history_model_fetch_more_does_not_replace_newer_items(
+    journal_model,
+):
+    journal_model.add_item("Updated", os.path.join("TestFolder", "0.txt"), 9)
+    journal_model.fetchMore()
+    journal_model.fetchMore()
+    journal_model.fetchMore()
+    assert (journal_model.rowCount(), journal_model.item(0).action) == (
+        5,
+        "Updated",
+    )
+
+
+def test_history_model_fetch_more_stops_at_max_items(
+    journal, thumbnail_loader
+):
+    model = HistoryModel(
+        max_items=2, thumbnail_loader=thumbnail_loader, journal=journal
+    )
+    model.fetchMore()
+    assert (model.rowCount(), model.canFetchMore()) == (2, False)
 
 
-def test_history_item_widget_enter_event_pass_runtime_error(hiw):
-    hiw.parent().highlighted = Mock()
-    hiw.parent().highlighted.unhighlight = Mock(side_effect=RuntimeError)
-    hiw.enterEvent(None)
-    assert hiw.parent().highlighted == hiw
+def test_history_model_fetch_more_defers_unresolved_entries(
+    journal, thumbnail_loader
+):
+    journal.record("Other", "Uploaded", "other.txt", 10)
+    model = HistoryModel(
+        thumbnail_loader=thumbnail_loader,
+        journal=journal,
+        resolve_path=lambda f, p: None if f == "Other" else os.path.join(f, p),
+    )
+    model.fetchMore()
+    assert model.rowCount() == 5
+    model.resolve_path = lambda f, p: os.path.join(f, p)
+    model.resolve_deferred("Other")
+    assert model.item(0).path == os.path.join("Other", "other.txt")
+
+
+def test_history_model_fetch_more_reads_past_unresolved_pages(
+    journal, thumbnail_loader
+):
+    for i in range(5, 10):
+        journal.record("Other", "Uploaded", f"{i}.txt", i)
+    model = HistoryModel(
+        thumbnail_loader=thumbnail_loader,
+        journal=journal,
+        resolve_path=lambda f, p: None if f == "Other" else os.path.join(f, p),
+        page_size=2,
+    )
+    model.fetchMore()
+    assert model.rowCount() > 0
+
+
+def test_history_model_forget_deferred(journal, thumbnail_loader):
+    model = HistoryModel(
+        thumbnail_loader=thumbnail_loader,
+        journal=journal,
+        resolve_path=lambda f, p: None,
+    )
+    model.fetchMore()
+    model.forget_deferred("TestFolder")
+    model.resolve_path = lambda f, p: os.path.join(f, p)
+    model.resolve_deferred("TestFolder")
+    assert model.rowCount() == 0
+
+
+def test_history_list_widget_adds_deferred_history_when_folder_added(
+    journal, thumbnail_loader, qtbot
+):
+    directories = {}
+    gateway = Mock()
+    gateway.magic_folder.get_directory = lambda f: directories.get(f, "")
+    hlw = HistoryListWidget(
+        gateway, thumbnail_loader=thumbnail_loader, journal=journal
+    )
+    qtbot.add_widget(hlw)
+    hlw.history_model.fetchMore()
+    assert hlw.count() == 0
+    directories["TestFolder"] = "TestFolder"
+    hlw.history_model.resolve_deferred("TestFolder")
+    assert hlw.count() == 5
+
+
+def test_history_list_widget_add_item_ignores_unknown_folder(
+    thumbnail_loader, qtbot
+):
+    gateway = Mock()
+    gateway.magic_folder.get_directory.return_value = ""
+    hlw = HistoryListWidget(gateway, thumbnail_loader=thumbnail_loader)
+    qtbot.add_widget(hlw)
+    hlw.add_item("Unknown", "Uploaded", "file.txt", 1)
+    assert hlw.count() == 0
+
+
+def test_history_list_widget_fetches_history_when_shown(
+    journal, thumbnail_loader, qtbot
+):
+    gateway = Mock()
+    gateway.magic_folder.get_directory.return_value = "TestFolder"
+    hlw = HistoryListWidget(
+        gateway, thumbnail_loader=thumbnail_loader, journal=journal
+    )
+    qtbot.add_widget(hlw)
+    hlw.show()
+    qtbot.wait_until(lambda: hlw.count() == 5)
+
+
+@pytest.fixture(scope="function")
+def image_path(tmpdir_factory):
+    src = os.path.join(os.getcwd(), "gridsync", "resources", "pixel.png")
+    dst = str(tmpdir_factory.mktemp("test-magic-folder"))
+    shutil.copy(src, dst)
+    return os.path.join(dst, "pixel.png")
+
+
+def test_history_model_load_thumbnail(model, image_path, qtbot):
+    model.add_item("Added", image_path, 1)
+    with qtbot.wait_signal(model.dataChanged):
+        model.load_thumbnail(0)
+    thumbnail = model.data(model.index(0), Qt.DecorationRole)
+    assert isinstance(thumbnail, QPixmap)
+    assert (thumbnail.width(), thumbnail.height()) == (48, 48)
+
+
+def test_history_model_load_thumbnail_only_once(model, image_path, qtbot):
+    model.add_item("Added", image_path, 1)
+    with qtbot.wait_signal(model.dataChanged):
+        model.load_thumbnail(0)
+    with qtbot.assert_not_emitted(model.dataChanged, wait=100):
+        model.load_thumbnail(0)
+
+
+def test_history_model_cancel_thumbnails(model, image_path, monkeypatch):
+    cancel = Mock()
+    monkeypatch.setattr(model.thumbnail_loader, "cancel", cancel)
+    model.add_item("Added", image_path, 1)
+    model.load_thumbnail(0)
+    model.cancel_thumbnails()
+    assert (cancel.mock_calls, model.item(0).thumbnail_requested) == (
+        [call(image_path)],
+        False,
+    )
+
+
+def test_history_model_cancel_thumbnails_keep(model, image_path, monkeypatch):
+    cancel = Mock()
+    monkeypatch.setattr(model.thumbnail_loader, "cancel", cancel)
+    model.add_item("Added", image_path, 1)
+    model.load_thumbnail(0)
+    model.cancel_thumbnails(keep={image_path})
+    assert cancel.mock_calls == []
+
+
+def test_history_model_ignores_thumbnails_requested_by_others(
+    model, image_path, qtbot
+):
+    model.add_item("Added", image_path, 1)
+    with qtbot.assert_not_emitted(model.dataChanged, wait=100):
+        model.thumbnail_loader.request(image_path)
 
 
 @pytest.fixture(scope="function")
-def hlw(tmpdir_factory):
+def hlw(tmpdir_factory, thumbnail_loader):
     directory = str(tmpdir_factory.mktemp("test-magic-folder"))
     gateway = Mock()
     gateway.magic_folder.get_directory.return_value = directory
-    return HistoryListWidget(gateway)
+    return HistoryListWidget(gateway, thumbnail_loader=thumbnail_loader)
 
 
 def test_history_list_widget_on_double_click(hlw, monkeypatch):
     m = Mock()
     monkeypatch.setattr("gridsync.gui.history.open_enclosing_folder", m)
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemWidget",
-        Mock(
-            return_value=HistoryItemWidget(
-                "Added", "pixel.png", 123456789, hlw
-            )
-        ),
-    )
-    hlw.on_double_click(None)
+    hlw.add_item("TestFolder", "Added", "pixel.png", 123456789)
+    hlw.on_double_click(hlw.model().index(0))
     assert m.mock_calls
 
 
 def test_history_list_widget_on_right_click(hlw, monkeypatch):
+    hlw.add_item("TestFolder", "Added", "pixel.png", 123456789)
     monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemAt", Mock()
-    )
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemWidget",
-        Mock(
-            return_value=HistoryItemWidget(
-                "Added", "pixel.png", 123456789, hlw
-            )
-        ),
-    )
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.viewport", Mock()
+        "gridsync.gui.history.HistoryListWidget.indexAt",
+        lambda self, _: self.model().index(0),
     )
     m = Mock()
     monkeypatch.setattr("gridsync.gui.history.QMenu", m)
@@ -110,15 +361,24 @@ def test_history_list_widget_on_right_click(hlw, monkeypatch):
 
 
 def test_history_list_widget_on_right_click_no_item_return(hlw, monkeypatch):
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.itemAt", lambda x, y: None
-    )
     m = Mock()
     monkeypatch.setattr("gridsync.gui.history.QMenu", m)
-    hlw.on_right_click(None)
+    hlw.on_right_click(QPoint(1, 1))
     assert m.mock_calls == []
 
 
+def test_history_list_widget_action_button_opens_menu(hlw, monkeypatch):
+    m = Mock()
+    monkeypatch.setattr(
+        "gridsync.gui.history.HistoryListWidget.on_right_click", m
+    )
+    hlw = HistoryListWidget(
+        hlw.gateway, thumbnail_loader=hlw.history_model.thumbnail_loader
+    )
+    hlw.delegate.action_button_clicked.emit(QPoint(1, 1))
+    assert m.mock_calls == [call(QPoint(1, 1))]
+
+
 def test_history_list_widget_add_item(hlw):
     hlw.add_item("TestFolder", "Added", "pixel.png", 123456789)
     assert hlw.count() == 1
@@ -130,25 +390,36 @@ def test_history_list_widget_add_item_deduplicate(hlw):
     assert hlw.count() == 1
 
 
-def test_history_list_widget_update_visible_widgets(hlw, monkeypatch):
+def test_history_list_widget_holds_more_than_one_screenful(hlw):
+    for i in range(1000):
+        hlw.add_item("TestFolder", "Added", f"{i}.txt", i)
+    assert hlw.count() == 1000
+
+
+def test_history_list_widget_paints_items(hlw, qtbot):
+    qtbot.add_widget(hlw)
     hlw.add_item("TestFolder", "Added", "pixel.png", 99999)
+    hlw.resize(300, 300)
+    hlw.show()
+    assert not hlw.grab().isNull()
+
+
+def test_history_list_widget_update_visible_widgets(hlw, qtbot, monkeypatch):
+    qtbot.add_widget(hlw)
+    for i in range(100):
+        hlw.add_item("TestFolder", "Added", f"{i}.png", i)
+    hlw.resize(300, 300)
+    hlw.show()
     m = Mock()
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryItemWidget.update_text", m
-    )
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryListWidget.isVisible", lambda _: True
-    )
+    monkeypatch.setattr("gridsync.gui.history.HistoryModel.load_thumbnail", m)
     hlw.update_visible_widgets()
-    assert m.mock_calls == [call()]
+    assert 0 < len(m.mock_calls) < 100
 
 
 def test_history_list_widget_update_visible_widgets_return(hlw, monkeypatch):
     hlw.add_item("TestFolder", "Added", "pixel.png", 99999)
     m = Mock()
-    monkeypatch.setattr(
-        "gridsync.gui.history.HistoryItemWidget.update_text", m
-    )
+    monkeypatch.setattr("gridsync.gui.history.HistoryModel.load_thumbnail", m)
     monkeypatch.setattr(
         "gridsync.gui.history.HistoryListWidget.isVisible", lambda _: False
     )
@@ -167,6 +438,22 @@ def test_history_list_widget_update_visible_widgets_on_show_event(
     assert m.mock_calls == [call()]
 
 
+def test_history_list_widget_update_relative_times_returns_newest_visible(
+    hlw, qtbot
+):
+    qtbot.add_widget(hlw)
+    for i in range(100):
+        hlw.add_item("TestFolder", "Added", f"{i}.txt", i)
+    hlw.resize(300, 300)
+    hlw.show()
+    hlw.scrollToBottom()
+    assert hlw.update_relative_times() < 99
+
+
+def test_history_list_widget_update_relative_times_empty(hlw):
+    assert hlw.update_relative_times() is None
+
+
 def test_history_view_init():
     mock_gateway = Mock()
     mock_gateway.shares_happy = 1
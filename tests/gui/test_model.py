@@ -0,0 +1,123 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from qtpy.QtCore import QSize, Qt
+from qtpy.QtWidgets import QTreeView
+
+from gridsync.gui.model import Model, _folder_icons
+from gridsync.magic_folder import MagicFolderStatus
+from gridsync.magic_folder_events import SyncProgress
+
+
+class FakeView(QTreeView):
+    def __init__(self) -> None:
+        super().__init__()
+        self.gui = MagicMock()
+        self.gateway = MagicMock()
+        self.gateway.name = "TestGrid"
+        self.gateway.magic_folder.get_directory = Mock(return_value=None)
+        self.on_right_click = Mock()
+        self.hide_drop_label = Mock()
+
+
+@pytest.fixture
+def model():
+    m = Model(FakeView())
+    for name in ("One", "Two", "Three"):
+        m.add_folder(name)
+    return m
+
+
+def test_model_add_folder_ignores_duplicates(model):
+    model.add_folder("Two")
+    assert model.rowCount() == 3
+
+
+def test_model_set_size_updates_the_row_of_the_folder(model):
+    model.set_size("Two", 1024)
+    assert model.item(1, 3).data(Qt.UserRole) == 1024
+
+
+def test_model_set_size_after_remove_folder_updates_the_moved_row(model):
+    model.remove_folder("One")
+    model.set_size("Three", 1024)
+    assert model.item(1, 0).text() == "Three"
+    assert model.item(1, 3).data(Qt.UserRole) == 1024
+
+
+def test_model_set_status_after_sort_updates_the_moved_row(model):
+    model.sort(0, Qt.DescendingOrder)
+    model.set_status("One", MagicFolderStatus.WAITING)
+    row = model.findItems("One")[0].row()
+    assert model.item(row, 1).text() == "Waiting to scan..."
+
+
+def test_model_remove_folder_forgets_folder(model):
+    model.remove_folder("Two")
+    assert model._folder_row("Two") is None
+
+
+def test_model_folder_row_is_none_for_externally_removed_row(model):
+    model.removeRow(0)
+    assert model._folder_row("One") is None
+
+
+def test_model_set_transfer_progress_unknown_folder_is_ignored(model):
+    model.set_transfer_progress("Unknown", SyncProgress("Unknown", 1, 2, 1, 2))
+    assert not model.findItems("Unknown")
+
+
+def test_model_set_transfer_progress_shows_percent_and_details(model):
+    model.set_transfer_progress(
+        "Two", SyncProgress("Two", 1, 2, 750, 1000, 100.0, 2.5)
+    )
+    item = model.item(1, 1)
+    assert item.text() == "Syncing (75%)"
+    assert "750 Bytes of 1.0 kB" in item.toolTip()
+
+
+def test_model_unfade_row_unknown_folder_is_ignored(model):
+    model.unfade_row("Unknown")
+    assert model.rowCount() == 3
+
+
+def test_model_folder_icons_are_rendered_at_the_views_icon_size(model):
+    model.view.setIconSize(QSize(24, 24))
+    model.fade_row("One", "laptop.png")
+    icon = model.item(0, 0).icon()
+    assert icon.availableSizes()[0].width() == 24
+
+
+def test_model_folder_icons_are_cached_per_icon_not_per_folder(
+    model, tmp_path
+):
+    directories = {}
+    for name in ("One", "Two", "Three"):
+        (tmp_path / name).mkdir()
+        directories[name] = str(tmp_path / name)
+    model.gateway.magic_folder.get_directory = directories.get
+    _folder_icons.clear()
+    for name in directories:
+        model.update_folder_icon(name, "laptop.png")
+    assert len(_folder_icons) == 1
+
+
+def test_model_update_natural_times_updates_only_visible_rows(qtbot):
+    view = FakeView()
+    qtbot.add_widget(view)
+    m = Model(view)
+    view.setModel(m)
+    for i in range(100):
+        m.add_folder(f"Folder {i}")
+        m.set_mtime(f"Folder {i}", 1000 + i)
+        m.item(i, 2).setText("")
+    view.resize(300, 200)
+    view.show()
+    newest = m.update_natural_times()
+    updated = [i for i in range(100) if m.item(i, 2).text()]
+    assert 0 < len(updated) < 100
+    assert newest == 1000 + max(updated)
+
+
+def test_model_update_natural_times_returns_none_if_nothing_visible(model):
+    assert model.update_natural_times() is None
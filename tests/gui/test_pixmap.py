@@ -2,10 +2,17 @@
 Tests for ``gridsync.gui.pixmap``.
 """
 
-from qtpy.QtGui import QPixmap
+from unittest.mock import Mock
+
+from qtpy.QtGui import QIcon, QPixmap
 
 from gridsync import resource
-from gridsync.gui.pixmap import BadgedPixmap, CompositePixmap, Pixmap
+from gridsync.gui.pixmap import (
+    BadgedPixmap,
+    CompositeIconCache,
+    CompositePixmap,
+    Pixmap,
+)
 
 
 def test_pixmap():
@@ -24,3 +31,39 @@ def test_badged_pixmap(gui):
     original = QPixmap(resource("gridsync.png"))
     badged = BadgedPixmap(original, "test")
     assert badged != original
+
+
+def test_composite_icon_cache_renders_at_requested_size(gui):
+    cache = CompositeIconCache()
+    icon = cache.get("gridsync", lambda: QIcon(resource("gridsync.png")), 24)
+    assert icon.availableSizes()[0].width() == 24
+
+
+def test_composite_icon_cache_returns_cached_icon(gui):
+    base = Mock(return_value=QIcon(resource("gridsync.png")))
+    cache = CompositeIconCache()
+    first = cache.get("gridsync", base, 24, resource("laptop.png"), True)
+    second = cache.get("gridsync", base, 24, resource("laptop.png"), True)
+    assert (first is second, base.call_count) == (True, 1)
+
+
+def test_composite_icon_cache_keys_on_overlay_grayout_and_size(gui):
+    base = Mock(return_value=QIcon(resource("gridsync.png")))
+    cache = CompositeIconCache()
+    cache.get("gridsync", base, 24)
+    cache.get("gridsync", base, 24, resource("laptop.png"))
+    cache.get("gridsync", base, 24, grayout=True)
+    cache.get("gridsync", base, 32)
+    assert (len(cache), cache.misses) == (4, 4)
+
+
+def test_composite_icon_cache_evicts_least_recently_used(gui):
+    base = Mock(return_value=QIcon(resource("gridsync.png")))
+    cache = CompositeIconCache(maxsize=2)
+    cache.get("a", base, 24)
+    cache.get("b", base, 24)
+    cache.get("a", base, 24)
+    cache.get("c", base, 24)
+    cache.get("a", base, 24)
+    cache.get("b", base, 24)
+    assert (cache.hits, cache.misses) == (2, 4)
@@ -6,6 +6,7 @@ import pytest
 
 from gridsync.gui.status import StatusPanel
 from gridsync.magic_folder import MagicFolderStatus
+from gridsync.magic_folder_events import SyncProgress
 from gridsync.tahoe import Tahoe
 
 
@@ -64,6 +65,21 @@ def test_on_sync_status_updated(
     assert sp.status_label.text() == text
 
 
+def test_on_sync_progress_updated_shows_percent_while_syncing(fake_tahoe):
+    sp = StatusPanel(fake_tahoe, MagicMock())
+    sp.on_sync_status_updated(MagicFolderStatus.SYNCING)
+    sp.on_sync_progress_updated(SyncProgress("", 1, 4, 250, 1000, 50.0, 15))
+    assert sp.status_label.text() == "Syncing (25%)"
+    assert "Syncing 250 Bytes of 1.0 kB" in sp.status_label.toolTip()
+
+
+def test_on_sync_progress_updated_ignored_unless_syncing(fake_tahoe):
+    sp = StatusPanel(fake_tahoe, MagicMock())
+    sp.on_sync_status_updated(MagicFolderStatus.UP_TO_DATE)
+    sp.on_sync_progress_updated(SyncProgress("", 1, 4, 250, 1000))
+    assert sp.status_label.text() == "Up to date"
+
+
 @pytest.mark.parametrize(
     "num_connected,num_known,available_space,tooltip",
     [
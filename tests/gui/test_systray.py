@@ -0,0 +1,114 @@
+from unittest.mock import Mock
+
+import pytest
+
+from gridsync import settings
+from gridsync.gui.systray import DEFAULT_MAX_FPS, STATIC_FRAME, SystemTrayIcon
+
+
+@pytest.fixture
+def systray():
+    gui = Mock()
+    gui.unread_messages = []
+    return SystemTrayIcon(gui, max_fps=10)
+
+
+def test_systray_set_max_fps_sets_timer_interval(systray):
+    systray.set_max_fps(4)
+    assert systray.animation_timer.interval() == 250
+
+
+@pytest.mark.parametrize(
+    "max_fps", [0, -5, "fast", None, float("nan"), float("inf")]
+)
+def test_systray_set_max_fps_invalid_falls_back_to_default(systray, max_fps):
+    systray.set_max_fps(max_fps)
+    assert systray.max_fps == DEFAULT_MAX_FPS
+    assert systray.animation_timer.interval() == int(1000 / DEFAULT_MAX_FPS)
+
+
+def test_systray_set_max_fps_accepts_numeric_string(systray):
+    systray.set_max_fps("4")
+    assert systray.animation_timer.interval() == 250
+
+
+def test_systray_invalid_fps_setting_falls_back_to_default(monkeypatch):
+    monkeypatch.setitem(
+        settings["application"], "tray_icon_fps", "not a number"
+    )
+    gui = Mock()
+    gui.unread_messages = []
+    systray = SystemTrayIcon(gui)
+    assert systray.max_fps == DEFAULT_MAX_FPS
+
+
+def test_systray_add_operation_starts_animation(systray):
+    systray.add_operation(("gateway", "folder"))
+    assert systray.is_animating()
+
+
+def test_systray_remove_last_operation_stops_animation(systray):
+    systray.add_operation(("gateway", "folder"))
+    systray.add_operation(("gateway", "other folder"))
+    systray.remove_operation(("gateway", "folder"))
+    assert systray.is_animating()
+    systray.remove_operation(("gateway", "other folder"))
+    assert not systray.is_animating()
+    assert systray._current == (STATIC_FRAME, "")
+
+
+def test_systray_remove_unknown_operation(systray):
+    systray.remove_operation(("gateway", "folder"))
+    assert not systray.is_animating()
+
+
+def test_systray_start_animation_prerenders_frames(systray):
+    systray.start_animation()
+    assert len(systray._frames) > 1
+    assert all((i, "") in systray._icons for i in range(len(systray._frames)))
+
+
+def test_systray_show_next_frame_reuses_cached_icons(systray):
+    systray.start_animation()
+    icons = dict(systray._icons)
+    for i in range(len(systray._frames) * 2):
+        systray._elapsed = Mock(elapsed=Mock(return_value=i * 80))
+        systray._show_next_frame()
+    assert systray._icons == icons
+
+
+def test_systray_show_next_frame_skips_setting_unchanged_icon(
+    systray, monkeypatch
+):
+    systray.start_animation()
+    set_icon = Mock()
+    monkeypatch.setattr(systray, "setIcon", set_icon)
+    systray._show_next_frame()
+    systray._show_next_frame()
+    assert len(set_icon.mock_calls) <= 1
+
+
+def test_systray_update_prerenders_badged_frames(systray):
+    systray.start_animation()
+    systray.gui.unread_messages.append(("gateway", "title", "message"))
+    systray.update()
+    assert all((i, "1") in systray._icons for i in range(len(systray._frames)))
+
+
+def test_systray_update_discards_icons_for_previous_badge(systray):
+    systray.gui.unread_messages.append(("gateway", "title", "message"))
+    systray.update()
+    assert (STATIC_FRAME, "1") in systray._icons
+    systray.gui.unread_messages.append(("gateway", "title", "message 2"))
+    systray.update()
+    assert (STATIC_FRAME, "1") not in systray._icons
+    assert (STATIC_FRAME, "2") in systray._icons
+
+
+def test_systray_update_without_changes_does_not_set_icon(
+    systray, monkeypatch
+):
+    set_icon = Mock()
+    monkeypatch.setattr(systray, "setIcon", set_icon)
+    systray.update()
+    assert set_icon.mock_calls == []
@@ -0,0 +1,102 @@
+import os
+import shutil
+
+import pytest
+from qtpy.QtCore import QSize
+from qtpy.QtGui import QImage
+
+from gridsync.gui.thumbnails import ThumbnailLoader, cache_key, read_thumbnail
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    src = os.path.join(os.getcwd(), "gridsync", "resources", "gridsync.png")
+    dst = tmp_path / "image.png"
+    shutil.copy(src, dst)
+    return str(dst)
+
+
+@pytest.fixture
+def loader(tmp_path):
+    loader = ThumbnailLoader(tmp_path / "thumbnails")
+    yield loader
+    loader.wait()
+
+
+def test_cache_key_changes_when_file_is_modified(image_path):
+    key = cache_key(image_path)
+    with open(image_path, "ab") as f:
+        f.write(b"\0")
+    assert cache_key(image_path) != key
+
+
+def test_cache_key_is_none_for_missing_file(tmp_path):
+    assert cache_key(str(tmp_path / "missing.png")) is None
+
+
+def test_read_thumbnail_is_scaled(image_path):
+    image = read_thumbnail(image_path, QSize(48, 48))
+    assert (image.width(), image.height()) == (48, 48)
+
+
+def test_read_thumbnail_null_for_non_image(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_text("Not an image")
+    assert read_thumbnail(str(path)).isNull()
+
+
+def test_thumbnail_loader_load_writes_cache(loader, image_path):
+    loader.load(image_path)
+    assert os.listdir(loader.cache_path) == [f"{cache_key(image_path)}.png"]
+
+
+def test_thumbnail_loader_load_reads_from_cache(
+    loader, image_path, monkeypatch
+):
+    loader.load(image_path)
+    monkeypatch.setattr(
+        "gridsync.gui.thumbnails.read_thumbnail",
+        lambda *args: pytest.fail("Thumbnail was not read from the cache"),
+    )
+    assert not loader.load(image_path).isNull()
+
+
+def test_thumbnail_loader_request_emits_thumbnail_loaded(
+    loader, image_path, qtbot
+):
+    with qtbot.wait_signal(loader.thumbnail_loaded) as blocker:
+        loader.request(image_path)
+    path, image = blocker.args
+    assert (path, image.width()) == (image_path, 48)
+
+
+def test_thumbnail_loader_request_emits_null_image_for_non_image(
+    loader, tmp_path, qtbot
+):
+    path = tmp_path / "text.txt"
+    path.write_text("Not an image")
+    with qtbot.wait_signal(loader.thumbnail_loaded) as blocker:
+        loader.request(str(path))
+    assert blocker.args[1].isNull()
+
+
+def test_thumbnail_loader_cancel(loader, image_path, qtbot):
+    with qtbot.assert_not_emitted(loader.thumbnail_loaded, wait=100):
+        loader.request(image_path)
+        loader.cancel(image_path)
+    assert not loader.pending()
+
+
+def test_thumbnail_loader_limits_concurrent_decodes(tmp_path):
+    loader = ThumbnailLoader(tmp_path, max_threads=1)
+    assert loader._pool.maxThreadCount() == 1
+
+
+def test_thumbnail_loader_prune_removes_least_recently_used(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"{i}.png"
+        QImage(1, 1, QImage.Format_RGB32).save(str(path))
+        os.utime(path, (i, i))
+    loader = ThumbnailLoader(tmp_path, max_cache_files=3)
+    assert loader.prune() == 2
+    assert sorted(os.listdir(tmp_path)) == ["2.png", "3.png", "4.png"]
@@ -0,0 +1,116 @@
+from unittest.mock import Mock
+
+import pytest
+from qtpy.QtWidgets import QListWidget, QWidget
+
+from gridsync.gui.ticker import RelativeTimeTicker, refresh_interval
+
+
+@pytest.fixture
+def ticker():
+    return RelativeTimeTicker(clock=lambda: 100_000.0)
+
+
+@pytest.fixture
+def widget(qtbot):
+    w = QWidget()
+    qtbot.addWidget(w)
+    return w
+
+
+@pytest.mark.parametrize(
+    "age,interval",
+    [
+        (0, 1),
+        (59, 1),
+        (60, 30),
+        (60 * 60 - 1, 30),
+        (60 * 60, 60 * 10),
+        (60 * 60 * 24, 60 * 60),
+        (60 * 60 * 24 * 365, 60 * 60),
+    ],
+)
+def test_refresh_interval(age, interval):
+    assert refresh_interval(age) == interval
+
+
+def test_tick_refreshes_visible_widgets(ticker, widget):
+    refresh = Mock(return_value=None)
+    ticker.register(widget, refresh)
+    widget.show()
+    ticker.tick()
+    refresh.assert_called_once()
+
+
+def test_tick_skips_hidden_widgets(ticker, widget):
+    refresh = Mock(return_value=None)
+    ticker.register(widget, refresh)
+    ticker.tick()
+    refresh.assert_not_called()
+
+
+def test_tick_stops_while_nothing_is_visible(ticker, widget):
+    ticker.register(widget, Mock(return_value=100_000.0))
+    ticker.tick()
+    assert not ticker.is_active()
+
+
+def test_tick_schedules_next_tick_by_newest_visible_timestamp(
+    ticker, widget, qtbot
+):
+    other = QWidget()
+    qtbot.addWidget(other)
+    ticker.register(widget, Mock(return_value=100_000.0 - 60 * 60 * 2))
+    ticker.register(other, Mock(return_value=100_000.0 - 60 * 5))
+    widget.show()
+    other.show()
+    ticker.tick()
+    assert ticker._timer.interval() == 30 * 1000
+
+
+def test_wake_with_recent_timestamp_brings_next_tick_forward(ticker):
+    ticker._timer.start(60 * 60 * 1000)
+    ticker.wake(100_000.0)
+    assert ticker._timer.interval() == 1000
+
+
+def test_wake_with_old_timestamp_does_not_delay_next_tick(ticker):
+    ticker._timer.start(1000)
+    ticker.wake(0.0)
+    assert ticker._timer.interval() == 1000
+
+
+def test_show_event_wakes_ticker(ticker, widget, qtbot):
+    refresh = Mock(return_value=None)
+    ticker.register(widget, refresh)
+    widget.show()
+    qtbot.wait_until(lambda: refresh.called)
+
+
+def test_resize_event_wakes_ticker(ticker, widget, qtbot):
+    widget.show()
+    ticker.register(widget, Mock(return_value=None))
+    ticker.tick()
+    widget.resize(widget.width() + 10, widget.height() + 10)
+    assert ticker.is_active()
+
+
+def test_scrolling_wakes_ticker(ticker, qtbot):
+    view = QListWidget()
+    qtbot.addWidget(view)
+    view.addItems([str(i) for i in range(100)])
+    view.resize(100, 100)
+    view.show()
+    refresh = Mock(return_value=None)
+    ticker.register(view, refresh)
+    ticker.tick()
+    refresh.reset_mock()
+    view.verticalScrollBar().setValue(10)
+    qtbot.wait_until(lambda: refresh.called)
+
+
+def test_destroyed_widget_is_unregistered(ticker, qtbot):
+    w = QWidget()
+    ticker.register(w, Mock())
+    w.deleteLater()
+    qtbot.wait_until(lambda: not ticker._subscribers)
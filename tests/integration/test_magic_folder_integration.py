@@ -560,7 +560,12 @@ async def test_monitor_emits_sync_progress_updated_signal(
         filepath.write_text(randstr() * 10)
         await magic_folder.scan(folder_name)
         await deferLater(reactor, 1, lambda: None)
-    assert blocker.args == [folder_name, 0, 1]
+    folder, progress = blocker.args
+    assert (folder, progress.files_done, progress.files_total) == (
+        folder_name,
+        0,
+        1,
+    )
 
 
 @ensureDeferred
@@ -73,6 +73,22 @@ async def test_import_rootcap(tahoe_client, rootcap_manager):
     assert cap == backup_cap
 
 
+@ensureDeferred
+async def test_import_rootcap_reports_progress(tahoe_client, rootcap_manager):
+    source_rootcap = await tahoe_client.mkdir()
+    source_basedir = await tahoe_client.mkdir(source_rootcap, "v1")
+    for i in range(3):
+        source_backups = await tahoe_client.mkdir(
+            source_basedir, f"TestBackups-Progress-{i}"
+        )
+        await tahoe_client.mkdir(source_backups, f"backup-progress-{i}")
+    progress = []
+    await rootcap_manager.import_rootcap(
+        source_rootcap, lambda done, total: progress.append((done, total))
+    )
+    assert progress == [(0, 3), (1, 3), (2, 3), (3, 3)]
+
+
 @ensureDeferred
 async def test_import_rootcap_raises_upgrade_required_error_for_v0_basedir(
     tahoe_client, rootcap_manager
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import os
+from unittest.mock import MagicMock
+
+import pytest
 
 from gridsync.config import Config
 
@@ -45,3 +48,86 @@ def test_config_load(tmpdir):
     with open(config.filename, "w") as f:
         f.write("[test_section]\ntest_option = test_value\n\n")
     assert config.load() == {"test_section": {"test_option": "test_value"}}
+
+
+def test_config_get_reuses_parsed_config(tmpdir, monkeypatch):
+    config = Config(os.path.join(str(tmpdir), "test_get_cached.ini"))
+    with open(config.filename, "w") as f:
+        f.write("[test_section]\ntest_option = test_value\n\n")
+    config.get("test_section", "test_option")
+    fake_read = MagicMock()
+    monkeypatch.setattr("gridsync.config.RawConfigParser.read", fake_read)
+    assert config.get("test_section", "test_option") == "test_value"
+    fake_read.assert_not_called()
+
+
+def test_config_get_cache_is_shared_between_instances(tmpdir, monkeypatch):
+    filename = os.path.join(str(tmpdir), "test_get_cached_shared.ini")
+    with open(filename, "w") as f:
+        f.write("[test_section]\ntest_option = test_value\n\n")
+    Config(filename).get("test_section", "test_option")
+    fake_read = MagicMock()
+    monkeypatch.setattr("gridsync.config.RawConfigParser.read", fake_read)
+    assert Config(filename).get("test_section", "test_option") == "test_value"
+    fake_read.assert_not_called()
+
+
+def test_config_get_detects_external_changes(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_get_changed.ini"))
+    with open(config.filename, "w") as f:
+        f.write("[test_section]\ntest_option = test_value\n\n")
+    config.get("test_section", "test_option")
+    with open(config.filename, "w") as f:
+        f.write("[test_section]\ntest_option = changed_value\n\n")
+    assert config.get("test_section", "test_option") == "changed_value"
+
+
+def test_config_get_after_set_returns_new_value(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_get_after_set.ini"))
+    config.set("test_section", "test_option", "test_value")
+    config.get("test_section", "test_option")
+    config.set("test_section", "test_option", "new_value")
+    assert config.get("test_section", "test_option") == "new_value"
+
+
+def test_config_batch_writes_once(tmpdir, monkeypatch):
+    config = Config(os.path.join(str(tmpdir), "test_batch.ini"))
+    fake_write = MagicMock(wraps=config._write)
+    monkeypatch.setattr(config, "_write", fake_write)
+    with config.batch():
+        config.set("test_section", "option_1", "value_1")
+        config.set("test_section", "option_2", "value_2")
+        config.set("other_section", "option_3", "value_3")
+    fake_write.assert_called_once()
+    assert config.load() == {
+        "test_section": {"option_1": "value_1", "option_2": "value_2"},
+        "other_section": {"option_3": "value_3"},
+    }
+
+
+def test_config_batch_get_returns_pending_value(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_batch_get.ini"))
+    with config.batch():
+        config.set("test_section", "test_option", "test_value")
+        assert config.get("test_section", "test_option") == "test_value"
+        assert not os.path.exists(config.filename)
+
+
+def test_config_batch_discards_changes_on_error(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_batch_error.ini"))
+    config.set("test_section", "test_option", "test_value")
+    with pytest.raises(ValueError):
+        with config.batch():
+            config.set("test_section", "test_option", "new_value")
+            raise ValueError
+    assert config.get("test_section", "test_option") == "test_value"
+
+
+def test_config_batch_does_not_write_if_unmodified(tmpdir):
+    config = Config(os.path.join(str(tmpdir), "test_batch_unmodified.ini"))
+    with open(config.filename, "w") as f:
+        f.write("# A comment\n[test_section]\ntest_option = test_value\n")
+    with config.batch():
+        pass
+    with open(config.filename) as f:
+        assert f.read().startswith("# A comment")
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+
+import pytest
+
+from gridsync.eliot_store import EliotLogStore, get_task_uuid, get_timestamp
+
+
+def make_message(timestamp, task_uuid="abc", **kwargs):
+    return json.dumps(
+        dict(
+            timestamp=timestamp, task_uuid=task_uuid, task_level=[1], **kwargs
+        )
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EliotLogStore(
+        tmp_path / "test.eliot", max_segment_bytes=1000, max_segments=3
+    )
+
+
+def test_get_timestamp():
+    assert get_timestamp(make_message(1234.5)) == 1234.5
+
+
+def test_get_timestamp_returns_none_if_missing():
+    assert get_timestamp('{"task_uuid": "abc"}') is None
+
+
+def test_get_task_uuid():
+    assert get_task_uuid(make_message(1, "xyz")) == "xyz"
+
+
+def test_eliot_log_store_read_returns_messages_in_order(tmp_path):
+    store = EliotLogStore(tmp_path / "test.eliot", max_segment_bytes=1000)
+    messages = [make_message(i) for i in range(50)]
+    for message in messages:
+        store.append(message + "\n")
+    assert store.read() == "\n".join(messages)
+
+
+def test_eliot_log_store_seals_compressed_segments(store):
+    for i in range(50):
+        store.append(make_message(i) + "\n")
+    segments = sorted(store.path.glob("*.jsonl.gz"))
+    assert segments
+    with gzip.open(segments[0], "rt") as f:
+        assert get_timestamp(f.readline()) is not None
+
+
+def test_eliot_log_store_writes_sidecar_indexes(store):
+    for i in range(50):
+        store.append(make_message(i, task_uuid=f"task-{i}") + "\n")
+    index_path = sorted(store.path.glob("*.idx.json"))[-1]
+    index = json.loads(index_path.read_text())
+    assert index["first"] <= index["last"]
+    assert f"task-{int(index['last'])}" in index["task_uuids"]
+
+
+def test_eliot_log_store_keeps_only_max_segments(store):
+    for i in range(200):
+        store.append(make_message(i) + "\n")
+    assert len(list(store.path.glob("*.jsonl.gz"))) == 3
+    assert len(list(store.path.glob("*.idx.json"))) == 3
+
+
+def test_eliot_log_store_query_time_range(store):
+    for i in range(40):
+        store.append(make_message(i) + "\n")
+    results = [get_timestamp(m) for m in store.query(start=10, end=20)]
+    assert results == [float(i) for i in range(10, 21)]
+
+
+def test_eliot_log_store_query_task_uuid(store):
+    for i in range(40):
+        store.append(make_message(i, task_uuid=f"task-{i % 4}") + "\n")
+    results = list(store.query(task_uuid="task-1"))
+    assert len(results) == 10
+    assert all(get_task_uuid(m) == "task-1" for m in results)
+
+
+def test_eliot_log_store_query_skips_segments_outside_range(
+    store, monkeypatch
+):
+    for i in range(40):
+        store.append(make_message(i) + "\n")
+    read = []
+    original = store._read_segment
+
+    def _read_segment(segment):
+        read.append(segment)
+        return original(segment)
+
+    monkeypatch.setattr(store, "_read_segment", _read_segment)
+    list(store.query(start=39))
+    assert read == []
+
+
+def test_eliot_log_store_rebuilds_missing_index(store):
+    for i in range(40):
+        store.append(make_message(i) + "\n")
+    for path in store.path.glob("*.idx.json"):
+        path.unlink()
+    reopened = EliotLogStore(store.path, max_segment_bytes=1000)
+    results = [get_timestamp(m) for m in reopened.query(start=0, end=5)]
+    assert results == [float(i) for i in range(6)]
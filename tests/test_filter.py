@@ -8,11 +8,17 @@ from unittest.mock import Mock
 import pytest
 
 from gridsync import autostart_file_path, config_dir, pkgdir
+from gridsync.crypto import trunchash
 from gridsync.filter import (
+    Redactor,
+    _get_mask_cached,
+    apply_eliot_filters,
     apply_filters,
     filter_eliot_log_message,
     filter_eliot_logs,
     get_filters,
+    get_mask,
+    is_eliot_log_message,
     join_eliot_logs,
 )
 
@@ -655,3 +661,97 @@ def test_filter_eliot_logs_apply_filter_use_identifier():
 def test_join_eliot_logs_sort_output():
     messages = ['{"C": 3, "A": 1, "B": 2}']
     assert join_eliot_logs(messages) == '{"A": 1, "B": 2, "C": 3}'
+
+
+@pytest.mark.parametrize(
+    "line, result",
+    [
+        ('{"task_uuid": "abc", "timestamp": 1.0, "message_type": "x"}', True),
+        ('{"task_uuid": "abc"}', False),
+        ("2021-01-01 Some other output", False),
+        ("", False),
+    ],
+)
+def test_is_eliot_log_message(line, result):
+    assert is_eliot_log_message(line) == result
+
+
+def test_apply_eliot_filters_canonicalizes_raw_messages():
+    content = (
+        '{"nickname": "TestGrid", "action_type": "magic-folder:full-scan"}\n'
+        '{"C": 3, "A": 1, "B": 2}\n'
+    )
+    assert apply_eliot_filters(content, "1") == (
+        '{"action_type": "magic-folder:full-scan", '
+        '"nickname": "<Filtered:GatewayName:1>"}\n'
+        '{"A": 1, "B": 2, "C": 3}'
+    )
+
+
+def test_apply_eliot_filters_skips_malformed_messages():
+    content = '{"task_uuid": "abc", "timest\n{"A": 1}'
+    assert apply_eliot_filters(content) == '{"A": 1}'
+
+
+def test_redactor_replaces_longest_match_first():
+    filters = [("/home/user", "HomeDir"), ("/home/user/Documents", "Path")]
+    assert Redactor(filters).apply("cd /home/user/Documents/x") == (
+        "cd <Filtered:Path>/x"
+    )
+
+
+def test_redactor_uses_first_mask_for_duplicate_strings():
+    filters = [("tahoe.exe", "A"), ("tahoe.exe", "B")]
+    assert Redactor(filters).apply("tahoe.exe") == "<Filtered:A>"
+
+
+def test_redactor_ignores_empty_filters():
+    filters = [("", "Empty"), (None, "None"), ("value", "")]
+    assert Redactor(filters).apply("value") == "value"
+
+
+def test_redactor_escapes_regex_metacharacters():
+    filters = [("a.b*(c)", "Meta")]
+    assert Redactor(filters).apply("a.b*(c) axbbc") == "<Filtered:Meta> axbbc"
+
+
+def test_redactor_matches_sequential_replacement():
+    filters = [("abc", "1"), ("abd", "2"), ("ab", "3"), ("xyz", "4")]
+    text = "abcabdabxyzab abc"
+    expected = text
+    for s, mask in filters:
+        expected = expected.replace(s, f"<Filtered:{mask}>")
+    assert Redactor(filters).apply(text) == expected
+
+
+def test_get_mask_is_memoized():
+    _get_mask_cached.cache_clear()
+    get_mask("/some/path", "Path")
+    get_mask("/some/path", "Path")
+    assert _get_mask_cached.cache_info().hits == 1
+
+
+def test_get_mask_unhashable_value_with_identifier():
+    assert get_mask(["a", "b"], "GatewayName", "1") == (
+        "<Filtered:GatewayName:1>"
+    )
+
+
+def test_filter_eliot_log_message_masks_unhashable_gateway_name():
+    message = json.dumps(
+        {"action_type": "magic-folder:full-scan", "nickname": {"a": 1}}
+    )
+    assert json.loads(filter_eliot_log_message(message, "1"))["nickname"] == (
+        "<Filtered:GatewayName:1>"
+    )
+
+
+def test_filter_eliot_logs_nested_list_rule():
+    messages = [
+        '{"message_type": "magic-folder:all-files", "files": ["a", "b"]}'
+    ]
+    assert filter_eliot_logs(messages) == [
+        '{"files": ["<Filtered:Path:%s>", "<Filtered:Path:%s>"], '
+        '"message_type": "magic-folder:all-files"}'
+        % (trunchash("a"), trunchash("b"))
+    ]
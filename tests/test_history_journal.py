@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import sqlite3
+
+import pytest
+from twisted.internet.task import Clock
+
+from gridsync.history_journal import HistoryEntry, HistoryJournal
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def journal(tmp_path, clock):
+    journal = HistoryJournal(tmp_path / "history.sqlite", reactor=clock)
+    yield journal
+    journal.close()
+
+
+def _count(journal):
+    connection = sqlite3.connect(journal.path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_journal_is_not_created_until_used(journal):
+    assert not journal.path.exists()
+
+
+def test_record_is_not_written_immediately(journal):
+    journal.record("TestFolder", "Uploaded", "file.txt", 1.0)
+    journal.flush()
+    journal.record("TestFolder", "Uploaded", "file2.txt", 2.0)
+    assert _count(journal) == 1
+
+
+def test_record_is_written_after_flush_interval(journal, clock):
+    journal.record("TestFolder", "Uploaded", "file.txt", 1.0)
+    journal.page()  # Creates the database
+    journal.record("TestFolder", "Uploaded", "file2.txt", 2.0)
+    clock.advance(journal.flush_interval)
+    assert _count(journal) == 2
+
+
+def test_record_is_written_in_batches(tmp_path, clock):
+    journal = HistoryJournal(
+        tmp_path / "history.sqlite", reactor=clock, batch_size=3
+    )
+    for i in range(3):
+        journal.record("TestFolder", "Uploaded", f"{i}.txt", i)
+    assert (_count(journal), clock.getDelayedCalls()) == (3, [])
+
+
+def test_page_returns_newest_first(journal):
+    for i in range(3):
+        journal.record("TestFolder", "Uploaded", f"{i}.txt", i)
+    assert [e.relpath for e in journal.page()] == ["2.txt", "1.txt", "0.txt"]
+
+
+def test_page_returns_entries(journal):
+    journal.record("TestFolder", "Downloaded", "file.txt", 1.5)
+    assert journal.page() == [
+        HistoryEntry(1, 1.5, "TestFolder", "Downloaded", "file.txt")
+    ]
+
+
+def test_page_paginates(journal):
+    for i in range(5):
+        journal.record("TestFolder", "Uploaded", f"{i}.txt", i % 2)
+    pages = []
+    before = None
+    while True:
+        page = journal.page(2, before)
+        if not page:
+            break
+        pages.append([e.relpath for e in page])
+        before = page[-1].cursor
+    assert pages == [["3.txt", "1.txt"], ["4.txt", "2.txt"], ["0.txt"]]
+
+
+def test_page_filters_by_folder(journal):
+    journal.record("A", "Uploaded", "a.txt", 1)
+    journal.record("B", "Uploaded", "b.txt", 2)
+    assert [e.relpath for e in journal.page(folder="A")] == ["a.txt"]
+
+
+def test_forget_folder_removes_its_entries(journal):
+    journal.record("A", "Uploaded", "a.txt", 1)
+    journal.record("B", "Uploaded", "b.txt", 2)
+    journal.flush()
+    journal.record("A", "Uploaded", "c.txt", 3)
+    journal.forget_folder("A")
+    assert [e.relpath for e in journal.page()] == ["b.txt"]
+
+
+def test_forget_folder_does_not_create_journal(journal):
+    journal.forget_folder("A")
+    assert not journal.path.exists()
+
+
+def test_max_entries_removes_oldest_entries(tmp_path, clock):
+    journal = HistoryJournal(
+        tmp_path / "history.sqlite", reactor=clock, max_entries=3
+    )
+    for i in range(5):
+        journal.record("TestFolder", "Uploaded", f"{i}.txt", i)
+        journal.flush()
+    assert [e.relpath for e in journal.page()] == ["4.txt", "3.txt", "2.txt"]
+
+
+def test_entries_persist_across_instances(tmp_path, clock):
+    journal = HistoryJournal(tmp_path / "history.sqlite", reactor=clock)
+    journal.record("TestFolder", "Uploaded", "file.txt", 1)
+    journal.close()
+    journal = HistoryJournal(tmp_path / "history.sqlite", reactor=clock)
+    assert [e.relpath for e in journal.page()] == ["file.txt"]
+
+
+def test_close_cancels_pending_flush(journal, clock):
+    journal.record("TestFolder", "Uploaded", "file.txt", 1)
+    journal.close()
+    assert clock.getDelayedCalls() == []
+
+
+def test_page_returns_empty_list_on_database_error(tmp_path, clock):
+    path = tmp_path / "history.sqlite"
+    path.write_text("Not a database")
+    journal = HistoryJournal(path, reactor=clock)
+    assert journal.page() == []
@@ -1,3 +1,4 @@
+import logging
 from logging import NullHandler
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
@@ -10,6 +11,8 @@ from gridsync.log import (
     LOGGING_ENABLED,
     LOGGING_MAX_BYTES,
     LOGS_PATH,
+    AsyncRotatingFileHandler,
+    LogWriter,
     MultiFileLogger,
     NullLogger,
     make_file_logger,
@@ -98,10 +101,58 @@ def test_multi_file_logger_write():
     logger_name = "writer"
     logger = MultiFileLogger(basename)
     logger.log(logger_name, "write_test_contents")
+    logger.flush()
     p = Path(LOGS_PATH, f"{basename}.{logger_name}.log")
     assert p.read_text("utf-8").strip().endswith("write_test_contents")
 
 
+def test_make_file_logger_asynchronous_uses_async_handler():
+    logger = make_file_logger("test_async_handler", asynchronous=True)
+    assert isinstance(logger.handlers[0], AsyncRotatingFileHandler)
+
+
+def test_async_rotating_file_handler_writes_on_flush(tmp_path):
+    writer = LogWriter()
+    writer.start()
+    logger = logging.getLogger("test_async_writes_on_flush")
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(
+        AsyncRotatingFileHandler(tmp_path / "a.log", writer=writer)
+    )
+    for i in range(100):
+        logger.debug("line %i", i)
+    assert writer.flush()
+    lines = (tmp_path / "a.log").read_text("utf-8").splitlines()
+    assert lines == [f"line {i}" for i in range(100)]
+
+
+def test_async_rotating_file_handler_rotates(tmp_path):
+    writer = LogWriter()
+    writer.start()
+    handler = AsyncRotatingFileHandler(
+        tmp_path / "r.log", max_bytes=100, backup_count=1, writer=writer
+    )
+    logger = logging.getLogger("test_async_rotates")
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    for i in range(10):
+        logger.debug("x" * 30)
+        writer.flush()
+    assert (tmp_path / "r.log.1").exists()
+    assert (tmp_path / "r.log").stat().st_size < 100
+
+
+def test_log_writer_counts_dropped_records_instead_of_blocking(tmp_path):
+    writer = LogWriter(maxsize=1)  # Not started; the queue is never drained
+    handler = AsyncRotatingFileHandler(tmp_path / "d.log", writer=writer)
+    logger = logging.getLogger("test_log_writer_drops")
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    for _ in range(5):
+        logger.debug("test")
+    assert (writer.dropped, handler.dropped) == (4, 4)
+
+
 def test_multi_file_logger_read():
     basename = "test_multi_file_logger_read"
     logger_name = "reader"
@@ -120,6 +171,18 @@ def test_multi_file_logger_omit_fmt():
     assert logger.read_log(logger_name).strip() == "omit_fmt_contents"
 
 
+def test_multi_file_logger_read_eliot_log(monkeypatch, tmp_path):
+    monkeypatch.setattr("gridsync.log.LOGS_PATH", tmp_path)
+    basename = "test_multi_file_logger_read_eliot_log"
+    logger = MultiFileLogger(basename)
+    for i in range(10):
+        logger.log_eliot(f'{{"task_uuid": "abc", "timestamp": {i}}}')
+    assert logger.read_eliot_log(start=8) == (
+        '{"task_uuid": "abc", "timestamp": 8}\n'
+        '{"task_uuid": "abc", "timestamp": 9}'
+    )
+
+
 def test_null_logger():
     logger = NullLogger()
     logger.log("null_logger_test", "test")
@@ -11,6 +11,20 @@ from gridsync.magic_folder import (
 from gridsync.tahoe import Tahoe
 
 
+def test_upload_and_download_finished_events_are_recorded_in_history(
+    tmp_path,
+):
+    magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
+    magic_folder.events.upload_finished.emit("TestFolder", "a.txt", 1.0)
+    magic_folder.events.download_finished.emit("TestFolder", "b.txt", 2.0)
+    entries = magic_folder.history.page()
+    magic_folder.history.close()
+    assert [(e.action, e.relpath) for e in entries] == [
+        ("Downloaded", "b.txt"),
+        ("Uploaded", "a.txt"),
+    ]
+
+
 def test__read_api_token(tmp_path):
     magic_folder = MagicFolder(Tahoe(tmp_path / "nodedir"))
     magic_folder.configdir.mkdir(parents=True)
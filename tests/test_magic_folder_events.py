@@ -1,7 +1,11 @@
+from unittest.mock import Mock
+
 from gridsync.magic_folder_events import (
     MagicFolderEventHandler,
     MagicFolderOperationsMonitor,
+    MagicFolderProgressMonitor,
     MagicFolderStatus,
+    SyncProgress,
 )
 
 
@@ -401,7 +405,12 @@ def test_sync_progress_updated_signal(qtbot):
                 "relpath": "File1",
             }
         )
-    assert blocker.args == ["TestFolder", 1, 2]  # 1/2 files uploaded
+    folder, progress = blocker.args
+    assert (folder, progress.files_done, progress.files_total) == (
+        "TestFolder",
+        1,
+        2,
+    )  # 1/2 files uploaded
 
 
 def test_files_updated_signal(qtbot):
@@ -445,3 +454,122 @@ def test_log_warning_for_unknown_event_kinds(monkeypatch):
     event = {"kind": "unknown", "folder": "TestFolder"}
     handler.handle(event)
     assert warnings[0][1] == event
+
+
+def test_sync_progress_percent_is_weighted_by_bytes():
+    progress = SyncProgress("TestFolder", 1, 2, 900, 1000)
+    assert progress.percent == 90
+
+
+def test_sync_progress_percent_falls_back_to_files_without_bytes():
+    progress = SyncProgress("TestFolder", 1, 4, 0, 0)
+    assert progress.percent == 25
+
+
+def test_sync_progress_percent_without_anything_queued():
+    assert SyncProgress("TestFolder", 0, 0, 0, 0).percent == 0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_progress_monitor(sizes=None, clock=None):
+    sizes = sizes or {}
+    handler = Mock()
+    monitor = MagicFolderProgressMonitor(
+        handler,
+        size_of=lambda _, relpath: sizes.get(relpath),
+        clock=clock or FakeClock(),
+    )
+    return monitor, handler
+
+
+def test_progress_monitor_weights_progress_by_file_size():
+    monitor, _ = make_progress_monitor({"small": 100, "large": 300})
+    monitor.on_upload_queued("TestFolder", "small")
+    monitor.on_upload_queued("TestFolder", "large")
+    monitor.on_upload_finished("TestFolder", "large")
+    progress = monitor.get_progress("TestFolder")
+    assert (progress.bytes_done, progress.bytes_total) == (300, 400)
+    assert progress.percent == 75
+
+
+def test_progress_monitor_estimates_size_of_queued_downloads():
+    monitor, _ = make_progress_monitor({"a": 100, "b": 300})
+    for relpath in ("a", "b", "c", "d"):
+        monitor.on_download_queued("TestFolder", relpath)
+    monitor.on_download_finished("TestFolder", "a")
+    monitor.on_download_finished("TestFolder", "b")
+    progress = monitor.get_progress("TestFolder")
+    # "c" and "d" are assumed to be the average size of "a" and "b"
+    assert (progress.bytes_done, progress.bytes_total) == (400, 800)
+
+
+def test_progress_monitor_computes_throughput_and_eta():
+    clock = FakeClock()
+    monitor, _ = make_progress_monitor({"a": 1000, "b": 3000}, clock)
+    monitor.on_upload_queued("TestFolder", "a")
+    monitor.on_upload_queued("TestFolder", "b")
+    clock.now += 2
+    monitor.on_upload_finished("TestFolder", "a")
+    progress = monitor.get_progress("TestFolder")
+    assert progress.throughput == 500
+    assert progress.eta == 6
+
+
+def test_progress_monitor_throughput_only_counts_recent_transfers():
+    clock = FakeClock()
+    monitor, _ = make_progress_monitor({"a": 1000, "b": 3000}, clock)
+    monitor.on_upload_queued("TestFolder", "a")
+    monitor.on_upload_queued("TestFolder", "b")
+    clock.now += 1
+    monitor.on_upload_finished("TestFolder", "a")
+    clock.now += monitor.THROUGHPUT_WINDOW + 1
+    progress = monitor.get_progress("TestFolder")
+    assert progress.throughput == 0
+    assert progress.eta is None
+
+
+def test_progress_monitor_aggregates_overall_progress():
+    monitor, _ = make_progress_monitor(
+        {"a": 100, "b": 300, "c": 600, "d": 400}
+    )
+    monitor.on_upload_queued("One", "a")
+    monitor.on_upload_queued("One", "b")
+    monitor.on_upload_queued("Two", "c")
+    monitor.on_upload_queued("Two", "d")
+    monitor.on_upload_finished("Two", "c")
+    progress = monitor.get_overall_progress()
+    assert (progress.files_done, progress.files_total) == (1, 4)
+    assert (progress.bytes_done, progress.bytes_total) == (600, 1400)
+
+
+def test_progress_monitor_caps_the_rate_of_updates(qtbot):
+    monitor, handler = make_progress_monitor()
+    for i in range(100):
+        monitor.on_upload_queued("TestFolder", f"File{i}")
+    for i in range(50):
+        monitor.on_upload_finished("TestFolder", f"File{i}")
+    assert handler.sync_progress_updated.emit.call_count == 1
+    qtbot.wait_until(
+        lambda: handler.sync_progress_updated.emit.call_count == 2
+    )
+    _, progress = handler.sync_progress_updated.emit.call_args.args
+    assert (progress.files_done, progress.files_total) == (50, 100)
+
+
+def test_progress_monitor_emits_completion_immediately():
+    monitor, handler = make_progress_monitor()
+    monitor.on_upload_queued("TestFolder", "File1")
+    monitor.on_upload_queued("TestFolder", "File2")
+    monitor.on_upload_finished("TestFolder", "File1")
+    monitor.on_upload_finished("TestFolder", "File2")
+    _, progress = handler.sync_progress_updated.emit.call_args.args
+    assert progress.percent == 100
+    overall = handler.overall_progress_updated.emit.call_args.args[0]
+    assert overall.files_total == 0
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import time
+from unittest.mock import Mock
+
+from psutil import Process
+
+from gridsync.sampler import ResourceSampler
+
+
+def make_sampler(process=None, size=720):
+    supervisor = Mock()
+    supervisor.process = Process() if process is None else process
+    return ResourceSampler(supervisor, size=size)
+
+
+def test_resource_sampler_sample_returns_none_if_no_process():
+    sampler = make_sampler()
+    sampler.supervisor.process = None
+    assert sampler.sample() is None
+
+
+def test_resource_sampler_sample_records_resource_usage():
+    sample = make_sampler().sample()
+    assert sample.rss > 0 and sample.num_threads > 0 and sample.num_fds > 0
+
+
+def test_resource_sampler_first_sample_has_no_cpu_percent():
+    assert make_sampler().sample().cpu_percent is None
+
+
+def test_resource_sampler_second_sample_has_cpu_percent():
+    sampler = make_sampler()
+    sampler.sample()
+    sum(range(1_000_000))  # Use some CPU
+    assert sampler.sample().cpu_percent >= 0
+
+
+def test_resource_sampler_keeps_only_last_samples():
+    sampler = make_sampler(size=3)
+    samples = [sampler.sample() for _ in range(5)]
+    assert sampler.samples() == samples[-3:]
+
+
+def test_resource_sampler_samples_since():
+    sampler = make_sampler()
+    sampler.sample()
+    since = time.time()
+    sample = sampler.sample()
+    assert sampler.samples(since) == [sample]
+
+
+def test_resource_sampler_latest():
+    sampler = make_sampler()
+    sampler.sample()
+    sample = sampler.sample()
+    assert sampler.latest() == sample
+
+
+def test_resource_sampler_summary_is_empty_without_samples():
+    assert make_sampler().summary() == {}
+
+
+def test_resource_sampler_summary():
+    sampler = make_sampler()
+    samples = [sampler.sample() for _ in range(3)]
+    summary = sampler.summary()
+    assert summary["samples"] == 3
+    assert summary["rss_max"] == max(s.rss for s in samples)
+
+
+def test_resource_sampler_start_samples_immediately():
+    sampler = make_sampler()
+    sampler.start()
+    sampler.stop()
+    assert len(sampler.samples()) == 1
@@ -1,9 +1,14 @@
 import sys
+import time
+from unittest.mock import MagicMock, Mock
 
+import pytest
 from psutil import Process
 from pytest_twisted import inlineCallbacks
 from twisted.internet import reactor
+from twisted.internet.error import ProcessTerminated
 from twisted.internet.task import deferLater
+from twisted.python.failure import Failure
 
 from gridsync.supervisor import Supervisor
 from gridsync.util import until
@@ -94,3 +99,77 @@ def test_supervisor_calls_call_after_start(tmp_path):
     )
     yield supervisor.stop()
     assert f_was_called[0] is True
+
+
+@pytest.mark.parametrize(
+    "consecutive_restarts, delay",
+    [(1, 1), (2, 2), (3, 4), (4, 8), (10, 60)],
+)
+def test_supervisor_restart_delay_backs_off_exponentially(
+    tmp_path, consecutive_restarts, delay
+):
+    supervisor = Supervisor(tmp_path / "pidfile", jitter=0)
+    supervisor.consecutive_restarts = consecutive_restarts
+    assert supervisor._get_restart_delay() == delay
+
+
+def test_supervisor_restart_delay_adds_jitter(tmp_path):
+    supervisor = Supervisor(tmp_path / "pidfile", restart_delay=10)
+    supervisor.consecutive_restarts = 1
+    delays = {supervisor._get_restart_delay() for _ in range(10)}
+    assert len(delays) > 1 and all(9 <= d <= 11 for d in delays)
+
+
+def test_supervisor_schedule_restart_resets_back_off_after_stable_uptime(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr("gridsync.supervisor.reactor.callLater", Mock())
+    supervisor = Supervisor(tmp_path / "pidfile", stable_uptime=60)
+    supervisor.consecutive_restarts = 5
+    supervisor.time_started = time.time() - 120
+    supervisor._schedule_restart(Failure(ProcessTerminated(signal=9)))
+    assert supervisor.consecutive_restarts == 1
+
+
+def test_supervisor_schedule_restart_records_exit_reason(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr("gridsync.supervisor.reactor.callLater", Mock())
+    supervisor = Supervisor(tmp_path / "pidfile")
+    supervisor._schedule_restart(Failure(ProcessTerminated(signal=9)))
+    assert "signal 9" in supervisor.metrics()["last_exit_reason"]
+
+
+@inlineCallbacks
+def test_supervisor_metrics_counts_restarts(tmp_path):
+    supervisor = Supervisor(tmp_path / "python.pid", restart_delay=0)
+    pid, _ = yield supervisor.start(PROCESS_ARGS, started_trigger="OK")
+    Process(pid).kill()
+    yield until(lambda: supervisor.restart_count == 1)
+    yield until(supervisor.is_running)
+    metrics = supervisor.metrics()
+    yield supervisor.stop()
+    assert (metrics["restart_count"], metrics["running"]) == (1, True)
+    assert metrics["rss"] > 0
+
+
+def test_supervisor_process_primes_cpu_percent(monkeypatch, tmp_path):
+    fake_process = MagicMock()
+    monkeypatch.setattr(
+        "gridsync.supervisor.Process", Mock(return_value=fake_process)
+    )
+    supervisor = Supervisor(tmp_path / "python.pid")
+    supervisor._protocol = Mock()
+    supervisor.metrics()
+    assert fake_process.cpu_percent.call_count == 2
+
+
+@inlineCallbacks
+def test_supervisor_stop_cancels_pending_restart(tmp_path):
+    supervisor = Supervisor(tmp_path / "python.pid", restart_delay=60)
+    pid, _ = yield supervisor.start(PROCESS_ARGS, started_trigger="OK")
+    Process(pid).kill()
+    yield until(lambda: supervisor.metrics()["restart_pending"])
+    yield supervisor.stop()
+    assert supervisor.metrics()["restart_pending"] is False
+    assert supervisor.restart_count == 0
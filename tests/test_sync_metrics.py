@@ -0,0 +1,155 @@
+import math
+
+import pytest
+
+from gridsync.magic_folder_events import MagicFolderEventHandler
+from gridsync.sync_metrics import (
+    LatencyHistogram,
+    RateWindow,
+    SyncMetrics,
+)
+
+
+def test_latency_histogram_percentile_empty():
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_latency_histogram_percentile_interpolates_within_bucket():
+    histogram = LatencyHistogram((1.0, 2.0, math.inf))
+    for value in (1.5, 1.5, 1.5, 1.5):
+        histogram.observe(value)
+    assert histogram.percentile(50) == 1.5
+    assert histogram.percentile(100) == 2.0
+
+
+def test_latency_histogram_percentile_in_unbounded_bucket():
+    histogram = LatencyHistogram((1.0, 2.0, math.inf))
+    histogram.observe(1000)
+    assert histogram.percentile(99) == 2.0
+
+
+def test_latency_histogram_merge():
+    a = LatencyHistogram()
+    b = LatencyHistogram()
+    a.observe(0.2)
+    b.observe(20)
+    a.merge(b)
+    assert (a.count, a.sum) == (2, 20.2)
+
+
+def test_rate_window_rate():
+    window = RateWindow(seconds=10)
+    window.add(100.0, 500)
+    window.add(105.5, 500)
+    assert window.rate(109.0) == 100
+
+
+def test_rate_window_forgets_old_transfers():
+    window = RateWindow(seconds=10)
+    window.add(100.0, 500)
+    window.add(115.0, 500)
+    assert window.rate(115.0) == 50
+
+
+@pytest.fixture
+def metrics():
+    sizes = {"a.txt": 1000, "b.txt": 3000}
+    return SyncMetrics(
+        size_of=lambda _, relpath: sizes.get(relpath), clock=lambda: 130.0
+    )
+
+
+def test_sync_metrics_queue_depth(metrics):
+    metrics.observe("upload-queued", "TestFolder", "a.txt", 100.0)
+    metrics.observe("upload-queued", "TestFolder", "b.txt", 100.0)
+    metrics.observe("upload-finished", "TestFolder", "a.txt", 101.0)
+    upload = metrics.to_dict()["folders"]["TestFolder"]["upload"]
+    assert upload["queue_depth"] == 1
+
+
+def test_sync_metrics_files_bytes_and_throughput(metrics):
+    metrics.observe("download-queued", "TestFolder", "a.txt", 100.0)
+    metrics.observe("download-queued", "TestFolder", "b.txt", 100.0)
+    metrics.observe("download-finished", "TestFolder", "a.txt", 110.0)
+    metrics.observe("download-finished", "TestFolder", "b.txt", 120.0)
+    download = metrics.to_dict()["folders"]["TestFolder"]["download"]
+    assert (download["files"], download["bytes"]) == (2, 4000)
+    assert download["throughput"] == round(4000 / 60, 3)
+
+
+def test_sync_metrics_latency(metrics):
+    metrics.observe("upload-queued", "TestFolder", "a.txt", 100.0)
+    metrics.observe("upload-finished", "TestFolder", "a.txt", 103.0)
+    latency = metrics.to_dict()["folders"]["TestFolder"]["upload"]["latency"]
+    assert latency["count"] == 1
+    assert latency["sum"] == 3.0
+    assert 2.5 <= latency["p50"] <= 5.0
+
+
+def test_sync_metrics_ignores_unrelated_events(metrics):
+    metrics.observe("scan-completed", "TestFolder", None, 100.0)
+    assert metrics.to_dict()["folders"] == {}
+
+
+def test_sync_metrics_forgets_folder_left(metrics):
+    metrics.observe("upload-queued", "TestFolder", "a.txt", 100.0)
+    metrics.observe("folder-left", "TestFolder", None, 101.0)
+    assert "TestFolder" not in metrics.to_dict()["folders"]
+
+
+def test_sync_metrics_gateway_totals(metrics):
+    metrics.observe("upload-queued", "One", "a.txt", 100.0)
+    metrics.observe("upload-finished", "One", "a.txt", 101.0)
+    metrics.observe("upload-queued", "Two", "b.txt", 100.0)
+    metrics.observe("upload-finished", "Two", "b.txt", 102.0)
+    metrics.observe("upload-queued", "Two", "c.txt", 100.0)
+    upload = metrics.to_dict()["gateway"]["upload"]
+    assert upload["queue_depth"] == 1
+    assert (upload["files"], upload["bytes"]) == (2, 4000)
+    assert upload["latency"]["count"] == 2
+
+
+def test_sync_metrics_to_prometheus(metrics):
+    metrics.observe("upload-queued", "TestFolder", "a.txt", 100.0)
+    metrics.observe("upload-finished", "TestFolder", "a.txt", 101.0)
+    text = metrics.to_prometheus({"gateway": "TestGrid"})
+    labels = 'gateway="TestGrid",folder="TestFolder",direction="upload"'
+    assert f"gridsync_sync_files_total{{{labels}}} 1" in text
+    assert f"gridsync_sync_bytes_total{{{labels}}} 1000" in text
+    assert f'gridsync_sync_latency_seconds_bucket{{{labels},le="+Inf"}} 1' in (
+        text
+    )
+    assert "# TYPE gridsync_sync_latency_seconds histogram" in text
+
+
+def test_sync_metrics_to_prometheus_escapes_label_values(metrics):
+    metrics.observe("upload-queued", 'My "Folder"', "a.txt", 100.0)
+    assert 'folder="My \\"Folder\\""' in metrics.to_prometheus()
+
+
+def test_sync_metrics_write_textfile(metrics, tmp_path):
+    metrics.observe("upload-queued", "TestFolder", "a.txt", 100.0)
+    path = tmp_path / "metrics" / "gridsync.prom"
+    metrics.write_textfile(path)
+    assert path.read_text() == metrics.to_prometheus()
+
+
+def test_sync_metrics_start_writes_textfile_and_stop(metrics, tmp_path):
+    path = tmp_path / "gridsync.prom"
+    metrics.start(path, {"gateway": "TestGrid"})
+    metrics.stop()
+    assert path.exists()
+
+
+def test_magic_folder_event_handler_feeds_sync_metrics(qtbot):
+    handler = MagicFolderEventHandler()
+    handler.handle(
+        {
+            "kind": "upload-queued",
+            "folder": "TestFolder",
+            "relpath": "a.txt",
+            "timestamp": 100.0,
+        }
+    )
+    upload = handler.metrics.to_dict()["folders"]["TestFolder"]["upload"]
+    assert upload["queue_depth"] == 1
@@ -1,7 +1,19 @@
+import os
+import subprocess
+import sys
+
 import pytest
+from psutil import STATUS_ZOMBIE, Process
+from pytest_twisted import inlineCallbacks
 
 from gridsync.crypto import randstr
-from gridsync.system import which
+from gridsync.system import (
+    SubprocessError,
+    SubprocessProtocol,
+    terminate_if_matching,
+    wait_for_exit,
+    which,
+)
 
 
 def test_which():
@@ -12,3 +24,136 @@ def test_which():
 def test_which_raises_environment_error():
     with pytest.raises(EnvironmentError):
         which(randstr(32))
+
+
+def make_protocol(**kwargs):
+    lines = []
+    protocol = SubprocessProtocol(stdout_line_collector=lines.append, **kwargs)
+    return protocol, lines
+
+
+def test_subprocess_protocol_joins_lines_split_across_chunks():
+    protocol, lines = make_protocol()
+    protocol.childDataReceived(1, b"Hello, Wo")
+    protocol.childDataReceived(1, b"rld!\nSecond line\n")
+    assert lines == ["Hello, World!", "Second line"]
+
+
+def test_subprocess_protocol_decodes_characters_split_across_chunks():
+    protocol, lines = make_protocol()
+    data = "Café ☃\n".encode("utf-8")
+    for i in range(len(data)):
+        protocol.childDataReceived(1, data[i : i + 1])
+    assert lines == ["Café ☃"]
+
+
+def test_subprocess_protocol_frames_each_fd_separately():
+    stderr_lines = []
+    protocol, lines = make_protocol(stderr_line_collector=stderr_lines.append)
+    protocol.childDataReceived(1, b"out")
+    protocol.childDataReceived(2, b"err\n")
+    protocol.childDataReceived(1, b"put\n")
+    assert (lines, stderr_lines) == (["output"], ["err"])
+
+
+def test_subprocess_protocol_strips_carriage_returns():
+    protocol, lines = make_protocol()
+    protocol.childDataReceived(1, b"Windows\r\n")
+    assert lines == ["Windows"]
+
+
+def test_subprocess_protocol_flushes_partial_line_on_connection_lost():
+    protocol, lines = make_protocol()
+    protocol.childDataReceived(1, b"No trailing newline")
+    protocol.childConnectionLost(1)
+    assert lines == ["No trailing newline"]
+
+
+def test_subprocess_protocol_fires_callback_trigger_once():
+    protocol, _ = make_protocol(callback_triggers=["ready", "started"])
+    protocol.childDataReceived(1, b"Starting...\nready and started\n")
+    protocol.childDataReceived(1, b"started again\n")
+    assert protocol.done.result == "Starting...\nready and started"
+
+
+def test_subprocess_protocol_fires_errback_trigger():
+    protocol, _ = make_protocol(errback_triggers=[("Error", SubprocessError)])
+    protocol.childDataReceived(1, b"Error: something went wrong\n")
+    with pytest.raises(SubprocessError):
+        protocol.done.result.raiseException()
+    protocol.done.addErrback(lambda _: None)
+
+
+def test_subprocess_protocol_limits_captured_output():
+    protocol, _ = make_protocol(callback_triggers=["done"], max_output=10)
+    for i in range(100):
+        protocol.childDataReceived(1, f"line {i}\n".encode())
+    protocol.childDataReceived(1, b"done\n")
+    assert protocol.done.result == "e 99\ndone"
+
+
+@pytest.fixture()
+def child_process():
+    popen = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"]
+    )
+    yield Process(popen.pid)
+    popen.kill()
+    popen.wait()
+
+
+@pytest.fixture(params=["pidfd", "polling"])
+def exit_notification(request, monkeypatch):
+    if request.param == "pidfd" and not hasattr(os, "pidfd_open"):
+        pytest.skip("pidfds are not supported on this platform")
+    if request.param == "polling":
+        monkeypatch.delattr(os, "pidfd_open", raising=False)
+    return request.param
+
+
+@inlineCallbacks
+def test_wait_for_exit(child_process, exit_notification):
+    d = wait_for_exit(child_process)
+    assert not d.called
+    child_process.terminate()
+    yield d
+
+
+@inlineCallbacks
+def test_terminate_if_matching_terminates_matching_process(
+    child_process, exit_notification
+):
+    create_time = child_process.create_time()
+    killed = yield terminate_if_matching(
+        child_process.pid, create_time, kill_after=5
+    )
+    assert killed is False
+    assert child_process.status() == STATUS_ZOMBIE
+
+
+@inlineCallbacks
+def test_terminate_if_matching_ignores_other_process(child_process):
+    killed = yield terminate_if_matching(child_process.pid, 0.0)
+    assert killed is False
+    assert child_process.status() != STATUS_ZOMBIE
+
+
+@inlineCallbacks
+def test_terminate_if_matching_kills_after_timeout(tmp_path):
+    script = tmp_path / "ignore_sigterm.py"
+    script.write_text(
+        "import signal, time\n"
+        "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    popen = subprocess.Popen(
+        [sys.executable, str(script)], stdout=subprocess.PIPE
+    )
+    popen.stdout.readline()
+    proc = Process(popen.pid)
+    killed = yield terminate_if_matching(
+        proc.pid, proc.create_time(), kill_after=0.5
+    )
+    popen.wait()
+    assert killed is True
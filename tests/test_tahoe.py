@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import os
 from pathlib import Path
 from typing import Awaitable, Callable, TypeVar
@@ -17,6 +18,7 @@ from twisted.internet.testing import MemoryReactorClock
 
 from gridsync.crypto import randstr
 from gridsync.errors import TahoeCommandError, TahoeError, TahoeWebError
+from gridsync.log import MultiFileLogger, NullLogger
 from gridsync.tahoe import (
     Tahoe,
     get_nodedirs,
@@ -820,6 +822,41 @@ async def test_tahoe_link_fail_code_500(tahoe, monkeypatch):
         await tahoe.link("test_dircap", "test_childname", "test_childcap")
 
 
+@ensureDeferred
+async def test_tahoe_link_many_sends_single_set_children_request(
+    tahoe, monkeypatch
+):
+    monkeypatch.setattr(
+        "gridsync.tahoe.Tahoe.await_ready", lambda _: succeed(None)
+    )
+    fake_request = MagicMock(return_value=succeed(""))
+    monkeypatch.setattr("gridsync.tahoe.Tahoe._request", fake_request)
+    await tahoe.link_many(
+        "test_dircap", {"a": "URI:DIR2:aaa:bbb", "b": "URI:CHK:ccc:ddd"}
+    )
+    fake_request.assert_called_once()
+    _, kwargs = fake_request.call_args
+    assert kwargs["params"] == {"t": "set_children"}
+    assert json.loads(kwargs["data"]) == {
+        "a": [
+            "dirnode",
+            {"rw_uri": "URI:DIR2:aaa:bbb", "ro_uri": "URI:DIR2:aaa:bbb"},
+        ],
+        "b": [
+            "filenode",
+            {"rw_uri": "URI:CHK:ccc:ddd", "ro_uri": "URI:CHK:ccc:ddd"},
+        ],
+    }
+
+
+@ensureDeferred
+async def test_tahoe_link_many_no_children_is_noop(tahoe, monkeypatch):
+    fake_request = MagicMock()
+    monkeypatch.setattr("gridsync.tahoe.Tahoe._request", fake_request)
+    await tahoe.link_many("test_dircap", {})
+    fake_request.assert_not_called()
+
+
 @ensureDeferred
 async def test_tahoe_unlink(tahoe, monkeypatch):
     monkeypatch.setattr(
@@ -877,11 +914,93 @@ async def test_tahoe_starts_websocketreaderservice(monkeypatch, tahoe_factory):
     tahoe.config_set("client", "shares.total", "10")
     await tahoe.start()
     tahoe._on_started()  # XXX
+    tahoe.subscribe_eliot_log()
     assert tahoe._ws_reader.running
     (host, port, _, _, _) = reactor.tcpClients.pop(0)
     assert (host, port) == ("example.invalid", 12345)
 
 
+@ensureDeferred
+async def test_tahoe_does_not_start_websocketreaderservice_unless_wanted(
+    monkeypatch, tahoe_factory
+):
+    monkeypatch.setattr(
+        "gridsync.supervisor.Supervisor.start",
+        lambda *args, **kwargs: succeed((9999, "tahoe")),
+    )
+    reactor = MemoryReactorClock()
+    tahoe = tahoe_factory(reactor)
+    tahoe.logger = NullLogger()
+    tahoe.monitor = Mock()
+    tahoe.config_set("client", "shares.needed", "3")
+    tahoe.config_set("client", "shares.happy", "7")
+    tahoe.config_set("client", "shares.total", "10")
+    await tahoe.start()
+    tahoe._on_started()  # XXX
+    assert tahoe._ws_reader is None
+    assert not reactor.tcpClients
+
+
+@ensureDeferred
+async def test_tahoe_starts_websocketreaderservice_if_logging_enabled(
+    monkeypatch, tahoe_factory
+):
+    monkeypatch.setattr(
+        "gridsync.supervisor.Supervisor.start",
+        lambda *args, **kwargs: succeed((9999, "tahoe")),
+    )
+    monkeypatch.setattr("gridsync.log.LOGGING_ENABLED", True)
+    tahoe = tahoe_factory(MemoryReactorClock())
+    tahoe.logger = MultiFileLogger("test")
+    tahoe.monitor = Mock()
+    tahoe.config_set("client", "shares.needed", "3")
+    tahoe.config_set("client", "shares.happy", "7")
+    tahoe.config_set("client", "shares.total", "10")
+    await tahoe.start()
+    tahoe._on_started()  # XXX
+    assert tahoe._ws_reader.running
+
+
+def test_tahoe_subscribe_eliot_log_before_started_defers_subscription(
+    tahoe,
+):
+    tahoe.logger = NullLogger()
+    tahoe.subscribe_eliot_log()
+    assert tahoe._ws_reader is None
+
+
+def test_tahoe_unsubscribe_eliot_log_stops_websocketreaderservice(
+    tahoe_factory,
+):
+    tahoe = tahoe_factory(MemoryReactorClock())
+    tahoe.logger = NullLogger()
+    tahoe.set_nodeurl("http://127.0.0.1:12345")
+    tahoe.state = Tahoe.STARTED
+    tahoe.subscribe_eliot_log()
+    tahoe.subscribe_eliot_log()
+    tahoe.unsubscribe_eliot_log()
+    assert tahoe._ws_reader is not None
+    tahoe.unsubscribe_eliot_log()
+    assert tahoe._ws_reader is None
+
+
+def test_tahoe_buffers_eliot_messages_when_logging_disabled(tahoe):
+    tahoe.logger = NullLogger()
+    for i in range(3):
+        tahoe._log_eliot_message(f'{{"task_uuid": "{i}", "timestamp": {i}}}')
+    assert tahoe.get_eliot_log(start=1) == (
+        '{"task_uuid": "1", "timestamp": 1}\n'
+        '{"task_uuid": "2", "timestamp": 2}'
+    )
+
+
+def test_tahoe_eliot_buffer_keeps_only_most_recent_messages(tahoe):
+    tahoe.logger = NullLogger()
+    for i in range(tahoe.eliot_buffer.maxlen + 1):
+        tahoe._log_eliot_message(f'{{"task_uuid": "{i}", "timestamp": {i}}}')
+    assert '"task_uuid": "0"' not in tahoe.get_eliot_log()
+
+
 @ensureDeferred
 async def test_tahoe_stops_websocketreaderservice(monkeypatch, tahoe_factory):
     monkeypatch.setattr(
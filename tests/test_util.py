@@ -4,11 +4,13 @@ from binascii import hexlify, unhexlify
 
 import pytest
 
+from gridsync.magic_folder_events import SyncProgress
 from gridsync.util import (
     b58decode,
     b58encode,
     future_date,
     humanized_list,
+    progress_details,
     strip_html_tags,
     to_bool,
     traceback,
@@ -121,3 +123,15 @@ def test_traceback():
         tb = traceback(exc)
     assert isinstance(tb, str)
     assert "ValueError: test" in tb
+
+
+def test_progress_details_bytes_throughput_and_eta():
+    progress = SyncProgress("TestFolder", 1, 2, 1000, 4000, 1000.0, 3.0)
+    assert progress_details(progress) == (
+        "1.0 kB of 4.0 kB (1.0 kB/s, about 3 seconds remaining)"
+    )
+
+
+def test_progress_details_files_without_bytes():
+    progress = SyncProgress("TestFolder", 1, 2, 0, 0)
+    assert progress_details(progress) == "1 of 2 files"
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from pytest_twisted import ensureDeferred
+from twisted.internet.defer import succeed
+
+from gridsync.versions import VersionCache
+
+
+def fake_probe(version):
+    calls = []
+
+    def probe():
+        calls.append(None)
+        return succeed(version)
+
+    probe.calls = calls
+    return probe
+
+
+def make_executable(tmp_path, content=b"#!/bin/sh\n"):
+    executable = tmp_path / "tahoe"
+    executable.write_bytes(content)
+    return str(executable)
+
+
+def test_version_cache_get_returns_none_if_not_cached(tmp_path):
+    cache = VersionCache(str(tmp_path / "versions.json"))
+    assert cache.get(make_executable(tmp_path)) is None
+
+
+def test_version_cache_set_persists_across_instances(tmp_path):
+    executable = make_executable(tmp_path)
+    VersionCache(str(tmp_path / "versions.json")).set(executable, "1.2.3")
+    cache = VersionCache(str(tmp_path / "versions.json"))
+    assert cache.get(executable) == "1.2.3"
+
+
+def test_version_cache_get_returns_none_if_executable_changed(tmp_path):
+    executable = make_executable(tmp_path)
+    cache = VersionCache(str(tmp_path / "versions.json"))
+    cache.set(executable, "1.2.3")
+    make_executable(tmp_path, b"#!/bin/sh\necho upgraded\n")
+    assert cache.get(executable) is None
+
+
+def test_version_cache_get_returns_none_if_executable_missing(tmp_path):
+    executable = make_executable(tmp_path)
+    cache = VersionCache(str(tmp_path / "versions.json"))
+    cache.set(executable, "1.2.3")
+    os.remove(executable)
+    assert cache.get(executable) is None
+
+
+def test_version_cache_ignores_corrupt_cache_file(tmp_path):
+    path = tmp_path / "versions.json"
+    path.write_text("{Not valid JSON")
+    assert VersionCache(str(path)).get(make_executable(tmp_path)) is None
+
+
+@ensureDeferred
+async def test_version_cache_get_version_probes_only_once(tmp_path):
+    executable = make_executable(tmp_path)
+    probe = fake_probe("1.2.3")
+    cache = VersionCache(str(tmp_path / "versions.json"))
+    await cache.get_version(executable, probe)
+    version = await cache.get_version(executable, probe)
+    assert (version, len(probe.calls)) == ("1.2.3", 1)
+
+
+@ensureDeferred
+async def test_version_cache_get_version_reprobes_after_change(tmp_path):
+    executable = make_executable(tmp_path)
+    cache = VersionCache(str(tmp_path / "versions.json"))
+    await cache.get_version(executable, fake_probe("1.2.3"))
+    make_executable(tmp_path, b"#!/bin/sh\necho upgraded\n")
+    version = await cache.get_version(executable, fake_probe("4.5.6"))
+    assert version == "4.5.6"